@@ -16,8 +16,10 @@
 """Utilities for use with asynchronous code."""
 
 import asyncio
+from contextlib import suppress
 from functools import partial
 from pathlib import Path
+from queue import Queue
 from typing import List, Union
 
 import pyuv
@@ -417,3 +419,55 @@ async def asyncqgen(queue):
     """Turn a queue into an async generator."""
     while not queue.empty():
         yield await queue.get()
+
+
+class WakeUp:
+    """Wake a coroutine waiting on the event loop, from any thread.
+
+    Must be created in the running event loop. Calling the object sets
+    the event, so it can be used as a callback.
+
+    Examples:
+        >>> async def test():
+        ...     wake_up = WakeUp()
+        ...     asyncio.get_running_loop().call_later(0.01, wake_up)
+        ...     return await wake_up.wait(10), await wake_up.wait(0.01)
+        >>> asyncio.run(test())
+        (True, False)
+
+    """
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.event = asyncio.Event()
+
+    def __call__(self, *_):
+        # (The loop may have closed if called from another thread.)
+        with suppress(RuntimeError):
+            self.loop.call_soon_threadsafe(self.event.set)
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait until woken, or for timeout seconds.
+
+        Returns True if woken (wake-ups before the call count).
+        """
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self.event.wait(), timeout)
+        woken = self.event.is_set()
+        self.event.clear()
+        return woken
+
+
+class WakeUpQueue(Queue):
+    """A thread-safe queue which calls a function whenever an item is put.
+
+    E.g. to wake the scheduler main loop when a message arrives.
+    """
+
+    def __init__(self, wake_up, maxsize=0):
+        super().__init__(maxsize)
+        self.wake_up = wake_up
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        self.wake_up()
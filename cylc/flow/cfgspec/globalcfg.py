@@ -56,6 +56,21 @@ SYSPATH = [
 
 TIMEOUT_DESCR = "Previously, 'timeout' was a stall timeout."
 
+DB_DESCR = {
+    'private': '''
+        Configure the private workflow database.
+
+        The scheduler reads and writes this database, it must always be
+        in sync with the scheduler.
+    ''',
+    'public': '''
+        Configure the public workflow database.
+
+        The scheduler only writes to this database, other programs (e.g.
+        ``cylc workflow-state``) read from it.
+    ''',
+}
+
 # Event config descriptions shared between global and workflow config.
 EVENTS_DESCR = {
     'startup handlers': (
@@ -283,6 +298,28 @@ with Conf('global.cylc', desc='''
 
                Moved here from the top level.
         ''')
+        Conf('in-process xtriggers', VDR.V_STRING_LIST, desc='''
+            Names of trusted xtrigger functions to call in the scheduler
+            process rather than in a new ``cylc function-run`` subprocess.
+
+            This avoids the cost of starting a Python process for each
+            xtrigger call. Functions are imported once and called in a pool
+            of up to ``process pool size`` threads, or, if they are defined
+            with ``async def``, awaited by the scheduler. Calls which take
+            longer than ``process pool timeout`` are treated as failed.
+
+            .. warning::
+
+               Only list functions which are known to be well behaved. They
+               run with full access to the scheduler process and cannot be
+               killed. A function which hangs occupies one of the threads
+               until it returns (or the scheduler exits, which it does not
+               prevent), so enough hung calls will stop all in-process
+               xtriggers. A blocking ``async def`` function will block the
+               scheduler.
+
+            .. versionadded:: 8.0.0
+        ''')
         Conf('auto restart delay', VDR.V_INTERVAL, desc='''
             Relates to Cylc's auto stop-restart mechanism (see
             :ref:`auto-stop-restart`).  When a host is set to automatically
@@ -506,6 +543,93 @@ with Conf('global.cylc', desc='''
                     How often (in seconds) to run this plugin.
                 ''')
 
+        with Conf('database', desc='''
+            Configure the workflow run databases.
+
+            The scheduler keeps a private database (in the workflow service
+            directory) and a public copy of it in the ``log/`` directory for
+            use by other programs.
+
+            .. versionadded:: 8.0.0
+        '''):
+            for db_name, db_descr in DB_DESCR.items():
+                with Conf(db_name, desc=db_descr):
+                    Conf('journal mode', VDR.V_STRING, 'delete',
+                         options=['delete', 'truncate', 'persist', 'wal'],
+                         desc='''
+                        The SQLite journal mode (``PRAGMA journal_mode``).
+
+                        ``wal`` (write-ahead logging) makes writes to the
+                        private database much cheaper, but requires all
+                        access to the database to be from the same host, so
+                        it should not be used on network file systems, or
+                        for the public database if it is read from other
+                        hosts. In ``wal`` mode the scheduler keeps its
+                        connection to the private database open.
+                    ''')
+                    Conf('synchronous', VDR.V_STRING, 'full',
+                         options=['off', 'normal', 'full', 'extra'], desc='''
+                        How hard SQLite tries to make sure that writes have
+                        reached the disk (``PRAGMA synchronous``).
+
+                        ``normal`` is safe from corruption in ``wal`` mode
+                        and avoids most of the cost of syncing. ``off`` risks
+                        corrupting the database if the host crashes.
+                    ''')
+                    Conf('cache size', VDR.V_INTEGER, 2000, desc='''
+                        The maximum size of the SQLite page cache in KiB
+                        (``PRAGMA cache_size``).
+                    ''')
+                    Conf('mmap size', VDR.V_INTEGER, 0, desc='''
+                        The maximum number of bytes of the database to
+                        access using memory-mapped I/O (``PRAGMA mmap_size``).
+
+                        This can speed up reads from large databases. Set to
+                        0 to disable.
+                    ''')
+                    if db_name == 'public':
+                        Conf('threaded writes', VDR.V_BOOLEAN, False,
+                             desc='''
+                            Write to the public database in a background
+                            thread.
+
+                            The public database does not need to be fully in
+                            sync with the private database. If writing to it
+                            is slow (e.g. on a shared network file system)
+                            enabling this moves the writes off the scheduler
+                            main loop. Pending operations are written in
+                            batches, with superseded updates discarded, and
+                            are flushed when the workflow shuts down.
+                        ''')
+                        Conf('maximum lag', VDR.V_INTERVAL, DurationFloat(60),
+                             desc='''
+                            With threaded writes, the maximum time the public
+                            database is allowed to lag behind the private
+                            database before the main loop waits for the
+                            writer to catch up.
+                        ''')
+
+        with Conf('server', desc='''
+            Configure the scheduler's network server, which handles requests
+            from clients (e.g. ``cylc`` commands, job messages and the UI).
+
+            .. versionadded:: 8.0.0
+        '''):
+            Conf('worker threads', VDR.V_INTEGER, 0, desc='''
+                Number of threads to handle requests on.
+
+                By default (``0``) requests are handled one at a time, so a
+                slow request (e.g. a large GraphQL query from the UI) delays
+                everything behind it, including job messages.
+
+                With worker threads, requests are routed to a pool of
+                workers. Queries run concurrently, each against a
+                consistent snapshot of the workflow data, which costs the
+                scheduler some extra copying when the data changes.
+                Mutations are handled one at a time and, as usual, queue
+                commands for the scheduler main loop.
+            ''')
+
         with Conf('logging', desc='''
             The workflow event log, held under the workflow run directory, is
             maintained as a rolling archive. Logs are rolled over (backed up
@@ -21,7 +21,8 @@ from functools import lru_cache
 import re
 from typing import List, Optional, TYPE_CHECKING, Tuple
 
-from metomi.isodatetime.data import Calendar, Duration, CALENDAR
+from metomi.isodatetime.data import (
+    Calendar, Duration, CALENDAR, get_days_in_year_range, get_days_since_1_ad)
 from metomi.isodatetime.dumpers import TimePointDumper
 from metomi.isodatetime.timezone import (
     get_local_time_zone, get_local_time_zone_format, TimeZoneFormatMode)
@@ -61,6 +62,7 @@ class WorkflowSpecifics:
     ASSUMED_TIME_ZONE: Optional[Tuple[int, int]] = None
     DUMP_FORMAT: Optional[str] = None
     NUM_EXPANDED_YEAR_DIGITS: int = 0
+    POINT_RESOLUTION: Optional[int] = None
     abbrev_util: Optional[CylcTimeParser] = None
     interval_parser: 'DurationParser' = None
     point_parser: 'TimePointParser' = None
@@ -72,21 +74,42 @@ class WorkflowSpecifics:
 
 class ISO8601Point(PointBase):
 
-    """A single point in an ISO8601 date time sequence."""
+    """A single point in an ISO8601 date time sequence.
+
+    Comparison, hashing and fixed-duration arithmetic use a numeric key
+    (seconds since 0001-01-01T00Z in the workflow calendar) which is
+    calculated when first needed and cached on the point.
+    """
 
     TYPE = CYCLER_TYPE_ISO8601
     TYPE_SORT_KEY = CYCLER_TYPE_SORT_KEY_ISO8601
 
-    __slots__ = ('value')
+    __slots__ = ('value', '_key')
+
+    def __init__(self, value):
+        super().__init__(value)
+        self._key = None
 
     @classmethod
     def from_nonstandard_string(cls, point_string):
         """Standardise a date-time string."""
         return ISO8601Point(str(point_parse(point_string))).standardise()
 
+    @property
+    def key(self) -> Optional[Tuple[str, float]]:
+        """Return the (calendar mode, seconds) key of this point.
+
+        Returns None for truncated points, which have no absolute value.
+        """
+        if self._key is None or self._key[0] != CALENDAR.mode:
+            self._key = _iso_point_key(self.value, CALENDAR.mode)
+        return self._key
+
     def add(self, other):
         """Add an Interval to self."""
-        return ISO8601Point(self._iso_point_add(self.value, other.value))
+        point = ISO8601Point(self._iso_point_add(self.value, other.value))
+        self._set_offset_key(point, other, 1)
+        return point
 
     def standardise(self):
         """Reformat self.value into a standard representation."""
@@ -99,6 +122,7 @@ class ISO8601Point(PointBase):
             else:
                 message = str(exc)
             raise PointParsingError(type(self), self.value, message)
+        self._key = None
         return self
 
     def sub(self, other):
@@ -106,8 +130,44 @@ class ISO8601Point(PointBase):
         if isinstance(other, ISO8601Point):
             return ISO8601Interval(
                 self._iso_point_sub_point(self.value, other.value))
-        return ISO8601Point(
+        point = ISO8601Point(
             self._iso_point_sub_interval(self.value, other.value))
+        self._set_offset_key(point, other, -1)
+        return point
+
+    def _set_offset_key(self, point, interval, sign):
+        """Set the key of point = self + sign * interval, if possible.
+
+        This avoids re-parsing the new point to compare it where the
+        interval is a fixed number of seconds (i.e. no years or months)
+        which the dump format can represent exactly. (Points are equal if
+        their strings are, so the key must agree with the string.)
+        """
+        seconds = _iso_interval_seconds(interval.value)
+        if seconds is None:
+            return
+        resolution = _get_point_resolution(self.value)
+        if (
+            resolution
+            and seconds % resolution == 0
+            and (seconds == 0) == (point.value == self.value)
+        ):
+            key = self.key
+            if key is not None:
+                point._key = (key[0], key[1] + sign * seconds)
+
+    def __hash__(self) -> int:
+        key = self.key
+        if key is None:
+            return hash(self.value)
+        return hash(key[1])
+
+    def _cmp(self, other: 'ISO8601Point') -> int:
+        key = self.key
+        other_key = other.key
+        if key is None or other_key is None:
+            return self._iso_point_cmp(self.value, other.value)
+        return cmp(key[1], other_key[1])
 
     @staticmethod
     @lru_cache(10000)
@@ -117,9 +177,6 @@ class ISO8601Point(PointBase):
         interval = interval_parse(interval_string)
         return str(point + interval)
 
-    def _cmp(self, other: 'ISO8601Point') -> int:
-        return self._iso_point_cmp(self.value, other.value)
-
     @staticmethod
     @lru_cache(10000)
     def _iso_point_cmp(point_string, other_point_string):
@@ -145,6 +202,67 @@ class ISO8601Point(PointBase):
         return str(point - other_point)
 
 
+def _iso_point_key(
+    point_string: str, calendar_mode: str
+) -> Optional[Tuple[str, float]]:
+    """Return the (calendar mode, seconds) key for a point string.
+
+    Seconds are counted from 0001-01-01T00Z in the current calendar.
+    """
+    point = point_parse(point_string)
+    if point.truncated:
+        return None
+    point.set_time_zone_to_utc()
+    year, day_of_year = point.get_ordinal_date()
+    if year > 1:
+        days = get_days_since_1_ad(year - 1)
+    elif year < 1:
+        days = -get_days_in_year_range(year, 0)
+    else:
+        days = 0
+    days += day_of_year - 1
+    return (
+        calendar_mode,
+        days * CALENDAR.SECONDS_IN_DAY + point.get_second_of_day()
+    )
+
+
+def _get_point_resolution(point_string: str) -> int:
+    """Return the resolution of the point dump format in seconds.
+
+    Returns 0 if the dump format is coarser than a day (e.g. CCYY-MM), in
+    which case a fixed interval need not move a point by its length.
+
+    Args:
+        point_string: Any valid point, used to determine the resolution.
+    """
+    if WorkflowSpecifics.POINT_RESOLUTION is None:
+        point = point_parse(point_string)
+        for seconds in (1, 60, 3600, CALENDAR.SECONDS_IN_DAY):
+            if str(point + Duration(seconds=seconds)) != str(point):
+                break
+        else:
+            seconds = 0
+        WorkflowSpecifics.POINT_RESOLUTION = seconds
+    return WorkflowSpecifics.POINT_RESOLUTION
+
+
+@lru_cache(10000)
+def _iso_interval_seconds(interval_string: str) -> Optional[float]:
+    """Return the length of an interval in seconds, if fixed.
+
+    Returns None for intervals containing years or months, whose length
+    depends on the point they are added to.
+    """
+    try:
+        interval = interval_parse(interval_string)
+    except IsodatetimeError:
+        return None
+    if interval.years or interval.months:
+        return None
+    return interval.get_seconds()
+
+
 class ISO8601Interval(IntervalBase):
 
     """The interval between points in an ISO8601 date time sequence."""
@@ -827,6 +945,7 @@ def init(num_expanded_year_digits=0, custom_dump_format=None, time_zone=None,
         time_zone_hours_minutes = TimePointDumper().get_time_zone(time_zone)
     WorkflowSpecifics.ASSUMED_TIME_ZONE = time_zone_hours_minutes
     WorkflowSpecifics.NUM_EXPANDED_YEAR_DIGITS = num_expanded_year_digits
+    WorkflowSpecifics.POINT_RESOLUTION = None
     if custom_dump_format is None:
         if num_expanded_year_digits > 0:
             WorkflowSpecifics.DUMP_FORMAT = (
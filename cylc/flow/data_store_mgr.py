@@ -58,13 +58,14 @@ Packaging methods are included for dissemination of protobuf messages.
 
 from contextlib import suppress
 from collections import Counter, deque
-from copy import deepcopy
 import json
+from threading import Lock
 from time import time
 from typing import Union, Tuple, TYPE_CHECKING
 import zlib
 
 from cylc.flow import __version__ as CYLC_VERSION, LOG, ID_DELIM
+from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
 from cylc.flow.exceptions import WorkflowConfigError
 from cylc.flow.data_messages_pb2 import (  # type: ignore
     PbEdge, PbEntireWorkflow, PbFamily, PbFamilyProxy, PbJob, PbTask,
@@ -72,9 +73,11 @@ from cylc.flow.data_messages_pb2 import (  # type: ignore
     JDeltas, TDeltas, TPDeltas, WDeltas)
 from cylc.flow.network import API
 from cylc.flow.workflow_status import get_workflow_status
+from cylc.flow.task_id import TaskID
 from cylc.flow.task_job_logs import JOB_LOG_OPTS, get_task_job_log
 from cylc.flow.task_proxy import TaskProxy
 from cylc.flow.task_state import (
+    TaskState,
     TASK_STATUS_WAITING,
     TASK_STATUS_SUBMITTED,
     TASK_STATUS_SUBMIT_FAILED,
@@ -85,7 +88,7 @@ from cylc.flow.task_state import (
     TASK_STATUSES_ORDERED
 )
 from cylc.flow.task_state_prop import extract_group_state
-from cylc.flow.taskdef import generate_graph_parents
+from cylc.flow.taskdef import generate_graph_children, generate_graph_parents
 from cylc.flow.task_state import TASK_STATUSES_FINAL
 from cylc.flow.wallclock import (
     TIME_ZONE_LOCAL_INFO,
@@ -144,6 +147,20 @@ DELTAS_MAP = {
 
 DELTA_FIELDS = {DELTA_ADDED, DELTA_UPDATED, DELTA_PRUNED}
 
+# Other element types modified by apply_delta when pruning elements.
+PRUNE_RELATED_TYPES = {
+    EDGES: (TASK_PROXIES, WORKFLOW),
+    FAMILY_PROXIES: (FAMILIES, FAMILY_PROXIES, WORKFLOW),
+    JOBS: (WORKFLOW,),
+    TASK_PROXIES: (TASKS, FAMILY_PROXIES, WORKFLOW),
+}
+
+# Element types and fields with secondary indexes (see NodeIndexes),
+# these are the node attributes matched by the resolver filters
+# ("namespace" being the name of a family proxy).
+INDEXED_TYPES = (TASK_PROXIES, FAMILY_PROXIES)
+INDEXED_FIELDS = ('state', 'cycle_point', 'namespace', 'is_held', 'is_queued')
+
 JOB_STATUSES_ALL = [
     TASK_STATUS_SUBMITTED,
     TASK_STATUS_SUBMIT_FAILED,
@@ -210,9 +227,29 @@ def parse_job_item(item):
 
 
 def generate_checksum(in_strings):
-    """Generate cross platform & python checksum from strings."""
+    """Generate cross platform & python checksum from strings.
+
+    The checksum is order independent, the XOR of the checksums of the
+    individual strings, so can be maintained incrementally as strings are
+    added and removed (see apply_delta).
+    """
+    checksum = 0
+    for in_string in in_strings:
+        checksum ^= string_checksum(in_string)
+    return checksum
+
+
+def string_checksum(in_string):
+    """Generate cross platform & python checksum for a string."""
     # can't use hash(), it's not the same across 32-64bit or python invocations
-    return zlib.adler32(''.join(sorted(in_strings)).encode()) & 0xffffffff
+    return zlib.crc32(in_string.encode()) & 0xffffffff
+
+
+def element_checksum(key, element):
+    """Return the checksum of a data-store element of the given type."""
+    if key == EDGES:
+        return string_checksum(element.id)
+    return string_checksum(element.stamp)
 
 
 def task_mean_elapsed_time(tdef):
@@ -222,11 +259,44 @@ def task_mean_elapsed_time(tdef):
     return tdef.rtconfig.get('execution time limit', None)
 
 
-def apply_delta(key, delta, data):
-    """Apply delta to specific data-store workflow and type."""
+def apply_delta(key, delta, data, checksums=None, indexes=None):
+    """Apply delta to specific data-store workflow and type.
+
+    Args:
+        key (str):
+            The data-store element type.
+        delta:
+            The delta message for this element type.
+        data (dict):
+            The workflow data-store.
+        checksums (dict, optional):
+            Checksum of each element type (see generate_checksum), which
+            will be updated with the changes made to the data-store.
+        indexes (NodeIndexes, optional):
+            Secondary indexes of the workflow data-store, which will be
+            updated with the changes made to the data-store.
+
+    """
+    if checksums is not None and key != WORKFLOW:
+        checksum = checksums.get(key, 0)
+    else:
+        checksum = None
+    if key not in INDEXED_TYPES:
+        indexes = None
     # Assimilate new data
     if getattr(delta, 'added', False):
         if key != WORKFLOW:
+            if checksum is not None:
+                for element in delta.added:
+                    if element.id in data[key]:
+                        checksum ^= element_checksum(
+                            key, data[key][element.id])
+                    checksum ^= element_checksum(key, element)
+            if indexes is not None:
+                for element in delta.added:
+                    if element.id in data[key]:
+                        indexes.remove(key, data[key][element.id])
+                    indexes.add(key, element)
             data[key].update({e.id: e for e in delta.added})
         elif delta.added.ListFields():
             data[key].CopyFrom(delta.added)
@@ -243,12 +313,21 @@ def apply_delta(key, delta, data):
             for element in delta.updated:
                 try:
                     data_element = data[key][element.id]
+                    if checksum is not None:
+                        checksum ^= element_checksum(key, data_element)
+                    if indexes is not None:
+                        fields = get_index_fields(element)
+                        indexes.remove(key, data_element, fields)
                     # Clear fields that require overwrite with delta
                     if CLEAR_FIELD_MAP[key]:
                         for field, _ in element.ListFields():
                             if field.name in CLEAR_FIELD_MAP[key]:
                                 data_element.ClearField(field.name)
                     data_element.MergeFrom(element)
+                    if checksum is not None:
+                        checksum ^= element_checksum(key, data_element)
+                    if indexes is not None:
+                        indexes.add(key, data_element, fields)
                 except KeyError as exc:
                     # Ensure data-sync doesn't fail with
                     # network issues, sync reconcile/validate will catch.
@@ -303,8 +382,212 @@ def apply_delta(key, delta, data):
                 # to remove relationship from workflow.
                 with suppress(KeyError, ValueError):
                     getattr(data[WORKFLOW], key).remove(del_id)
+            if checksum is not None:
+                checksum ^= element_checksum(key, data[key][del_id])
+            if indexes is not None:
+                indexes.remove(key, data[key][del_id])
             # remove/prune element from data-store
             del data[key][del_id]
+    if checksum is not None:
+        checksums[key] = checksum
+
+
+def get_index_values(element, field):
+    """Return the values of an indexed field of a task or family proxy.
+
+    Examples:
+        >>> get_index_values(PbTaskProxy(state='waiting'), 'state')
+        ['waiting']
+        >>> task_proxy = PbTaskProxy(name='foo', namespace=['foo', 'root'])
+        >>> get_index_values(task_proxy, 'namespace')
+        ['foo', 'root']
+        >>> get_index_values(PbFamilyProxy(name='FOO'), 'namespace')
+        ['FOO']
+
+    """
+    if field == 'namespace':
+        return getattr(element, 'namespace', None) or [element.name]
+    return [getattr(element, field)]
+
+
+def get_index_fields(element):
+    """Return the indexed fields set on a task or family proxy (delta).
+
+    Examples:
+        >>> get_index_fields(PbTaskProxy(id='x', state='waiting'))
+        ['state']
+        >>> get_index_fields(PbFamilyProxy(name='FOO', is_held=False))
+        ['namespace', 'is_held']
+
+    """
+    return [
+        field
+        for field in INDEXED_FIELDS
+        if (
+            (
+                getattr(element, 'namespace', None)
+                or element.HasField('name')
+            )
+            if field == 'namespace'
+            else element.HasField(field)
+        )
+    ]
+
+
+class NodeIndexes:
+    """Secondary indexes of the task and family proxies of a workflow.
+
+    For each indexed field (INDEXED_FIELDS), the ids of the elements are
+    indexed by the value of the field. This allows resolvers to find the
+    elements matching their filters without scanning the data-store.
+
+    Maintained by apply_delta.
+
+    """
+
+    def __init__(self):
+        self.indexes = {
+            key: {field: {} for field in INDEXED_FIELDS}
+            for key in INDEXED_TYPES
+        }
+        # The indexes this is a copy of share the sets of ids with this,
+        # until they are modified here (see copy).
+        self.copied = None
+
+    def copy(self):
+        """Return a copy of these indexes.
+
+        The copy shares the sets of ids with this until they are modified,
+        so these indexes remain unchanged for readers of the version of the
+        data-store they index (see DataStoreMgr.copy_on_write).
+
+        """
+        indexes = NodeIndexes.__new__(NodeIndexes)
+        indexes.indexes = {
+            key: {
+                field: dict(values)
+                for field, values in fields.items()
+            }
+            for key, fields in self.indexes.items()
+        }
+        indexes.copied = set()
+        return indexes
+
+    def get(self, key, field, value):
+        """Return the ids of elements with the given value of a field.
+
+        Don't modify the returned set.
+
+        """
+        return self.indexes[key][field].get(value, frozenset())
+
+    def add(self, key, element, fields=INDEXED_FIELDS):
+        """Index an element."""
+        for field in fields:
+            for value in get_index_values(element, field):
+                self._get_ids(key, field, value).add(element.id)
+
+    def remove(self, key, element, fields=INDEXED_FIELDS):
+        """Remove an element from the indexes."""
+        for field in fields:
+            values = self.indexes[key][field]
+            for value in get_index_values(element, field):
+                if value not in values:
+                    continue
+                ids = self._get_ids(key, field, value)
+                ids.discard(element.id)
+                if not ids:
+                    del values[value]
+
+    def _get_ids(self, key, field, value):
+        """Return the set of ids for a value to modify."""
+        values = self.indexes[key][field]
+        ids = values.get(value)
+        if ids is None:
+            ids = values[value] = set()
+            if self.copied is not None:
+                self.copied.add((key, field, value))
+        elif (
+            self.copied is not None
+            and (key, field, value) not in self.copied
+        ):
+            ids = values[value] = set(ids)
+            self.copied.add((key, field, value))
+        return ids
+
+
+def create_data_store():
+    """Return a new, empty data-store (structured as DATA_TEMPLATE).
+
+    Cheaper than deepcopy(DATA_TEMPLATE), which matters as new stores are
+    swapped in for each batch of deltas.
+    """
+    return {
+        EDGES: {},
+        FAMILIES: {},
+        FAMILY_PROXIES: {},
+        JOBS: {},
+        TASKS: {},
+        TASK_PROXIES: {},
+        WORKFLOW: PbWorkflow(),
+    }
+
+
+def _encode_varint(value):
+    """Encode an unsigned int as a protobuf base 128 varint."""
+    encoded = bytearray()
+    while value > 0x7f:
+        encoded.append((value & 0x7f) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def encode_message_field(field_number, serialized):
+    """Encode a serialized message as a field of an enclosing message.
+
+    Concatenating encoded fields is equivalent to serializing the
+    enclosing message with those fields set (or appended to, for repeated
+    fields), without copying or re-serializing the field messages.
+
+    Args:
+        field_number (int):
+            Field number in the enclosing message.
+        serialized (bytes):
+            The serialized field message.
+
+    Returns:
+        bytes
+
+    """
+    # length delimited (wire type 2) field: tag, length, message
+    return (
+        _encode_varint(field_number << 3 | 2)
+        + _encode_varint(len(serialized))
+        + serialized
+    )
+
+
+def serialize_all_deltas(serialized_deltas):
+    """Serialize an AllDeltas message from already serialized deltas.
+
+    Equivalent to copying each delta into an AllDeltas message and
+    serializing that, but without copying or re-serializing the deltas.
+
+    Args:
+        serialized_deltas (list):
+            [(key, bytes)] where key is an AllDeltas field name and bytes
+            the serialized delta message for that field.
+
+    Returns:
+        bytes
+
+    """
+    fields = AllDeltas.DESCRIPTOR.fields_by_name
+    return b''.join(
+        encode_message_field(fields[key].number, serialized)
+        for key, serialized in serialized_deltas
+    )
 
 
 def create_delta_store(delta=None, workflow_id=None):
@@ -323,8 +606,8 @@ def create_delta_store(delta=None, workflow_id=None):
     if not isinstance(delta, AllDeltas):
         delta = AllDeltas()
     delta_store = {
-        DELTA_ADDED: deepcopy(DATA_TEMPLATE),
-        DELTA_UPDATED: deepcopy(DATA_TEMPLATE),
+        DELTA_ADDED: create_data_store(),
+        DELTA_UPDATED: create_data_store(),
         DELTA_PRUNED: {
             key: []
             for key in DATA_TEMPLATE.keys()
@@ -351,6 +634,93 @@ def create_delta_store(delta=None, workflow_id=None):
     return delta_store
 
 
+class GraphWindowNode:
+    """A task in the n-edge graph window that is not in the task pool.
+
+    Stands in for a TaskProxy when expanding the graph window, but only
+    generates the graph children, and the task state (prerequisites,
+    outputs, etc.), if and when they are needed.
+
+    Args:
+        tdef (cylc.flow.taskdef.TaskDef): Task definition.
+        point (cylc.flow.cycling.PointBase): Cycle point.
+        flow_label (str): Flow label.
+        reflow (bool): Flow on from outputs.
+
+    """
+
+    __slots__ = [
+        'tdef', 'point', 'flow_label', 'reflow', 'identity',
+        'clock_trigger_time', 'point_as_seconds',
+        '_graph_children', '_state',
+    ]
+
+    # Clock trigger methods borrowed from TaskProxy.
+    get_offset_as_seconds = staticmethod(TaskProxy.get_offset_as_seconds)
+    get_point_as_seconds = TaskProxy.get_point_as_seconds
+    get_clock_trigger_time = TaskProxy.get_clock_trigger_time
+    is_waiting_clock_done = TaskProxy.is_waiting_clock_done
+
+    def __init__(self, tdef, point, flow_label, reflow=True):
+        self.tdef = tdef
+        self.point = point
+        self.flow_label = flow_label
+        self.reflow = reflow
+        self.identity = TaskID.get(tdef.name, point)
+        self.clock_trigger_time = None
+        self.point_as_seconds = None
+        self._graph_children = None
+        self._state = None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} '{self.identity}'>"
+
+    @property
+    def graph_children(self):
+        """Graph children of this task {output: [(name, point, is_abs)]}."""
+        if self._graph_children is None:
+            self._graph_children = generate_graph_children(
+                self.tdef, self.point)
+        return self._graph_children
+
+    @property
+    def state(self):
+        """The (waiting) task state, for populating the ghost node."""
+        if self._state is None:
+            self._state = TaskState(
+                self.tdef, self.point, TASK_STATUS_WAITING, False)
+        return self._state
+
+
+class DataStoreSnapshot:
+    """A view of the data-store manager, with the data-store pinned.
+
+    For reading a consistent version of the data-store while the main loop
+    applies deltas (see DataStoreMgr.copy_on_write). Attributes other than
+    the data are those of the data-store manager.
+
+    Args:
+        data_store_mgr (DataStoreMgr):
+            The data-store manager.
+
+    """
+
+    def __init__(self, data_store_mgr):
+        self.data_store_mgr = data_store_mgr
+        self.data = {}
+        self.indexes = {}
+        self.update()
+
+    def update(self):
+        """Pin the current version of the data-store."""
+        with self.data_store_mgr.snapshot_lock:
+            self.data = dict(self.data_store_mgr.data)
+            self.indexes = dict(self.data_store_mgr.indexes)
+
+    def __getattr__(self, name):
+        return getattr(self.data_store_mgr, name)
+
+
 class DataStoreMgr:
     """Manage the workflow data store.
 
@@ -410,10 +780,26 @@ class DataStoreMgr:
         self.xtrigger_tasks = {}
         # Managed data types
         self.data = {
-            self.workflow_id: deepcopy(DATA_TEMPLATE)
+            self.workflow_id: create_data_store()
+        }
+        # Checksum of each element type, maintained by apply_delta
+        self.checksums = {}
+        # Secondary indexes of each workflow, maintained by apply_delta
+        self.indexes = {
+            self.workflow_id: NodeIndexes()
         }
-        self.added = deepcopy(DATA_TEMPLATE)
-        self.updated = deepcopy(DATA_TEMPLATE)
+        # Encoded elements of each type for snapshot requests,
+        # {(element type, field number): (elements, bytes)},
+        # see get_elements_payload
+        self.snapshot_payloads = {}
+        self.snapshot_generation = 0
+        self.snapshot_lock = Lock()
+        # Copy (rather than modify) data-store elements on update, so the
+        # server worker threads can read consistent snapshots.
+        self.copy_on_write = glbl_cfg().get(
+            ['scheduler', 'server', 'worker threads']) > 0
+        self.added = create_data_store()
+        self.updated = create_data_store()
         self.deltas = {
             EDGES: EDeltas(),
             FAMILIES: FDeltas(),
@@ -623,12 +1009,8 @@ class DataStoreMgr:
         """Generate graph window about given origin to n-edge-distance.
 
         Args:
-            name (str):
-                Task name.
-            point (cylc.flow.cycling.PointBase):
-                PointBase derived object.
-            flow_label (str):
-                Flow label used to distinguish multiple runs.
+            itask (cylc.flow.task_proxy.TaskProxy/GraphWindowNode):
+                Task pool task, or graph window node.
             edge_distance (int):
                 Graph distance from active/origin node.
             active_id (str):
@@ -754,10 +1136,9 @@ class DataStoreMgr:
             if t_id in self.n_window_nodes[active_id]:
                 continue
             self.increment_graph_window(
-                TaskProxy(
+                GraphWindowNode(
                     self.schd.config.get_taskdef(t_name),
-                    t_point, flow_label,
-                    submit_num=0, reflow=reflow),
+                    t_point, flow_label, reflow),
                 edge_distance, active_id, descendant, is_parent)
 
     def remove_pool_node(self, name, point):
@@ -784,7 +1165,7 @@ class DataStoreMgr:
         Args:
             tp_id (str):
                 data-store task proxy ID.
-            itask (cylc.flow.task_proxy.TaskProxy):
+            itask (cylc.flow.task_proxy.TaskProxy/GraphWindowNode):
                 Update task-node from corresponding task proxy object.
             is_parent (bool):
                 Used to determine whether to load DB state.
@@ -1870,26 +2251,98 @@ class DataStoreMgr:
     def apply_delta_batch(self):
         """Apply delta batch to local data-store."""
         data = self.data[self.workflow_id]
+        indexes = self.indexes[self.workflow_id]
+        if self.copy_on_write:
+            data = self._copy_on_write(data)
+            indexes = indexes.copy()
         for key, delta in self.deltas.items():
             if delta.ListFields():
-                apply_delta(key, delta, data)
+                apply_delta(key, delta, data, self.checksums, indexes)
+                self.clear_snapshot_payloads(key)
+                if getattr(delta, 'pruned', False) and key != WORKFLOW:
+                    self.clear_snapshot_payloads(*PRUNE_RELATED_TYPES.get(
+                        key, ()))
+
+        # (swap both together for DataStoreSnapshot)
+        with self.snapshot_lock:
+            self.data[self.workflow_id] = data
+            self.indexes[self.workflow_id] = indexes
+
+    def _copy_on_write(self, data):
+        """Return a copy of the data-store to apply the current deltas to.
+
+        Only the element types and elements the deltas will modify are
+        copied, the rest is shared with the original data-store, which is
+        left unchanged for any readers of it.
+        """
+        data = dict(data)
+        copied = set()
+
+        def copy_elements(key):
+            if key not in copied:
+                data[key] = dict(data[key])
+                copied.add(key)
+
+        def copy_element(key, e_id):
+            if (key, e_id) in copied:
+                return
+            copied.add((key, e_id))
+            if key == WORKFLOW:
+                element = data[WORKFLOW]
+            else:
+                copy_elements(key)
+                element = data[key].get(e_id)
+                if element is None:
+                    return
+            new_element = type(element)()
+            new_element.CopyFrom(element)
+            if key == WORKFLOW:
+                data[WORKFLOW] = new_element
+            else:
+                data[key][e_id] = new_element
+
+        for key, delta in self.deltas.items():
+            if not delta.ListFields():
+                continue
+            if key == WORKFLOW:
+                copy_element(WORKFLOW, None)
+                continue
+            copy_elements(key)
+            for element in delta.updated:
+                copy_element(key, element.id)
+            for e_id in delta.pruned:
+                element = data[key].get(e_id)
+                if element is None:
+                    continue
+                # (see the relationships removed by apply_delta)
+                copy_element(WORKFLOW, None)
+                if key == TASK_PROXIES:
+                    copy_element(TASKS, element.task)
+                    copy_element(FAMILY_PROXIES, element.first_parent)
+                elif key == FAMILY_PROXIES:
+                    copy_element(FAMILIES, element.family)
+                    copy_element(FAMILY_PROXIES, element.first_parent)
+                elif key == EDGES:
+                    copy_element(TASK_PROXIES, element.source)
+                    copy_element(TASK_PROXIES, element.target)
+        return data
+
+    def clear_snapshot_payloads(self, *element_types):
+        """Clear cached snapshot payloads of the given element types."""
+        with self.snapshot_lock:
+            self.snapshot_generation += 1
+            for cache_key in list(self.snapshot_payloads):
+                if cache_key[0] in element_types:
+                    del self.snapshot_payloads[cache_key]
 
     def apply_delta_checksum(self):
         """Construct checksum on deltas for export."""
-        data = self.data[self.workflow_id]
         update_time = time()
         for key, delta in self.deltas.items():
             if delta.ListFields():
                 delta.time = update_time
                 if hasattr(delta, 'checksum'):
-                    if key == EDGES:
-                        s_att = 'id'
-                    else:
-                        s_att = 'stamp'
-                    delta.checksum = generate_checksum(
-                        [getattr(e, s_att)
-                         for e in data[key].values()]
-                    )
+                    delta.checksum = self.checksums.get(key, 0)
 
     def clear_delta_batch(self):
         """Clear current deltas."""
@@ -1907,8 +2360,8 @@ class DataStoreMgr:
     def clear_delta_store(self):
         """Clear current delta store."""
         # Potential shared reference, avoid clearing
-        self.added = deepcopy(DATA_TEMPLATE)
-        self.updated = deepcopy(DATA_TEMPLATE)
+        self.added = create_data_store()
+        self.updated = create_data_store()
 
     # Message collation and dissemination methods:
     def get_entire_workflow(self):
@@ -1933,19 +2386,28 @@ class DataStoreMgr:
         return workflow_msg
 
     def get_publish_deltas(self):
-        """Return deltas for publishing."""
-        all_deltas = DELTAS_MAP[ALL_DELTAS]()
+        """Return deltas for publishing.
+
+        Each delta is serialized once, here, so the publisher is handed
+        immutable bytes and the delta messages are free to be replaced.
+
+        Returns:
+            list: [(topic, bytes)]
+
+        """
         result = []
+        serialized_deltas = []
         for key, delta in self.deltas.items():
             if delta.ListFields():
-                result.append(
-                    (key.encode('utf-8'), delta, 'SerializeToString'))
-                getattr(all_deltas, key).CopyFrom(delta)
-        result.append(
-            (ALL_DELTAS.encode('utf-8'), all_deltas, 'SerializeToString')
-        )
+                serialized = delta.SerializeToString()
+                serialized_deltas.append((key, serialized))
+                result.append((key.encode('utf-8'), serialized))
+        result.append((
+            ALL_DELTAS.encode('utf-8'),
+            serialize_all_deltas(serialized_deltas)
+        ))
         self.publish_pending = True
-        return deepcopy(result)
+        return result
 
     def get_data_elements(self, element_type):
         """Get elements of a given type in the form of a delta.
@@ -1969,3 +2431,89 @@ class DataStoreMgr:
         else:
             pb_msg.added.extend(data[element_type].values())
         return pb_msg
+
+    def get_elements_payload(self, element_type, field_number, data=None):
+        """Return the elements of a type encoded as a repeated field.
+
+        The payload is cached until elements of this type change, so
+        repeated snapshot requests (e.g. from late-joining subscribers)
+        re-use the encoded elements.
+
+        Args:
+            element_type (str):
+                Key from DATA_TEMPLATE dictionary (not WORKFLOW).
+            field_number (int):
+                Number of the repeated field in the enclosing message.
+            data (dict, optional):
+                The workflow data-store (snapshot) to encode, defaults to
+                the current data-store.
+
+        Returns:
+            bytes
+
+        """
+        if data is None:
+            data = self.data[self.workflow_id]
+        elements = data[element_type]
+        cache_key = (element_type, field_number)
+        # The server may call this from another thread, while the main
+        # loop applies deltas and clears the cache.
+        with self.snapshot_lock:
+            generation = self.snapshot_generation
+            cached_elements, payload = self.snapshot_payloads.get(
+                cache_key, (None, None))
+            if cached_elements is elements:
+                return payload
+        payload = b''.join(
+            encode_message_field(field_number, element.SerializeToString())
+            for element in elements.values()
+        )
+        with self.snapshot_lock:
+            if generation == self.snapshot_generation:
+                self.snapshot_payloads[cache_key] = (elements, payload)
+        return payload
+
+    def serialize_entire_workflow(self):
+        """Return the serialized get_entire_workflow message.
+
+        Returns:
+            bytes
+
+        """
+        data = self.data[self.workflow_id]
+        fields = PbEntireWorkflow.DESCRIPTOR.fields_by_name
+        payloads = [
+            encode_message_field(
+                fields[WORKFLOW].number, data[WORKFLOW].SerializeToString())
+        ]
+        # in field number order, as SerializeToString would
+        for key in (
+            TASKS, TASK_PROXIES, JOBS, FAMILIES, FAMILY_PROXIES, EDGES
+        ):
+            payloads.append(
+                self.get_elements_payload(key, fields[key].number, data))
+        return b''.join(payloads)
+
+    def serialize_data_elements(self, element_type):
+        """Return the serialized get_data_elements message.
+
+        Args:
+            element_type (str):
+                Key from DELTAS_MAP dictionary.
+
+        Returns:
+            bytes
+
+        """
+        if element_type not in DATA_TEMPLATE or element_type == WORKFLOW:
+            return self.get_data_elements(element_type).SerializeToString()
+        data = self.data[self.workflow_id]
+        delta_cls = DELTAS_MAP[element_type]
+        return (
+            delta_cls(time=data[WORKFLOW].last_updated).SerializeToString()
+            + self.get_elements_payload(
+                element_type,
+                delta_cls.DESCRIPTOR.fields_by_name[DELTA_ADDED].number,
+                data
+            )
+        )
@@ -15,12 +15,15 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Client for workflow runtime API."""
 
+import asyncio
+from contextlib import contextmanager
 from functools import partial
 import os
 from shutil import which
 import socket
 import sys
-from typing import Union, Dict
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 import zmq
 import zmq.asyncio
@@ -43,7 +46,12 @@ from cylc.flow.network.client_factory import CommsMeth
 from cylc.flow.network.server import PB_METHOD_MAP
 from cylc.flow.workflow_files import (
     ContactFileFields,
+    KeyInfo,
+    KeyOwner,
+    KeyType,
     detect_old_contact_file,
+    get_contact_file,
+    get_workflow_srv_dir,
     load_contact_file
 )
 
@@ -307,3 +315,158 @@ class WorkflowRuntimeClient(ZMQSocketBase):
             raise WorkflowStopped(workflow)
 
     __call__ = serial_request
+
+
+def _stat_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    """Return a signature which changes if a file is rewritten."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+class WorkflowRuntimeClientPool:
+    """A pool of connected clients for reuse across requests.
+
+    Creating a client reads the workflow contact file, loads the CURVE keys
+    and connects a new socket. Processes which make repeated requests (e.g.
+    scan) can reuse connected clients from this pool instead.
+
+    Clients are pooled by workflow, host, port and server public key. Before
+    a client is reused the contact file and server key are checked (by
+    ``stat``) so that a new client is connected if the workflow has been
+    restarted. A client is discarded if an error occurs while it is in use.
+    The idle clients of a workflow are closed when it is found to have
+    stopped (its contact file has gone).
+
+    Clients are bound to the event loop they were created in, so should be
+    used with ``async_request``.
+
+    Usage:
+        with pool.client(workflow) as client:
+            await client.async_request(...)
+
+    """
+
+    def __init__(self):
+        # idle clients: {(workflow, host, port, key_signature): [client]}
+        self.clients: Dict[tuple, List[WorkflowRuntimeClient]] = {}
+        # contact file location: {workflow: (contact_signature, host, port)}
+        self.locations: Dict[str, tuple] = {}
+        self.lock = Lock()
+
+    @contextmanager
+    def client(
+        self,
+        workflow: str,
+        host: str = None,
+        port: int = None,
+        timeout: Union[float, str] = None
+    ) -> Iterator[WorkflowRuntimeClient]:
+        """Yield a connected client for a workflow.
+
+        Args:
+            workflow: Name of the workflow to connect to.
+            host: The host the workflow is running on if known.
+            port: The port the workflow server is listening on if known.
+            timeout: The default timeout for requests (seconds).
+
+        Raises:
+            WorkflowStopped: If the workflow is not running.
+
+        """
+        key = self._get_key(workflow, host, port)
+        client = self._acquire(key, timeout)
+        try:
+            yield client
+        except BaseException:
+            # the socket may be waiting for a response, don't reuse it
+            client.stop(stop_loop=False)
+            raise
+        self._release(key, client)
+
+    def clear(self) -> None:
+        """Close all idle clients."""
+        with self.lock:
+            for clients in self.clients.values():
+                for client in clients:
+                    client.stop(stop_loop=False)
+            self.clients.clear()
+            self.locations.clear()
+
+    def _get_key(self, workflow, host, port):
+        if not host or not port:
+            host, port = self._get_location(workflow)
+        key_signature = _stat_signature(
+            KeyInfo(
+                KeyType.PUBLIC,
+                KeyOwner.SERVER,
+                workflow_srv_dir=get_workflow_srv_dir(workflow)
+            ).full_key_path
+        )
+        return (workflow, host, int(port), key_signature)
+
+    def _get_location(self, workflow):
+        """Return the host and port from the contact file if it has changed.
+        """
+        contact_signature = _stat_signature(get_contact_file(workflow))
+        if contact_signature is None:
+            self._remove(workflow)
+            raise WorkflowStopped(workflow)
+        with self.lock:
+            try:
+                signature, host, port = self.locations[workflow]
+            except KeyError:
+                signature = None
+        if signature != contact_signature:
+            host, port, _ = get_location(workflow)
+            with self.lock:
+                self.locations[workflow] = (contact_signature, host, port)
+        return host, port
+
+    def _remove(self, workflow):
+        """Forget a workflow and close its idle clients."""
+        stale = []
+        with self.lock:
+            self.locations.pop(workflow, None)
+            for key in list(self.clients):
+                if key[0] == workflow:
+                    stale.extend(self.clients.pop(key))
+        for client in stale:
+            client.stop(stop_loop=False)
+
+    def _acquire(self, key, timeout):
+        workflow, host, port, _ = key
+        loop = asyncio.get_event_loop()
+        stale = []
+        client = None
+        with self.lock:
+            for other_key in list(self.clients):
+                if other_key[0] == workflow and other_key != key:
+                    # the workflow has moved or its keys have changed
+                    stale.extend(self.clients.pop(other_key))
+            clients = self.clients.get(key, [])
+            while clients:
+                client = clients.pop()
+                if not client.socket.closed and client.loop is loop:
+                    break
+                stale.append(client)
+                client = None
+        for stale_client in stale:
+            stale_client.stop(stop_loop=False)
+        if client is None:
+            return WorkflowRuntimeClient(
+                workflow, host=host, port=port, timeout=timeout)
+        if timeout is None:
+            timeout = client.DEFAULT_TIMEOUT
+        client.timeout = float(timeout) * 1000
+        return client
+
+    def _release(self, key, client):
+        with self.lock:
+            self.clients.setdefault(key, []).append(client)
+
+
+CLIENT_POOL = WorkflowRuntimeClientPool()
+"""Process-wide pool of workflow runtime clients."""
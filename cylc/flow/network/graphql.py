@@ -19,7 +19,7 @@ GraphQL Middleware defined here also.
 
 """
 
-from functools import partial
+from functools import lru_cache, partial
 import logging
 from typing import Tuple
 
@@ -33,9 +33,10 @@ from graphql.execution.values import get_argument_values, get_variable_values
 from graphql.language.base import parse, print_ast
 from graphql.language import ast
 from graphql.backend.base import GraphQLBackend, GraphQLDocument
-from graphql.backend.core import execute_and_validate
+from graphql.execution import ExecutionResult, execute
 from graphql.utils.base import type_from_ast
 from graphql.type import get_named_type
+from graphql.validation import validate
 from promise import Promise
 from rx import Observable
 
@@ -47,6 +48,7 @@ STRIP_ARG = 'strip_null'
 NULL_VALUE = None
 EMPTY_VALUES: Tuple[list, dict] = ([], {})
 STRIP_OPS = {'query', 'subscription'}
+DOCUMENT_CACHE_SIZE = 256
 
 
 def grow_tree(tree, path, leaves=None):
@@ -243,10 +245,35 @@ class AstDocArguments:
         return False
 
 
+@lru_cache(DOCUMENT_CACHE_SIZE)
+def parse_and_validate(schema, document_string):
+    """Return the parsed document and its validation errors.
+
+    Clients send the same few requests over and over, so the results are
+    cached by request string, see ``parse_and_validate.cache_info()`` for
+    the hit/miss counts.
+
+    Args:
+        schema (GraphQLSchema)
+        document_string (str)
+
+    Returns:
+        tuple - (Document, list)
+
+    Raises:
+        graphql.error.GraphQLSyntaxError:
+            If the document cannot be parsed (not cached).
+
+    """
+    document_ast = parse(document_string)
+    return document_ast, validate(schema, document_ast)
+
+
 def execute_and_validate_and_strip(
         schema,
         document_ast,
         *args,
+        validation_errors=None,
         **kwargs
 ):
     """
@@ -254,13 +281,20 @@ def execute_and_validate_and_strip(
         schema (GraphQLSchema)
         document_ast (Document)
         args (Any)
+        validation_errors (list):
+            The result of validating the document, if already known.
         kwargs (Any)
 
     Returns
         Union[ExecutionResult, Observable]
 
     """
-    result = execute_and_validate(schema, document_ast, *args, **kwargs)
+    if kwargs.get('validate', True):
+        if validation_errors is None:
+            validation_errors = validate(schema, document_ast)
+        if validation_errors:
+            return ExecutionResult(errors=validation_errors, invalid=True)
+    result = execute(schema, document_ast, *args, **kwargs)
 
     # Search request document to determine if 'stripNull: true' is set
     # as and argument. It can not be done in the middleware, as they
@@ -281,6 +315,9 @@ class CylcGraphQLBackend(GraphQLBackend):
     The null value stripping of result is triggered by the presence
     of argument & value "stripNull: true" in any field.
 
+    Parsed and validated request strings are cached (see
+    ``parse_and_validate``).
+
     This is a modification of GraphQLCoreBackend found within:
         https://github.com/graphql-python/graphql-core-legacy
     (graphql-core==2.3.2)
@@ -309,13 +346,16 @@ class CylcGraphQLBackend(GraphQLBackend):
             graphql.GraphQLDocument
 
         """
+        validation_errors = None
         if isinstance(document_string, ast.Document):
             document_ast = document_string
             document_string = print_ast(document_ast)
-        else:
-            if not isinstance(document_string, str):
-                logger.error("The query must be a string")
+        elif not isinstance(document_string, str):
+            logger.error("The query must be a string")
             document_ast = parse(document_string)
+        else:
+            document_ast, validation_errors = parse_and_validate(
+                schema, document_string)
         return GraphQLDocument(
             schema=schema,
             document_string=document_string,
@@ -324,6 +364,7 @@ class CylcGraphQLBackend(GraphQLBackend):
                 execute_and_validate_and_strip,
                 schema,
                 document_ast,
+                validation_errors=validation_errors,
                 **self.execute_params
             ),
         )
@@ -94,6 +94,8 @@ class WorkflowPublisher(ZMQSocketBase):
 
         Args:
             items (iterable): [(topic, data, serializer)]
+                The serializer may be omitted if data is already
+                serialized (bytes), in which case it is sent as is.
 
         """
         try:
@@ -28,7 +28,7 @@ from graphene.utils.str_converters import to_snake_case
 
 from cylc.flow import ID_DELIM
 from cylc.flow.data_store_mgr import (
-    EDGES, FAMILY_PROXIES, TASK_PROXIES, WORKFLOW,
+    EDGES, FAMILY_PROXIES, INDEXED_TYPES, TASK_PROXIES, WORKFLOW,
     DELTA_ADDED, create_delta_store
 )
 from cylc.flow.network.schema import (
@@ -170,6 +170,69 @@ def node_filter(node, node_type, args):
     )
 
 
+def is_glob(pattern):
+    """Return True if the pattern contains fnmatch wildcards.
+
+    Examples:
+        >>> is_glob('foo')
+        False
+        >>> is_glob('f*')
+        True
+
+    """
+    return any(char in pattern for char in '*?[')
+
+
+def get_indexed_ids(indexes, node_type, args):
+    """Return the ids of the nodes which may match the filter args.
+
+    Uses the data-store indexes (see NodeIndexes) to narrow down the nodes
+    to be filtered (by node_filter).
+
+    Args:
+        indexes (cylc.flow.data_store_mgr.NodeIndexes):
+            The indexes of the workflow.
+        node_type (str):
+            The data-store element type.
+        args (dict):
+            The filter args.
+
+    Returns:
+        set - The ids, or None if the args can't be resolved using the
+        indexes, in which case all nodes must be filtered.
+
+    """
+    candidates = []
+    if args.get('states'):
+        candidates.append(set().union(*(
+            indexes.get(node_type, 'state', state)
+            for state in args['states']
+        )))
+    for field in ('is_held', 'is_queued'):
+        if args.get(field) is not None:
+            candidates.append(indexes.get(node_type, field, args[field]))
+    if args.get('ids'):
+        ids = set()
+        for _, _, cycle, name, _, _ in args['ids']:
+            # (nodes match an id if any of their namespaces match the name)
+            item_ids = []
+            if cycle and not is_glob(cycle):
+                item_ids.append(indexes.get(node_type, 'cycle_point', cycle))
+            if name and not is_glob(name):
+                item_ids.append(indexes.get(node_type, 'namespace', name))
+            if not item_ids:
+                # this id has to be matched against all nodes
+                break
+            ids.update(item_ids[0].intersection(*item_ids[1:]))
+        else:
+            candidates.append(ids)
+    if not candidates:
+        return None
+    # intersect in size order
+    candidates.sort(key=len)
+    return candidates[0].intersection(*candidates[1:])
+
+
 def get_flow_data_from_ids(data_store, native_ids):
     """Return workflow data by id."""
     w_ids = set()
@@ -239,10 +302,33 @@ class BaseResolvers:  # noqa: SIM119 (no real gain + mutable default)
         return sort_elements(
             [n
              for flow in await self.get_workflows_data(args)
-             for n in flow.get(node_type).values()
+             for n in self.get_filter_nodes(flow, node_type, args)
              if node_filter(n, node_type, args)],
             args)
 
+    def get_filter_nodes(self, flow, node_type, args):
+        """Return the nodes of a workflow which may match the filter args.
+
+        The data-store indexes are used where the args allow, otherwise all
+        nodes of the type are returned.
+
+        """
+        nodes = flow.get(node_type)
+        if (
+            node_type not in INDEXED_TYPES
+            or ('sub_id' in args and args['delta_store'])
+        ):
+            return nodes.values()
+        # (not all data-store managers maintain indexes)
+        indexes = getattr(self.data_store_mgr, 'indexes', {}).get(
+            flow[WORKFLOW].id)
+        if indexes is None:
+            return nodes.values()
+        ids = get_indexed_ids(indexes, node_type, args)
+        if ids is None:
+            return nodes.values()
+        return [nodes[n_id] for n_id in ids if n_id in nodes]
+
     async def get_nodes_by_ids(self, node_type, args):
         """Return protobuf node objects for given id."""
         nat_ids = set(args.get('native_ids', []))
@@ -62,9 +62,9 @@ from cylc.flow.async_util import (
 )
 from cylc.flow.exceptions import WorkflowStopped
 from cylc.flow.network.client import (
+    CLIENT_POOL,
     ClientError,
     ClientTimeout,
-    WorkflowRuntimeClient,
 )
 from cylc.flow.pathutil import get_cylc_run_dir
 from cylc.flow.rundb import CylcWorkflowDAO
@@ -378,24 +378,24 @@ async def graphql_query(flow, fields, filters=None):
 
     """
     query = f'query {{ workflows(ids: ["{flow["name"]}"]) {{ {fields} }} }}'
+    client = None
     try:
-        client = WorkflowRuntimeClient(
+        with CLIENT_POOL.client(
             flow['name'],
             # use contact_info data if present for efficiency
             host=flow.get('CYLC_WORKFLOW_HOST'),
             port=flow.get('CYLC_WORKFLOW_PORT')
-        )
+        ) as client:
+            ret = await client.async_request(
+                'graphql',
+                {
+                    'request_string': query,
+                    'variables': {}
+                }
+            )
     except WorkflowStopped:
         LOG.warning(f'Workflow not running: {flow["name"]}')
         return False
-    try:
-        ret = await client.async_request(
-            'graphql',
-            {
-                'request_string': query,
-                'variables': {}
-            }
-        )
     except ClientTimeout:
         LOG.exception(
             f'Timeout: name: {flow["name"]}, '
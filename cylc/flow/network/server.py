@@ -15,23 +15,29 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Server for workflow runtime API."""
 
+import asyncio
 import getpass  # noqa: F401
 from queue import Queue
 from textwrap import dedent
+from threading import Lock, Thread, local
 from time import sleep
 
 from graphql.execution.executors.asyncio import AsyncioExecutor
 import zmq
 
 from cylc.flow import LOG
+from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
 from cylc.flow.network import encode_, decode_, ZMQSocketBase
 from cylc.flow.network.authorisation import authorise
 from cylc.flow.network.graphql import (
-    CylcGraphQLBackend, IgnoreFieldMiddleware, instantiate_middleware
+    CylcGraphQLBackend,
+    IgnoreFieldMiddleware,
+    instantiate_middleware,
+    parse_and_validate
 )
 from cylc.flow.network.resolvers import Resolvers
 from cylc.flow.network.schema import schema
-from cylc.flow.data_store_mgr import DELTAS_MAP
+from cylc.flow.data_store_mgr import DELTAS_MAP, DataStoreSnapshot
 from cylc.flow.data_messages_pb2 import PbEntireWorkflow  # type: ignore
 
 # maps server methods to the protobuf message (for client/UIS import)
@@ -47,6 +53,42 @@ def expose(func=None):
     return func
 
 
+def is_mutation(message):
+    """Return True if a request message is a GraphQL mutation.
+
+    All other requests only read from the scheduler.
+
+    (The parsed document is cached for execution, see parse_and_validate.)
+
+    Examples:
+        >>> is_mutation({'command': 'api', 'args': {}})
+        False
+        >>> is_mutation({
+        ...     'command': 'graphql',
+        ...     'args': {'request_string': 'mutation { pause }'}
+        ... })
+        True
+        >>> is_mutation({
+        ...     'command': 'graphql',
+        ...     'args': {'request_string': '{ workflows { id } }'}
+        ... })
+        False
+
+    """
+    if message.get('command') != 'graphql':
+        return False
+    try:
+        document, _ = parse_and_validate(
+            schema, message['args']['request_string'])
+    except Exception:
+        # invalid request, the error will be reported on execution
+        return False
+    return any(
+        getattr(definition, 'operation', None) == 'mutation'
+        for definition in document.definitions
+    )
+
+
 def filter_none(dictionary):
     """Filter out `None` items from a dictionary:
 
@@ -126,9 +168,13 @@ class WorkflowRuntimeServer(ZMQSocketBase):
     """
 
     def __init__(self, schd, context=None, barrier=None,
-                 threaded=True, daemon=False):
-        super().__init__(zmq.REP, bind=True, context=context,
-                         barrier=barrier, threaded=threaded, daemon=daemon)
+                 threaded=True, daemon=False, workers=None):
+        if workers is None:
+            workers = glbl_cfg().get(['scheduler', 'server', 'worker threads'])
+        self.n_workers = workers
+        super().__init__(zmq.ROUTER if workers else zmq.REP, bind=True,
+                         context=context, barrier=barrier,
+                         threaded=threaded, daemon=daemon)
         self.schd = schd
         self.workflow = schd.workflow
         self.public_priv = None  # update in get_public_priv()
@@ -141,6 +187,10 @@ class WorkflowRuntimeServer(ZMQSocketBase):
         self.middleware = [
             IgnoreFieldMiddleware,
         ]
+        # worker pool mode (see _router)
+        self.workers = []
+        self.mutation_lock = Lock()
+        self.worker_local = local()
 
     def _socket_options(self):
         """Set socket options.
@@ -160,7 +210,10 @@ class WorkflowRuntimeServer(ZMQSocketBase):
         # start accepting requests
         self.queue = Queue()
         self.register_endpoints()
-        self._listener()
+        if self.n_workers:
+            self._router()
+        else:
+            self._listener()
 
     def _bespoke_stop(self):
         """Stop the listener and Authenticator.
@@ -194,21 +247,8 @@ class WorkflowRuntimeServer(ZMQSocketBase):
                 LOG.exception('unexpected error: %s', exc)
                 continue
 
-            # attempt to decode the message, authenticating the user in the
-            # process
-            try:
-                message = decode_(msg)
-            except Exception as exc:  # purposefully catch generic exception
-                # failed to decode message, possibly resulting from failed
-                # authentication
-                LOG.exception('failed to decode message: "%s"', exc)
-            else:
-                # success case - serve the request
-                res = self._receiver(message)
-                if message['command'] in PB_METHOD_MAP:
-                    response = res['data']
-                else:
-                    response = encode_(res).encode()
+            response = self._serve(msg)
+            if response is not None:
                 # send back the string to bytes response
                 self.socket.send(response)
 
@@ -219,6 +259,118 @@ class WorkflowRuntimeServer(ZMQSocketBase):
 
             sleep(0)  # yield control to other threads
 
+    def _router(self):
+        """The server main loop in worker pool mode.
+
+        Route requests from clients to a pool of worker threads (ROUTER to
+        DEALER) and their responses back to the clients.
+        """
+        address = f'inproc://{type(self).__name__}-workers-{id(self)}'
+        backend = self.context.socket(zmq.DEALER)
+        backend.bind(address)
+        for ind in range(self.n_workers):
+            thread = Thread(
+                target=self._worker,
+                args=(address,),
+                name=f'{type(self).__name__}-worker-{ind}',
+                daemon=True
+            )
+            thread.start()
+            self.workers.append(thread)
+        poller = zmq.Poller()
+        poller.register(self.socket, zmq.POLLIN)
+        poller.register(backend, zmq.POLLIN)
+        try:
+            while True:
+                # process any commands passed to the router by its parent
+                if self.queue.qsize():
+                    command = self.queue.get()
+                    if command == 'STOP':
+                        break
+                    raise ValueError('Unknown command "%s"' % command)
+
+                try:
+                    # wait RECV_TIMEOUT for a message
+                    events = dict(poller.poll(int(self.RECV_TIMEOUT) * 1000))
+                    if events.get(self.socket) == zmq.POLLIN:
+                        backend.send_multipart(self.socket.recv_multipart())
+                    if events.get(backend) == zmq.POLLIN:
+                        self.socket.send_multipart(backend.recv_multipart())
+                except zmq.error.ZMQError as exc:
+                    LOG.exception('unexpected error: %s', exc)
+        finally:
+            self.stopping = True
+            for thread in self.workers:
+                thread.join()
+            self.workers.clear()
+            backend.close(linger=0)
+
+    def _worker(self, address):
+        """Serve requests routed to this worker thread."""
+        # the GraphQL executor requires an asyncio loop on the thread
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        # queries are resolved against a snapshot of the data-store
+        data_store = DataStoreSnapshot(self.schd.data_store_mgr)
+        self.worker_local.resolvers = Resolvers(data_store, schd=self.schd)
+        socket = self.context.socket(zmq.REP)
+        socket.RCVTIMEO = int(self.RECV_TIMEOUT) * 1000
+        socket.connect(address)
+        try:
+            while not self.stopping:
+                try:
+                    msg = socket.recv_string()
+                except zmq.error.Again:
+                    continue
+                data_store.update()
+                response = self._serve(msg)
+                if response is None:
+                    # the worker must respond to every request
+                    response = encode_({'error': {
+                        'message': 'Failed to decode message.'}}).encode()
+                socket.send(response)
+        except zmq.error.ZMQError as exc:
+            LOG.exception('unexpected error: %s', exc)
+        finally:
+            socket.close(linger=0)
+            loop.close()
+
+    def _serve(self, msg):
+        """Decode and serve a request, return the encoded response.
+
+        Returns None if the message could not be decoded.
+        """
+        # attempt to decode the message, authenticating the user in the
+        # process
+        try:
+            message = decode_(msg)
+        except Exception as exc:  # purposefully catch generic exception
+            # failed to decode message, possibly resulting from failed
+            # authentication
+            LOG.exception('failed to decode message: "%s"', exc)
+            return None
+        # success case - serve the request
+        if self.n_workers and is_mutation(message):
+            # mutations are served one at a time, against the live
+            # data-store
+            with self.mutation_lock:
+                self.worker_local.mutating = True
+                try:
+                    res = self._receiver(message)
+                finally:
+                    self.worker_local.mutating = False
+        else:
+            res = self._receiver(message)
+        if message.get('command') in PB_METHOD_MAP:
+            return res['data']
+        return encode_(res).encode()
+
+    def _get_resolvers(self):
+        """Return the resolvers for the current request."""
+        if getattr(self.worker_local, 'mutating', False):
+            return self.resolvers
+        return getattr(self.worker_local, 'resolvers', self.resolvers)
+
     def _receiver(self, message):
         """Wrap incoming messages and dispatch them to exposed methods.
 
@@ -311,7 +463,7 @@ class WorkflowRuntimeServer(ZMQSocketBase):
                 request_string,
                 variable_values=variables,
                 context={
-                    'resolvers': self.resolvers,
+                    'resolvers': self._get_resolvers(),
                 },
                 backend=CylcGraphQLBackend(),
                 middleware=list(instantiate_middleware(self.middleware)),
@@ -335,6 +487,34 @@ class WorkflowRuntimeServer(ZMQSocketBase):
             return errors
         return executed.data
 
+    @authorise()
+    @expose
+    def put_messages(self, task_job=None, event_time=None, messages=None):
+        """Put task job messages in the queue for processing by the scheduler.
+
+        This is the endpoint used by ``cylc message``, it does the same as the
+        GraphQL ``message`` mutation without the cost of parsing, validating
+        and resolving a GraphQL request for each message.
+
+        Args:
+            task_job (str):
+                Task job in the format ``CYCLE/TASK_NAME/SUBMIT_NUM``.
+            event_time (str):
+                Event time as an ISO8601 string.
+            messages (list):
+                List in the format ``[[severity, message], ...]``.
+
+        Returns:
+            tuple: (outcome, message)
+
+            outcome (bool)
+                True if messages successfully queued.
+            message (str)
+                Information about outcome.
+
+        """
+        return self.resolvers.put_messages(task_job, event_time, messages)
+
     @authorise()
     @expose
     def get_graph_raw(
@@ -391,8 +571,7 @@ class WorkflowRuntimeServer(ZMQSocketBase):
                 Serialised Protobuf message
 
         """
-        pb_msg = self.schd.data_store_mgr.get_entire_workflow()
-        return pb_msg.SerializeToString()
+        return self.schd.data_store_mgr.serialize_entire_workflow()
 
     @authorise()
     @expose
@@ -408,5 +587,5 @@ class WorkflowRuntimeServer(ZMQSocketBase):
                 Serialised Protobuf message
 
         """
-        pb_msg = self.schd.data_store_mgr.get_data_elements(element_type)
-        return pb_msg.SerializeToString()
+        return self.schd.data_store_mgr.serialize_data_elements(
+            element_type)
@@ -128,6 +128,111 @@ def get_platform(
             )
 
 
+class _PlatformLookup:
+    """Resolve platform names against a platforms configuration.
+
+    The platform (and platform group) name regexes are compiled once, and
+    resolved platforms are cached by name, so they are shared by all callers
+    and must not be modified.
+
+    Args:
+        platforms: global.cylc platforms given as a dict.
+        platform_groups: global.cylc platform groups given as a dict.
+    """
+
+    # Substitute commas with or without spaces to allow lists of platforms.
+    REC_PLATFORM_LIST_SEP = re.compile(r'\s*(?!{[\s\d]*),(?![\s\d]*})\s*')
+
+    def __init__(
+        self,
+        platforms: Dict[str, Dict[str, Any]],
+        platform_groups: Dict[str, Dict[str, Any]]
+    ) -> None:
+        self.platforms = platforms
+        self.platform_groups = platform_groups
+        # The lists are reversed to allow user-set platforms (which are
+        # loaded later than site set platforms) to be matched first and
+        # override site defined platforms.
+        self.platform_group_recs = [
+            (re.compile(name_re), name_re)
+            for name_re in reversed(list(platform_groups))
+        ]
+        self.platform_recs = [
+            (re.compile(self.REC_PLATFORM_LIST_SEP.sub('|', name_re)), name_re)
+            for name_re in reversed(list(platforms))
+        ]
+        self.resolved: Dict[str, Dict[str, Any]] = {}
+
+    def get(
+        self,
+        platform_name: Optional[str] = None,
+        bad_hosts: Optional[Set[str]] = None
+    ) -> Dict[str, Any]:
+        """Return the platform for a platform (or platform group) name."""
+        if platform_name is None:
+            platform_name = 'localhost'
+
+        for platform_group_rec, platform_name_re in self.platform_group_recs:
+            # Platform is member of a group.
+            # (Not cached, selection from the group can vary between calls.)
+            if platform_group_rec.fullmatch(platform_name):
+                platform_name = get_platform_from_group(
+                    self.platform_groups[platform_name_re],
+                    group_name=platform_name,
+                    bad_hosts=bad_hosts
+                )
+
+        try:
+            return self.resolved[platform_name]
+        except KeyError:
+            pass
+
+        for platform_rec, platform_name_re in self.platform_recs:
+            if platform_rec.fullmatch(platform_name):
+                # Deepcopy prevents contaminating platforms with data
+                # from other platforms matching platform_name_re
+                platform_data = deepcopy(self.platforms[platform_name_re])
+
+                # If hosts are not filled in make remote
+                # hosts the platform name.
+                # Example: `[platforms][workplace_vm_123]<nothing>`
+                #   should create a platform where
+                #   `remote_hosts = ['workplace_vm_123']`
+                if (
+                    'hosts' not in platform_data.keys() or
+                    not platform_data['hosts']
+                ):
+                    platform_data['hosts'] = [platform_name]
+                # Fill in the "private" name field.
+                platform_data['name'] = platform_name
+                self.resolved[platform_name] = platform_data
+                return platform_data
+
+        raise PlatformLookupError(
+            f"No matching platform \"{platform_name}\" found")
+
+
+# Platform lookup for the current global config, see _get_platform_lookup.
+_PLATFORM_LOOKUP: Optional[_PlatformLookup] = None
+
+
+def _get_platform_lookup() -> _PlatformLookup:
+    """Return the platform lookup for the current global config.
+
+    A new lookup is created whenever the global config is (re)loaded.
+    """
+    global _PLATFORM_LOOKUP
+    platforms = glbl_cfg().get(['platforms'])
+    platform_groups = glbl_cfg().get(['platform groups'])
+    if (
+        _PLATFORM_LOOKUP is None
+        or _PLATFORM_LOOKUP.platforms is not platforms
+        or _PLATFORM_LOOKUP.platform_groups is not platform_groups
+    ):
+        _PLATFORM_LOOKUP = _PlatformLookup(platforms, platform_groups)
+    return _PLATFORM_LOOKUP
+
+
 def platform_from_name(
     platform_name: Optional[str] = None,
     platforms: Optional[Dict[str, Dict[str, Any]]] = None,
@@ -141,6 +246,9 @@ def platform_from_name(
     raises error if platform is not in global.cylc or returns 'localhost' if
     no platform is initially selected.
 
+    Platforms from the global config are cached and shared between callers,
+    so must not be modified.
+
     Args:
         platform_name: name of platform to be retrieved.
         platforms: global.cylc platforms given as a dict.
@@ -150,59 +258,11 @@ def platform_from_name(
             Global Config.
     """
     if platforms is None:
-        platforms = glbl_cfg().get(['platforms'])
-    platform_groups = glbl_cfg().get(['platform groups'])
-
-    if platform_name is None:
-        platform_name = 'localhost'
-
-    platform_group = None
-    for platform_name_re in reversed(list(platform_groups)):
-        # Platform is member of a group.
-        if re.fullmatch(platform_name_re, platform_name):
-            platform_name = get_platform_from_group(
-                platform_groups[platform_name_re], group_name=platform_name,
-                bad_hosts=bad_hosts
-            )
-
-    # The list is reversed to allow user-set platforms (which are loaded
-    # later than site set platforms) to be matched first and override site
-    # defined platforms.
-    for platform_name_re in reversed(list(platforms)):
-        # We substitue commas with or without spaces to
-        # allow lists of platforms
-        if (
-            re.fullmatch(
-                re.sub(
-                    r'\s*(?!{[\s\d]*),(?![\s\d]*})\s*',
-                    '|',
-                    platform_name_re
-                ),
-                platform_name
-            )
-        ):
-            # Deepcopy prevents contaminating platforms with data
-            # from other platforms matching platform_name_re
-            platform_data = deepcopy(platforms[platform_name_re])
-
-            # If hosts are not filled in make remote
-            # hosts the platform name.
-            # Example: `[platforms][workplace_vm_123]<nothing>`
-            #   should create a platform where
-            #   `remote_hosts = ['workplace_vm_123']`
-            if (
-                'hosts' not in platform_data.keys() or
-                not platform_data['hosts']
-            ):
-                platform_data['hosts'] = [platform_name]
-            # Fill in the "private" name field.
-            platform_data['name'] = platform_name
-            if platform_group:
-                platform_data['group'] = platform_group
-            return platform_data
-
-    raise PlatformLookupError(
-        f"No matching platform \"{platform_name}\" found")
+        lookup = _get_platform_lookup()
+    else:
+        lookup = _PlatformLookup(
+            platforms, glbl_cfg().get(['platform groups']))
+    return lookup.get(platform_name, bad_hosts)
 
 
 def get_platform_from_group(
@@ -17,13 +17,105 @@
 """Functionality for expressing and evaluating logical triggers."""
 
 import math
-import re
 
 from cylc.flow import ID_DELIM
 from cylc.flow.cycling.loader import get_point
 from cylc.flow.exceptions import TriggerExpressionError
 from cylc.flow.data_messages_pb2 import (  # type: ignore
     PbPrerequisite, PbCondition)
+from cylc.flow.listify import listify
+
+
+OP_AND = '&'
+OP_OR = '|'
+
+
+def compile_condition(expr, get_leaf):
+    """Compile a (nested) list expression into a boolean expression tree.
+
+    The tree is made of leaves (as returned by get_leaf for each operand in
+    the expression) and (operator, (node, ...)) tuples. AND binds tighter
+    than OR as in the graph syntax.
+
+    Args:
+        expr (list): A (nested) list expression as returned by listify.
+        get_leaf (callable): Return the leaf for an operand, raise KeyError
+            if the operand is not valid.
+
+    Raises:
+        TriggerExpressionError: if the expression is not valid.
+
+    Examples:
+        >>> compile_condition(['a', '&', 'b', '|', 'c'], 'abc'.index)
+        ('|', (('&', (0, 1)), 2))
+        >>> compile_condition(['a', '&', ['b', '|', 'c']], 'abc'.index)
+        ('&', (0, ('|', (1, 2))))
+        >>> compile_condition(['a', '|'], 'abc'.index)
+        Traceback (most recent call last):
+        cylc.flow.exceptions.TriggerExpressionError: ...
+
+    """
+    or_nodes = []
+    and_nodes = []
+    expect_operand = True
+    for item in expr:
+        if item in (OP_AND, OP_OR):
+            if expect_operand:
+                raise TriggerExpressionError(f'missing operand before {item}')
+            if item == OP_OR:
+                or_nodes.append(and_nodes)
+                and_nodes = []
+            expect_operand = True
+            continue
+        if not expect_operand:
+            raise TriggerExpressionError(f'missing operator before {item}')
+        if isinstance(item, list):
+            and_nodes.append(compile_condition(item, get_leaf))
+        else:
+            try:
+                and_nodes.append(get_leaf(item))
+            except (KeyError, ValueError):
+                raise TriggerExpressionError(f'invalid operand {item}')
+        expect_operand = False
+    if expect_operand:
+        raise TriggerExpressionError('missing operand')
+    or_nodes.append(and_nodes)
+    nodes = [
+        nodes[0] if len(nodes) == 1 else (OP_AND, tuple(nodes))
+        for nodes in or_nodes
+    ]
+    return nodes[0] if len(nodes) == 1 else (OP_OR, tuple(nodes))
+
+
+def evaluate_condition(node, values):
+    """Evaluate a boolean expression tree from compile_condition.
+
+    Args:
+        node: The expression tree, with integer leaves.
+        values: Sequence of leaf values to evaluate the tree with.
+
+    Examples:
+        >>> tree = compile_condition(['a', '&', 'b', '|', 'c'], 'abc'.index)
+        >>> evaluate_condition(tree, [True, False, False])
+        False
+        >>> evaluate_condition(tree, [True, True, False])
+        True
+        >>> evaluate_condition(tree, [False, False, True])
+        True
+
+    """
+    if node.__class__ is int:
+        return bool(values[node])
+    operator, nodes = node
+    if operator == OP_OR:
+        for sub_node in nodes:
+            if evaluate_condition(sub_node, values):
+                return True
+        return False
+    for sub_node in nodes:
+        if not evaluate_condition(sub_node, values):
+            return False
+    return True
 
 
 class Prerequisite:
@@ -41,10 +133,8 @@ class Prerequisite:
     # Memory optimization - constrain possible attributes to this list.
     __slots__ = ["satisfied", "_all_satisfied",
                  "target_point_strings", "start_point",
-                 "conditional_expression", "point"]
+                 "conditional_expression", "_condition", "point"]
 
-    # Extracts T from "foo.T succeeded" etc.
-    SATISFIED_TEMPLATE = 'bool(self.satisfied[("%s", "%s", "%s")])'
     MESSAGE_TEMPLATE = '%s.%s %s'
 
     DEP_STATE_SATISFIED = 'satisfied naturally'
@@ -71,6 +161,12 @@ class Prerequisite:
         # 'foo.1 failed & bar.1 succeeded'
         self.conditional_expression = None
 
+        # The compiled conditional expression (see compile_condition) and
+        # the message for each of its leaves:
+        # (tree, (message, ...)), or the compile error message if the
+        # expression is invalid.
+        self._condition = None
+
         # The cached state of this prerequisite:
         # * `None` (no cached state)
         # * `True` (prerequisite satisfied)
@@ -106,46 +202,56 @@ class Prerequisite:
         Returns None if this prerequisite is not a conditional one.
 
         """
-        expr = self.conditional_expression
-        if not expr:
-            return None
-        for message in self.satisfied:
-            expr = expr.replace(self.SATISFIED_TEMPLATE % message,
-                                self.MESSAGE_TEMPLATE % message)
-        return expr
+        return self.conditional_expression or None
 
-    def set_condition(self, expr):
+    def set_condition(self, expr, condition=None):
         """Set the conditional expression for this prerequisite.
         Resets the cached state (self._all_satisfied).
 
+        Args:
+            expr (str): The expression, e.g. "foo.1 succeeded|bar.1 failed".
+            condition (tuple): The expression already compiled, as
+                (tree, (message, ...)) where each message is the key in
+                self.satisfied for the corresponding leaf of the tree.
+                If not provided, the expression is compiled here.
+
         Examples:
             # GH #3644 construct conditional expression when one task name
             # is a substring of another: foo | xfoo => bar.
-            # Add 'foo' to the 'satisfied' dict before 'xfoo'.
             >>> preq = Prerequisite(1)
             >>> preq.satisfied = {
             ...    ('foo', '1', 'succeeded'): False,
             ...    ('xfoo', '1', 'succeeded'): False
             ... }
             >>> preq.set_condition("foo.1 succeeded|xfoo.1 succeeded")
-            >>> expr = preq.conditional_expression
-            >>> expr.split('|')  # doctest: +NORMALIZE_WHITESPACE
-            ['bool(self.satisfied[("foo", "1", "succeeded")])',
-            'bool(self.satisfied[("xfoo", "1", "succeeded")])']
+            >>> preq._condition  # doctest: +NORMALIZE_WHITESPACE
+            (('|', (0, 1)),
+             (('foo', '1', 'succeeded'), ('xfoo', '1', 'succeeded')))
 
         """
         self._all_satisfied = None
         if '|' in expr:
-            # Make a Python expression so we can eval() the logic.
-            for message in self.satisfied:
-                # Use '\b' in case one task name is a substring of another
-                # and escape special chars ('.', timezone '+') in task IDs.
-                expr = re.sub(
-                    fr"\b{re.escape(self.MESSAGE_TEMPLATE % message)}\b",
-                    self.SATISFIED_TEMPLATE % message,
-                    expr
-                )
             self.conditional_expression = expr
+            if condition is None:
+                messages = tuple(self.satisfied)
+                leaves = {
+                    self.MESSAGE_TEMPLATE % message: ind
+                    for ind, message in enumerate(messages)
+                }
+                try:
+                    condition = (
+                        compile_condition(listify(expr), leaves.__getitem__),
+                        messages
+                    )
+                except TriggerExpressionError as exc:
+                    # Report when evaluated.
+                    condition = str(exc)
+                except ValueError as exc:
+                    # (raised by listify) Report when evaluated.
+                    condition = (
+                        f'{exc} (could be unmatched parentheses in the graph'
+                        ' string?)')
+            self._condition = condition
 
     def is_satisfied(self):
         """Return True if prerequisite is satisfied.
@@ -161,7 +267,8 @@ class Prerequisite:
                 # No prerequisites left after pre-initial simplification.
                 return True
             if self.conditional_expression:
-                # Trigger expression with at least one '|': use eval.
+                # Trigger expression with at least one '|': evaluate the
+                # parsed condition tree (see evaluate_condition).
                 self._all_satisfied = self._conditional_is_satisfied()
             else:
                 self._all_satisfied = all(self.satisfied.values())
@@ -173,18 +280,14 @@ class Prerequisite:
         Does not cache the result.
 
         """
-        try:
-            res = eval(self.conditional_expression)  # nosec
-            # * the expression is constructed internally
-            # * https://github.com/cylc/cylc-flow/issues/4403
-        except (SyntaxError, ValueError) as exc:
-            err_msg = str(exc)
-            if str(exc).find("unexpected EOF") != -1:
-                err_msg += (
-                    " (could be unmatched parentheses in the graph string?)")
+        if isinstance(self._condition, str):
             raise TriggerExpressionError(
-                '"%s":\n%s' % (self.get_raw_conditional_expression(), err_msg))
-        return res
+                '"%s":\n%s'
+                % (self.get_raw_conditional_expression(), self._condition))
+        tree, messages = self._condition
+        satisfied = self.satisfied
+        return evaluate_condition(
+            tree, [satisfied[message] for message in messages])
 
     def satisfy_me(self, all_task_outputs):
         """Evaluate pre-requisite against known outputs.
@@ -193,8 +296,9 @@ class Prerequisite:
 
         """
         relevant_messages = all_task_outputs & set(self.satisfied)
-        for message in relevant_messages:
-            self.satisfied[message] = self.DEP_STATE_SATISFIED
+        if relevant_messages:
+            for message in relevant_messages:
+                self.satisfied[message] = self.DEP_STATE_SATISFIED
             if self.conditional_expression is None:
                 self._all_satisfied = all(self.satisfied.values())
             else:
@@ -303,16 +303,28 @@ class CylcWorkflowDAO:
         ],
     }
 
-    def __init__(self, db_file_name, is_public=False):
+    # Secondary indexes for lookups not covered by the primary keys:
+    # {index_name: (table_name, [column_name, ...])}
+    INDEXES = {
+        # workflow-state queries by cycle (and status) but not task name
+        "task_states_cycle_status": (TABLE_TASK_STATES, ["cycle", "status"]),
+        # job timings of succeeded tasks
+        "task_jobs_run_status_name": (TABLE_TASK_JOBS, ["run_status", "name"]),
+    }
+
+    def __init__(self, db_file_name, is_public=False, pragmas=None):
         """Initialise database access object.
 
         Args:
             db_file_name (str): Path to the database file.
             is_public (bool): If True, allow retries, etc.
+            pragmas (dict): SQLite PRAGMA settings to apply to each
+                connection, e.g. {"journal_mode": "wal"}.
 
         """
         self.db_file_name = expandvars(db_file_name)
         self.is_public = is_public
+        self.pragmas = pragmas or {}
         self.conn = None
         self.n_tries = 0
 
@@ -368,8 +380,20 @@ class CylcWorkflowDAO:
         """Connect to the database."""
         if self.conn is None:
             self.conn = sqlite3.connect(self.db_file_name, self.CONN_TIMEOUT)
+            for key, value in self.pragmas.items():
+                # (PRAGMA statements do not support parameters)
+                self.conn.execute(f"PRAGMA {key}={value}")
         return self.conn
 
+    def checkpoint(self) -> None:
+        """Make sure the database file contains all committed transactions.
+
+        This is only needed in WAL journal mode, where transactions are
+        committed to the WAL file which is later checkpointed to the
+        database file.
+        """
+        self.connect().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
     def create_tables(self):
         """Create tables."""
         names = []
@@ -381,27 +405,66 @@ class CylcWorkflowDAO:
         for name, table in self.tables.items():
             if name not in names:
                 cur = self.conn.execute(table.get_create_stmt())
+        # (Also adds missing indexes to databases from earlier versions.)
+        for index_name, (table_name, columns) in self.INDEXES.items():
+            cur = self.conn.execute(
+                rf"""
+                    CREATE INDEX IF NOT EXISTS
+                        {index_name}
+                    ON
+                        {table_name}({",".join(columns)})
+                """  # nosec (index, table and column names are constants)
+            )
         if cur is not None:
             self.conn.commit()
 
+    def _execute_queues(self):
+        """Execute (but do not commit) queued items for each table."""
+        for table in self.tables.values():
+            # DELETE statements may have varying number of WHERE args so we
+            # can only executemany for each identical template statement.
+            for stmt, stmt_args_list in table.delete_queues.items():
+                self._execute_stmt(stmt, stmt_args_list)
+            # INSERT statements are uniform for each table, so all INSERT
+            # statements can be executed using a single "executemany" call.
+            if table.insert_queue:
+                self._execute_stmt(
+                    table.get_insert_stmt(), table.insert_queue)
+            # UPDATE statements can have varying number of SET and WHERE
+            # args so we can only executemany for each identical template
+            # statement.
+            for stmt, stmt_args_list in table.update_queues.items():
+                self._execute_stmt(stmt, stmt_args_list)
+
+    def _clear_queues(self):
+        """Clear queued items for each table."""
+        for table in self.tables.values():
+            table.delete_queues.clear()
+            table.insert_queue.clear()
+            table.update_queues.clear()
+
+    def _on_write_error(self):
+        """Handle a failed write to the public database."""
+        self.n_tries += 1
+        LOG.warning(
+            "%(file)s: write attempt (%(attempt)d) did not complete\n" % {
+                "file": self.db_file_name, "attempt": self.n_tries})
+        if self.conn is not None:
+            with suppress(sqlite3.Error):
+                self.conn.rollback()
+
+    def _on_write_success(self):
+        """Report public database retry recovery if necessary."""
+        if self.n_tries:
+            LOG.warning(
+                "%(file)s: recovered after (%(attempt)d) attempt(s)\n" % {
+                    "file": self.db_file_name, "attempt": self.n_tries})
+        self.n_tries = 0
+
     def execute_queued_items(self):
         """Execute queued items for each table."""
         try:
-            for table in self.tables.values():
-                # DELETE statements may have varying number of WHERE args so we
-                # can only executemany for each identical template statement.
-                for stmt, stmt_args_list in table.delete_queues.items():
-                    self._execute_stmt(stmt, stmt_args_list)
-                # INSERT statements are uniform for each table, so all INSERT
-                # statements can be executed using a single "executemany" call.
-                if table.insert_queue:
-                    self._execute_stmt(
-                        table.get_insert_stmt(), table.insert_queue)
-                # UPDATE statements can have varying number of SET and WHERE
-                # args so we can only executemany for each identical template
-                # statement.
-                for stmt, stmt_args_list in table.update_queues.items():
-                    self._execute_stmt(stmt, stmt_args_list)
+            self._execute_queues()
             # Connection should only be opened if we have executed something.
             if self.conn is None:
                 return
@@ -409,30 +472,57 @@ class CylcWorkflowDAO:
         except sqlite3.Error:
             if not self.is_public:
                 raise
-            self.n_tries += 1
-            LOG.warning(
-                "%(file)s: write attempt (%(attempt)d) did not complete\n" % {
-                    "file": self.db_file_name, "attempt": self.n_tries})
-            if self.conn is not None:
-                with suppress(sqlite3.Error):
-                    self.conn.rollback()
+            self._on_write_error()
             return
         else:
-            # Clear the queues
-            for table in self.tables.values():
-                table.delete_queues.clear()
-                table.insert_queue.clear()
-                table.update_queues.clear()
-            # Report public database retry recovery if necessary
-            if self.n_tries:
-                LOG.warning(
-                    "%(file)s: recovered after (%(attempt)d) attempt(s)\n" % {
-                        "file": self.db_file_name, "attempt": self.n_tries})
-            self.n_tries = 0
+            self._clear_queues()
+            self._on_write_success()
         finally:
             # Note: This is not strictly necessary. But if the workflow run
             # directory is removed, a forced reconnection to the private
             # database will ensure that the workflow dies.
+            # In WAL mode closing the last connection checkpoints the
+            # database, which would cancel out the benefit of WAL, so the
+            # private database connection is kept open.
+            if self.is_public or self.pragmas.get("journal_mode") != "wal":
+                self.close()
+
+    def execute_batches(self, batches):
+        """Execute batches of items in a single transaction.
+
+        Each batch is a (deletes, inserts, updates) tuple, where deletes
+        is a list of (table_name, where_args), inserts is a list of
+        (table_name, args), and updates is an iterable of (table_name,
+        set_args, where_args). Each batch is executed in the same way as
+        it would be by queueing its items then calling execute_queued_items,
+        but only one commit is made for all of them.
+
+        Return True on success. Return False on failure of the public
+        database, in which case the transaction is rolled back and nothing
+        is written (the caller may retry the batches later).
+        """
+        try:
+            for deletes, inserts, updates in batches:
+                for table_name, where_args in deletes:
+                    self.add_delete_item(table_name, where_args)
+                for table_name, args in inserts:
+                    self.add_insert_item(table_name, args)
+                for table_name, set_args, where_args in updates:
+                    self.add_update_item(table_name, set_args, where_args)
+                self._execute_queues()
+                self._clear_queues()
+            if self.conn is not None:
+                self.conn.commit()
+        except sqlite3.Error:
+            self._clear_queues()
+            if not self.is_public:
+                raise
+            self._on_write_error()
+            return False
+        else:
+            self._on_write_success()
+            return True
+        finally:
             self.close()
 
     def _execute_stmt(self, stmt, stmt_args_list):
@@ -40,6 +40,7 @@ from zmq.auth.thread import ThreadAuthenticator
 from metomi.isodatetime.parsers import TimePointParser
 
 from cylc.flow import LOG, main_loop, ID_DELIM, __version__ as CYLC_VERSION
+from cylc.flow.async_util import WakeUp, WakeUpQueue
 from cylc.flow.broadcast_mgr import BroadcastMgr
 from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
 from cylc.flow.config import WorkflowConfig
@@ -62,6 +63,7 @@ from cylc.flow.loggingutil import (
 from cylc.flow.timer import Timer
 from cylc.flow.network import API
 from cylc.flow.network.authentication import key_housekeeping
+from cylc.flow.network.graphql import parse_and_validate
 from cylc.flow.network.publisher import WorkflowPublisher
 from cylc.flow.network.schema import WorkflowStopMode
 from cylc.flow.network.server import WorkflowRuntimeServer
@@ -86,13 +88,14 @@ from cylc.flow.platforms import (
     is_platform_with_target_in_list)
 from cylc.flow.profiler import Profiler
 from cylc.flow.resources import extract_resources
-from cylc.flow.subprocpool import SubProcPool
+from cylc.flow.subprocpool import FunctionPool, SubProcPool
 from cylc.flow.workflow_db_mgr import WorkflowDatabaseManager
 from cylc.flow.workflow_events import (
     WorkflowEventContext, WorkflowEventHandler)
 from cylc.flow.workflow_status import StopMode, AutoRestartMode
 from cylc.flow import workflow_files
 from cylc.flow.taskdef import TaskDef
+from cylc.flow.task_deadlines import DeadlineQueue
 from cylc.flow.task_events_mgr import TaskEventsManager
 from cylc.flow.task_id import TaskID
 from cylc.flow.task_job_mgr import TaskJobManager
@@ -103,7 +106,6 @@ from cylc.flow.task_remote_mgr import (
     REMOTE_INIT_IN_PROGRESS)
 from cylc.flow.task_state import (
     TASK_STATUSES_ACTIVE,
-    TASK_STATUSES_NEVER_ACTIVE,
     TASK_STATUS_PREPARING,
     TASK_STATUS_SUBMITTED,
     TASK_STATUS_RUNNING,
@@ -141,6 +143,7 @@ class Scheduler:
     EVENT_STALL = WorkflowEventHandler.EVENT_STALL
 
     # Intervals in seconds
+    # (Maximum main loop sleep, the main loop is woken sooner as needed.)
     INTERVAL_MAIN_LOOP = 1.0
     INTERVAL_MAIN_LOOP_QUICK = 0.5
     INTERVAL_STOP_KILL = 10.0
@@ -167,6 +170,7 @@ class Scheduler:
     profiler: Profiler
     pool: TaskPool
     proc_pool: SubProcPool
+    func_pool: FunctionPool
     task_job_mgr: TaskJobManager
     task_events_mgr: TaskEventsManager
     workflow_event_handler: WorkflowEventHandler
@@ -174,8 +178,10 @@ class Scheduler:
     workflow_db_mgr: WorkflowDatabaseManager
     broadcast_mgr: BroadcastMgr
     xtrigger_mgr: XtriggerManager
+    deadlines: DeadlineQueue
 
     # queues
+    wake_up: WakeUp
     command_queue: Queue
     message_queue: Queue
     ext_trigger_queue: Queue
@@ -355,18 +361,25 @@ class Scheduler:
             self, context=self.zmq_context, barrier=self.barrier)
         self.publisher = WorkflowPublisher(
             self.workflow, context=self.zmq_context, barrier=self.barrier)
+        # Wake the main loop when there is something for it to do.
+        self.wake_up = WakeUp()
         self.proc_pool = SubProcPool()
-        self.command_queue = Queue()
-        self.message_queue = Queue()
-        self.ext_trigger_queue = Queue()
+        self.func_pool = FunctionPool(
+            self.workflow_run_dir, wake_up=self.wake_up)
+        self.command_queue = WakeUpQueue(self.wake_up)
+        self.message_queue = WakeUpQueue(self.wake_up)
+        self.ext_trigger_queue = WakeUpQueue(self.wake_up)
         self.workflow_event_handler = WorkflowEventHandler(self.proc_pool)
 
+        self.deadlines = DeadlineQueue()
         self.xtrigger_mgr = XtriggerManager(
             self.workflow,
             user=self.owner,
             broadcast_mgr=self.broadcast_mgr,
             data_store_mgr=self.data_store_mgr,
             proc_pool=self.proc_pool,
+            func_pool=self.func_pool,
+            deadlines=self.deadlines,
             workflow_run_dir=self.workflow_run_dir,
             workflow_share_dir=self.workflow_share_dir,
         )
@@ -458,7 +471,9 @@ class Scheduler:
             self.config,
             self.workflow_db_mgr,
             self.task_events_mgr,
-            self.data_store_mgr)
+            self.data_store_mgr,
+            self.xtrigger_mgr,
+            self.deadlines)
 
         self.is_reloaded = False
         self.data_store_mgr.initiate_data_model()
@@ -708,6 +723,7 @@ class Scheduler:
             self.pool.load_db_task_action_timers)
         self.workflow_db_mgr.pri_dao.select_xtriggers_for_restart(
             self.xtrigger_mgr.load_xtrigger_for_restart)
+        self.xtrigger_mgr.housekeep()
         self.workflow_db_mgr.pri_dao.select_abs_outputs_for_restart(
             self.pool.load_abs_outputs_for_restart)
         self.pool.load_db_tasks_to_hold()
@@ -1272,25 +1288,6 @@ class Scheduler:
         of the private database into it."""
         self.workflow_db_mgr.recover_pub_from_pri()
 
-    def late_tasks_check(self):
-        """Report tasks that are never active and are late."""
-        now = time()
-        for itask in self.pool.get_tasks():
-            if (
-                    not itask.is_late
-                    and itask.get_late_time()
-                    and itask.state(*TASK_STATUSES_NEVER_ACTIVE)
-                    and now > itask.get_late_time()
-            ):
-                msg = '%s (late-time=%s)' % (
-                    self.task_events_mgr.EVENT_LATE,
-                    time2str(itask.get_late_time()))
-                itask.is_late = True
-                LOG.warning('[%s] -%s', itask, msg)
-                self.task_events_mgr.setup_event_handlers(
-                    itask, self.task_events_mgr.EVENT_LATE, msg)
-                self.workflow_db_mgr.put_insert_task_late_flags(itask)
-
     def reset_inactivity_timer(self):
         """Reset inactivity timer - method passed to task event manager."""
         with suppress(KeyError):
@@ -1422,11 +1419,21 @@ class Scheduler:
         self._update_profile_info("scheduler loop dt (s)", now - tinit,
                                   amount_format="%.3f")
         self._update_cpu_usage()
+        if self.workflow_db_mgr.pub_writer is not None:
+            self._update_profile_info(
+                "public database lag (s)",
+                self.workflow_db_mgr.pub_writer.lag,
+                amount_format="%.3f")
         if now - self.previous_profile_point >= 60:
             # Only get this every minute.
             self.previous_profile_point = now
             self.profiler.log_memory("scheduler.py: loop #%d: %s" % (
                 self.count, get_current_time_string()))
+            cache_info = parse_and_validate.cache_info()
+            LOG.info(
+                "PROFILE: GraphQL document cache: hits: %d misses: %d"
+                " size: %d" % (
+                    cache_info.hits, cache_info.misses, cache_info.currsize))
         self.count += 1
 
     async def main_loop(self):
@@ -1455,40 +1462,37 @@ class Scheduler:
                 self.reset_inactivity_timer()
 
             self.proc_pool.process()
+            self.func_pool.process()
+
+            # Handle tasks whose wall-clock deadlines have passed (clock
+            # triggers, expiry and late times).
+            self.deadlines.process()
 
             # Tasks in the main pool that are waiting but not queued must be
             # waiting on external dependencies, i.e. xtriggers or ext_triggers.
-            # For these tasks, call any unsatisfied xtrigger functions, and
-            # queue tasks that have become ready. (Tasks do not appear in the
-            # main pool at all until all other-task deps are satisfied, and are
-            # queued immediately on release from runahead limiting if they are
-            # not waiting on external deps).
-            housekeep_xtriggers = False
-            for itask in self.pool.get_tasks():
+            # Call any xtrigger functions that are due, and queue tasks that
+            # have become ready. (Tasks do not appear in the main pool at all
+            # until all other-task deps are satisfied, and are queued
+            # immediately on release from runahead limiting if they are not
+            # waiting on external deps - else they are registered with the
+            # xtrigger manager.)
+            # Results are returned asynchronously.
+            for itask in self.xtrigger_mgr.call_xtriggers_async():
+                # Check for satisfied xtriggers, and queue if ready.
                 if (
-                    not itask.state(TASK_STATUS_WAITING)
-                    or itask.state.is_queued
-                    or itask.state.is_runahead
-                ):
-                    continue
-
-                if (
-                    itask.state.xtriggers
-                    and not itask.state.xtriggers_all_satisfied()
+                    self.xtrigger_mgr.check_xtriggers(
+                        itask, self.workflow_db_mgr.put_xtriggers)
+                    and all(itask.is_ready_to_run())
                 ):
-                    # Call unsatisfied xtriggers if not already in-process.
-                    # Results are returned asynchronously.
-                    self.xtrigger_mgr.call_xtriggers_async(itask)
-                    # Check for satisfied xtriggers, and queue if ready.
-                    if self.xtrigger_mgr.check_xtriggers(
-                            itask, self.workflow_db_mgr.put_xtriggers):
-                        housekeep_xtriggers = True
-                        if all(itask.is_ready_to_run()):
-                            self.pool.queue_task(itask)
+                    self.pool.queue_task(itask)
 
+            for itask in self.pool.get_tasks():
                 # Check for satisfied ext_triggers, and queue if ready.
                 if (
                     itask.state.external_triggers
+                    and itask.state(TASK_STATUS_WAITING)
+                    and not itask.state.is_queued
+                    and not itask.state.is_runahead
                     and not itask.state.external_triggers_all_satisfied()
                     and self.broadcast_mgr.check_ext_triggers(
                         itask, self.ext_trigger_queue)
@@ -1496,12 +1500,6 @@ class Scheduler:
                 ):
                     self.pool.queue_task(itask)
 
-            if housekeep_xtriggers:
-                # (Could do this periodically?)
-                self.xtrigger_mgr.housekeep(self.pool.get_tasks())
-
-            self.pool.set_expired_tasks()
-
             self.release_queued_tasks()
 
             if self.pool.sim_time_check(self.message_queue):
@@ -1509,7 +1507,6 @@ class Scheduler:
                 self.reset_inactivity_timer()
 
             self.broadcast_mgr.expire_broadcast(self.pool.get_min_point())
-            self.late_tasks_check()
 
             self.process_queued_task_messages()
             self.process_command_queue()
@@ -1551,21 +1548,28 @@ class Scheduler:
                 # Has the workflow stalled?
                 self.check_workflow_stalled()
 
-            # Sleep a bit for things to catch up.
-            # Quick sleep if there are items pending in process pool.
-            # (Should probably use quick sleep logic for other queues?)
-            elapsed = time() - tinit
-            quick_mode = self.proc_pool.is_not_done()
-            if (elapsed >= self.INTERVAL_MAIN_LOOP or
-                    quick_mode and elapsed >= self.INTERVAL_MAIN_LOOP_QUICK):
-                # Main loop has taken quite a bit to get through
-                # Still yield control to other threads by sleep(0.0)
-                duration = 0
-            elif quick_mode:
-                duration = self.INTERVAL_MAIN_LOOP_QUICK - elapsed
+            # Sleep until there is something to do: messages, commands,
+            # external triggers or in-process function results arriving wake
+            # the loop early; otherwise sleep until the next deadline, or at
+            # most INTERVAL_MAIN_LOOP. Subprocess exits are polled for, so
+            # sleep less if there are items pending in the process pool.
+            if has_updated or self.data_store_mgr.updates_pending:
+                # Handle the consequences of this pass (e.g. spawned tasks)
+                # and publish pending updates without delay.
+                await asyncio.sleep(0)
             else:
-                duration = self.INTERVAL_MAIN_LOOP - elapsed
-            await asyncio.sleep(duration)
+                if self.proc_pool.is_not_done():
+                    duration = self.INTERVAL_MAIN_LOOP_QUICK
+                else:
+                    duration = self.INTERVAL_MAIN_LOOP
+                now = time()
+                for due in (
+                    self.deadlines.get_next_due(),
+                    self.xtrigger_mgr.get_next_due()
+                ):
+                    if due is not None:
+                        duration = min(duration, max(due - now, 0))
+                await self.wake_up.wait(duration)
             # Record latest main loop interval
             self.main_loop_intervals.append(time() - tinit)
             # END MAIN LOOP
@@ -1676,6 +1680,9 @@ class Scheduler:
                 self.proc_pool.terminate()
             self.proc_pool.process()
 
+        if hasattr(self, 'func_pool'):
+            self.func_pool.terminate()
+
         if hasattr(self, 'pool'):
             if not self.is_stalled:
                 # (else already logged)
@@ -50,6 +50,10 @@ Examples:
   > WARNING:Hey!
   >__STDIN__
 
+  # Send a message along with any others sent by the job in the next 0.5s:
+  $ cylc message --batch-window=0.5 -- \
+  >     "${CYLC_WORKFLOW_NAME}" "${CYLC_TASK_JOB}" 'output 1 done'
+
 Note "${CYLC_WORKFLOW_NAME}" and "${CYLC_TASK_JOB}" are available in task job
 environments - you do not need to write their actual values in task scripting.
 
@@ -98,6 +102,17 @@ def get_option_parser():
         metavar='SEVERITY',
         help='Set severity levels for messages that do not have one',
         action='store', dest='severity')
+    parser.add_option(
+        '--batch-window',
+        metavar='SECONDS',
+        help=(
+            'Send the messages to the scheduler after SECONDS, together'
+            ' with any others from the same job in the meantime. The'
+            ' command returns at once; a background process sends the'
+            ' messages. Use this for jobs which send many messages in quick'
+            ' succession.'
+        ),
+        action='store', type='float', dest='batch_window')
 
     return parser
 
@@ -155,4 +170,5 @@ def main(parser: COP, options: 'Values', *args: str) -> None:
             messages.append([options.severity, message_str.strip()])
         else:
             messages.append([getLevelName(INFO), message_str.strip()])
-    record_messages(workflow, task_job, messages)
+    record_messages(
+        workflow, task_job, messages, batch_window=options.batch_window)
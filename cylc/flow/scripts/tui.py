@@ -21,12 +21,9 @@ View and control running workflows in the terminal.
 
 (Tui = Terminal User Interface)
 
-WARNING: Tui is experimental and may break with large flows.
-An upcoming change to the way Tui receives data from the scheduler will make it
-much more efficient in the future.
+Tui loads the workflow once then applies the changes published by the
+scheduler, so only the parts of the display which have changed are updated.
 """
-# TODO: remove this warning once Tui is delta-driven
-# https://github.com/cylc/cylc-flow/issues/3527
 
 from textwrap import indent
 from typing import TYPE_CHECKING
@@ -15,7 +15,10 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Manage queueing and pooling of subprocesses for the scheduler."""
 
+import asyncio
 from collections import deque
+from concurrent.futures import Executor, Future
+from functools import partial
 import json
 import os
 import select
@@ -23,8 +26,10 @@ from signal import SIGKILL
 import sys
 import shlex
 from tempfile import SpooledTemporaryFile
-from threading import RLock
+from queue import SimpleQueue
+from threading import RLock, Semaphore, Thread
 from time import time
+import traceback
 from subprocess import DEVNULL, run  # nosec
 from typing import Any, Callable, List, Optional
 
@@ -569,3 +574,219 @@ class SubProcPool:
         ):
             rsync_255_fail = True
         return rsync_255_fail
+
+
+class _DaemonThreadPoolExecutor(Executor):
+    """A pool of up to max_workers daemon threads.
+
+    Unlike ThreadPoolExecutor, whose threads are joined at interpreter exit,
+    a thread stuck in a function call cannot stop the process from exiting.
+    """
+
+    def __init__(self, max_workers, thread_name_prefix):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self.threads = []
+        self.closed = False
+        self._work_queue = SimpleQueue()
+        self._idle = Semaphore(0)
+
+    def submit(self, fn, *args, **kwargs):
+        if self.closed:
+            raise RuntimeError('cannot schedule new futures after shutdown')
+        future = Future()
+        self._work_queue.put((future, fn, args, kwargs))
+        if (
+            not self._idle.acquire(blocking=False)
+            and len(self.threads) < self.max_workers
+        ):
+            thread = Thread(
+                target=self._work,
+                name=f'{self.thread_name_prefix}_{len(self.threads)}',
+                daemon=True
+            )
+            thread.start()
+            self.threads.append(thread)
+        return future
+
+    def _work(self):
+        """Call functions from the work queue until shut down."""
+        while True:
+            item = self._work_queue.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as exc:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+            del item, future
+            self._idle.release()
+
+    def shutdown(self, wait=True):
+        self.closed = True
+        for _ in self.threads:
+            self._work_queue.put(None)
+        if wait:
+            for thread in self.threads:
+                thread.join()
+
+
+class FunctionPool:
+    """Run trusted xtrigger functions in the scheduler process.
+
+    Calling an xtrigger function via the SubProcPool starts a new Python
+    process ("cylc function-run") which has to import Cylc and the function
+    module before it can do anything. Functions listed in
+    "global.cylc[scheduler]in-process xtriggers" are instead imported once and
+    called here:
+
+    * Coroutine functions ("async def") are awaited in the event loop.
+    * Other functions are called in a pool of (up to "process pool size")
+      threads.
+
+    The interface mirrors the SubProcPool. Commands are queued with
+    "put_command" and their callbacks are called by "process" with the
+    function context populated as "cylc function-run" would have done,
+    i.e. "out" is the JSON encoded function return value.
+
+    Calls which take longer than "process pool timeout" (from the time they
+    are started by the event loop, including any time spent waiting for a
+    free thread) are reported as failed. Note that threads cannot be killed,
+    so a timed out function continues to occupy a thread until it returns
+    (the threads are daemon threads, so do not stop the scheduler from
+    exiting).
+
+    """
+
+    ERR_KILLED_ON_TIMEOUT = 'killed on timeout (%s)'
+    ERR_WORKFLOW_STOPPING = SubProcPool.ERR_WORKFLOW_STOPPING
+    RET_CODE_WORKFLOW_STOPPING = SubProcPool.RET_CODE_WORKFLOW_STOPPING
+
+    def __init__(self, src_dir, wake_up=None):
+        self.src_dir = src_dir
+        # Called when a function call is done, e.g. to wake the main loop.
+        self.wake_up = wake_up
+        self.func_names = set(
+            glbl_cfg().get(['scheduler', 'in-process xtriggers']))
+        self.size = glbl_cfg().get(['scheduler', 'process pool size'])
+        self.proc_pool_timeout = glbl_cfg().get(
+            ['scheduler', 'process pool timeout'])
+        self.closed = False
+        self.executor = None
+        self.runnings = []
+
+    def is_in_process(self, func_name):
+        """Return True if func_name should be called by this pool."""
+        return func_name in self.func_names
+
+    def is_not_done(self):
+        """Return True if runnings not empty."""
+        return bool(self.runnings)
+
+    def put_command(self, ctx, callback=None, callback_args=None):
+        """Start a new function call.
+
+        Arguments:
+            ctx (cylc.flow.subprocctx.SubFuncContext):
+                A context object containing the function to call and its
+                status.
+            callback (callable):
+                Function to call back when the function returns or on error.
+                Should have signature:
+                    callback(ctx, *callback_args) -> None
+            callback_args (list):
+                Extra arguments to the callback function.
+        """
+        if self.closed:
+            ctx.err = self.ERR_WORKFLOW_STOPPING
+            ctx.ret_code = self.RET_CODE_WORKFLOW_STOPPING
+            self._run_callback(ctx, callback, callback_args)
+            return
+        try:
+            func = get_func(ctx.func_name, self.src_dir)
+        except (ImportError, AttributeError) as exc:
+            ctx.err = str(exc)
+            ctx.ret_code = 1
+            self._run_callback(ctx, callback, callback_args)
+            return
+        LOG.debug(ctx.get_signature())
+        future = asyncio.ensure_future(
+            self._call(
+                func,
+                # Pass the function copies of its arguments, as it would
+                # get via the command line.
+                json.loads(json.dumps(ctx.func_args)),
+                json.loads(json.dumps(ctx.func_kwargs))
+            )
+        )
+        if self.wake_up is not None:
+            future.add_done_callback(self.wake_up)
+        self.runnings.append([future, ctx, callback, callback_args])
+
+    async def _call(self, func, func_args, func_kwargs):
+        """Call a function subject to the pool timeout.
+
+        Coroutine functions are awaited, other functions are called in a
+        thread.
+        """
+        if asyncio.iscoroutinefunction(func):
+            call = func(*func_args, **func_kwargs)
+        else:
+            if self.executor is None:
+                self.executor = _DaemonThreadPoolExecutor(
+                    max_workers=self.size, thread_name_prefix='xtrigger')
+            call = asyncio.get_event_loop().run_in_executor(
+                self.executor, partial(func, *func_args, **func_kwargs))
+        return await asyncio.wait_for(call, self.proc_pool_timeout)
+
+    @staticmethod
+    def _run_callback(ctx, callback, callback_args):
+        """Process function call completion."""
+        ctx.timestamp = get_current_time_string()
+        if callable(callback):
+            callback(ctx, *(callback_args or []))
+
+    def process(self):
+        """Process done function calls."""
+        runnings = []
+        for running in self.runnings:
+            future, ctx, callback, callback_args = running
+            if not future.done():
+                runnings.append(running)
+                continue
+            try:
+                ctx.out = json.dumps(future.result())
+            except asyncio.TimeoutError:
+                ctx.err = self.ERR_KILLED_ON_TIMEOUT % self.proc_pool_timeout
+                ctx.ret_code = 1
+            except asyncio.CancelledError:
+                ctx.err = self.ERR_WORKFLOW_STOPPING
+                ctx.ret_code = self.RET_CODE_WORKFLOW_STOPPING
+            except Exception as exc:
+                # The function raised or returned a non JSON serialisable
+                # value (the subprocess would fail in the same way).
+                ctx.err = ''.join(
+                    traceback.format_exception(
+                        type(exc), exc, exc.__traceback__))
+                ctx.ret_code = 1
+            else:
+                ctx.ret_code = 0
+            self._run_callback(ctx, callback, callback_args)
+        self.runnings[:] = runnings
+
+    def terminate(self):
+        """Cancel remaining function calls and shut down the thread pool."""
+        self.closed = True
+        for future, ctx, callback, callback_args in self.runnings:
+            future.cancel()
+            ctx.err = self.ERR_WORKFLOW_STOPPING
+            ctx.ret_code = self.RET_CODE_WORKFLOW_STOPPING
+            self._run_callback(ctx, callback, callback_args)
+        self.runnings.clear()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
@@ -0,0 +1,135 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Wall-clock deadlines of tasks in the pool."""
+
+from heapq import heappop, heappush
+from itertools import count
+from time import time
+from typing import (
+    Any, Callable, Dict, Hashable, List, Optional, Set, Tuple, TYPE_CHECKING
+)
+
+if TYPE_CHECKING:
+    from cylc.flow.task_proxy import TaskProxy
+
+
+class DeadlineQueue:
+    """A priority queue of task deadlines, e.g. clock trigger or expiry times.
+
+    Each deadline has a callback which is called (by "process") once the
+    deadline has passed. So the cost of a main loop pass depends on the
+    number of deadlines which have passed, not the number of tasks waiting
+    on them.
+
+    Deadlines are identified by task and name. Putting a deadline replaces
+    any other with the same task and name.
+
+    Examples:
+        >>> itask = object()
+        >>> queue = DeadlineQueue()
+        >>> calls = []
+        >>> def callback(itask, name):
+        ...     calls.append(name)
+        >>> queue.put(itask, 'a', 2, callback, 'a')
+        >>> queue.put(itask, 'b', 1, callback, 'b')
+        >>> queue.put(itask, 'b', 3, callback, 'b')
+        >>> queue.get_next_due()
+        2
+        >>> queue.process(now=4)
+        >>> calls
+        ['a', 'b']
+        >>> queue.get_next_due() is None
+        True
+
+    """
+
+    def __init__(self):
+        # Min-heap of (due time, sequence number).
+        self._heap: List[Tuple[float, int]] = []
+        # Deadlines by sequence number.
+        self._deadlines: Dict[int, Tuple[
+            'TaskProxy', Hashable, Callable[..., Any], Tuple[Any, ...]
+        ]] = {}
+        # Sequence numbers of current deadlines, by (task, name).
+        self._seqs: Dict[Tuple['TaskProxy', Hashable], int] = {}
+        # Names of each task's deadlines.
+        self._names: Dict['TaskProxy', Set[Hashable]] = {}
+        self._seq = count()
+
+    def put(
+        self,
+        itask: 'TaskProxy',
+        name: Hashable,
+        due: float,
+        callback: Callable[..., Any],
+        *args: Any
+    ) -> None:
+        """Add a deadline, replacing any for the same task and name.
+
+        Args:
+            itask: The task the deadline is for.
+            name: Identifies the deadline amongst the task's deadlines.
+            due: The deadline (seconds since epoch).
+            callback: Called as "callback(itask, *args)" once due.
+            args: Extra arguments for the callback.
+
+        """
+        self.discard(itask, name)
+        seq = next(self._seq)
+        self._deadlines[seq] = (itask, name, callback, args)
+        self._seqs[(itask, name)] = seq
+        self._names.setdefault(itask, set()).add(name)
+        heappush(self._heap, (due, seq))
+
+    def discard(self, itask: 'TaskProxy', name: Hashable) -> None:
+        """Remove a deadline if present."""
+        seq = self._seqs.pop((itask, name), None)
+        if seq is None:
+            return
+        # (The heap entry is skipped when popped.)
+        del self._deadlines[seq]
+        names = self._names[itask]
+        names.discard(name)
+        if not names:
+            del self._names[itask]
+
+    def discard_task(self, itask: 'TaskProxy') -> None:
+        """Remove all of a task's deadlines, e.g. if it leaves the pool."""
+        for name in list(self._names.get(itask, ())):
+            self.discard(itask, name)
+
+    def get_next_due(self) -> Optional[float]:
+        """Return the time of the next deadline, if any."""
+        while self._heap:
+            due, seq = self._heap[0]
+            if seq in self._deadlines:
+                return due
+            heappop(self._heap)
+        return None
+
+    def process(self, now: Optional[float] = None) -> None:
+        """Call back all deadlines which have passed."""
+        if now is None:
+            now = time()
+        while self._heap and self._heap[0][0] < now:
+            _, seq = heappop(self._heap)
+            try:
+                itask, name, callback, args = self._deadlines[seq]
+            except KeyError:
+                # Replaced or discarded.
+                continue
+            self.discard(itask, name)
+            callback(itask, *args)
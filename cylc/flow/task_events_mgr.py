@@ -206,6 +206,7 @@ class TaskEventsManager():
         self.event_timers_updated = True
         # To be set by the task pool:
         self.spawn_func = None
+        self.deadlines_func = None
         self.timestamp = timestamp
         self.bad_hosts = bad_hosts
 
@@ -220,18 +221,21 @@ class TaskEventsManager():
             # Reset, task not active
             itask.timeout = None
             itask.poll_timer = None
+            itask.state.is_db_dirty = True
             return None
         ctx = (itask.submit_num, itask.state.status)
         if itask.poll_timer is None or itask.poll_timer.ctx != ctx:
             # Reset, timer no longer relevant
             itask.timeout = None
             itask.poll_timer = None
+            itask.state.is_db_dirty = True
             return None
         if now is not None and not itask.poll_timer.is_delay_done(now):
             return False
         if itask.poll_timer.num is None:
             itask.poll_timer.num = 0
         itask.poll_timer.next(no_exhaust=True)
+        itask.state.is_db_dirty = True
         return True
 
     def check_job_time(self, itask, now):
@@ -250,6 +254,7 @@ class TaskEventsManager():
         with suppress(TypeError, ValueError):
             msg += ' after %s' % intvl_as_str(itask.timeout - time_ref)
         itask.timeout = None  # emit event only once
+        itask.state.is_db_dirty = True
         if msg and event:
             LOG.warning('[%s] -%s', itask, msg)
             self.setup_event_handlers(itask, event, msg)
@@ -847,6 +852,9 @@ class TaskEventsManager():
             itask.state.add_xtrigger(label)
         if itask.state.reset(TASK_STATUS_WAITING):
             self.data_store_mgr.delta_task_state(itask)
+        self.deadlines_func(itask)
+        self.xtrigger_mgr.ref_task(itask)
+        self.xtrigger_mgr.add_task(itask)
 
     def _process_message_failed(self, itask, event_time, message):
         """Helper for process_message, handle a failed message.
@@ -1216,10 +1224,12 @@ class TaskEventsManager():
             # Reset, task not active
             itask.timeout = None
             itask.poll_timer = None
+            itask.state.is_db_dirty = True
             return
         ctx = (itask.submit_num, itask.state.status)
         if itask.poll_timer and itask.poll_timer.ctx == ctx:
             return
+        itask.state.is_db_dirty = True
         # Set poll timer
         # Set timeout
         timeref = None  # reference time, submitted or started time
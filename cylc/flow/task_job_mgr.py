@@ -981,6 +981,7 @@ class TaskJobManager:
                     itask.try_timers[key].set_delays(delays)
                 except KeyError:
                     itask.try_timers[key] = TaskActionTimer(delays=delays)
+            itask.state.is_db_dirty = True
 
     def _simulation_submit_task_jobs(self, itasks):
         """Simulation mode task jobs submission."""
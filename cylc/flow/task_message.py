@@ -21,11 +21,16 @@ Send task job messages to:
 - The scheduler, if communication is possible.
 """
 
+from contextlib import contextmanager
+import fcntl
+from itertools import groupby
+import json
 from logging import getLevelName, WARNING, ERROR, CRITICAL
 import os
 import sys
+from time import sleep
 
-from cylc.flow.exceptions import WorkflowStopped
+from cylc.flow.exceptions import ClientError, WorkflowStopped
 import cylc.flow.flags
 from cylc.flow.pathutil import get_workflow_run_job_dir
 from cylc.flow.network.client_factory import (
@@ -47,8 +52,15 @@ ABORT_MESSAGE_PREFIX = "aborted/"
 FAIL_MESSAGE_PREFIX = "failed/"
 VACATION_MESSAGE_PREFIX = "vacated/"
 
+# file of messages waiting to be sent, and the pid of the process to send them
+BATCH_SUFFIX = '.batch'
+BATCH_SENDER_SUFFIX = '.batch-sender'
+
 STDERR_LEVELS = (getLevelName(level) for level in (WARNING, ERROR, CRITICAL))
 
+# error returned by schedulers which do not have a requested endpoint
+NO_METHOD_ERROR = 'No method by the name'
+
 MUTATION = '''
 mutation (
   $wFlows: [WorkflowID]!,
@@ -68,7 +80,7 @@ mutation (
 '''
 
 
-def record_messages(workflow, task_job, messages):
+def record_messages(workflow, task_job, messages, batch_window=None):
     """Record task job messages.
 
     Print the messages according to their severity.
@@ -79,13 +91,28 @@ def record_messages(workflow, task_job, messages):
         workflow (str): Workflow name.
         task_job (str): Task job identifier "CYCLE/TASK_NAME/SUBMIT_NUM".
         messages (list): List of messages "[[severity, message], ...]".
+        batch_window (float):
+            If set, wait this many seconds for other messages from the job
+            and send them to the workflow together (see batch_messages).
     """
     # Record the event time, in case the message is delayed in some way.
     event_time = get_current_time_string(
         override_use_utc=(os.getenv('CYLC_UTC') == 'True'))
     write_messages(workflow, task_job, messages, event_time)
     if get_comms_method() != CommsMeth.POLL:
-        send_messages(workflow, task_job, messages, event_time)
+        if batch_window:
+            batch_messages(
+                workflow, task_job, messages, event_time, batch_window)
+        else:
+            # send any batched messages first to preserve the order
+            send_batch(
+                workflow,
+                task_job,
+                take_batch(workflow, task_job) + [
+                    (event_time, severity, message)
+                    for severity, message in messages
+                ]
+            )
 
 
 def write_messages(workflow, task_job, messages, event_time):
@@ -102,6 +129,23 @@ def write_messages(workflow, task_job, messages, event_time):
 
 
 def send_messages(workflow, task_job, messages, event_time):
+    send_batch(
+        workflow,
+        task_job,
+        [(event_time, severity, message) for severity, message in messages]
+    )
+
+
+def send_batch(workflow, task_job, batch):
+    """Send messages to the workflow in as few requests as possible.
+
+    Arguments:
+        workflow (str): Workflow name.
+        task_job (str): Task job identifier "CYCLE/TASK_NAME/SUBMIT_NUM".
+        batch (list): List of messages "[(event_time, severity, message)]".
+    """
+    if not batch:
+        return
     workflow = os.path.normpath(workflow)
     try:
         pclient = get_client(workflow)
@@ -117,6 +161,28 @@ def send_messages(workflow, task_job, messages, event_time):
             import traceback
             traceback.print_exc()
     else:
+        # one request per event time (consecutive messages usually share one)
+        for event_time, items in groupby(batch, key=lambda item: item[0]):
+            _send_messages(
+                pclient,
+                workflow,
+                task_job,
+                [[severity, message] for _, severity, message in items],
+                event_time
+            )
+
+
+def _send_messages(pclient, workflow, task_job, messages, event_time):
+    try:
+        pclient('put_messages', {
+            'task_job': task_job,
+            'event_time': event_time,
+            'messages': messages,
+        })
+    except ClientError as exc:
+        if NO_METHOD_ERROR not in str(exc):
+            raise
+        # scheduler predates the put_messages endpoint
         mutation_kwargs = {
             'request_string': MUTATION,
             'variables': {
@@ -129,11 +195,121 @@ def send_messages(workflow, task_job, messages, event_time):
         pclient('graphql', mutation_kwargs)
 
 
-def _append_job_status_file(workflow, task_job, event_time, messages):
-    """Write messages to job status file."""
+def batch_messages(workflow, task_job, messages, event_time, batch_window):
+    """Add messages to the job's batch, send the batch after batch_window.
+
+    Messages are appended to a batch file in the job log directory. The
+    first process to add to an empty batch starts a detached sender
+    process, which waits for batch_window seconds for other "cylc message"
+    calls from the job to add to the batch, then sends the whole batch to
+    the workflow. All callers return at once.
+
+    Arguments:
+        workflow (str): Workflow name.
+        task_job (str): Task job identifier "CYCLE/TASK_NAME/SUBMIT_NUM".
+        messages (list): List of messages "[[severity, message], ...]".
+        event_time (str): Event time as an ISO8601 string.
+        batch_window (float): Seconds to wait for other messages.
+    """
+    batch_file_name = _get_job_log_name(workflow, task_job) + BATCH_SUFFIX
+    with _lock_batch_file(batch_file_name) as batch_file:
+        for severity, message in messages:
+            batch_file.write(json.dumps([event_time, severity, message]))
+            batch_file.write('\n')
+        if _batch_sender_alive(batch_file_name):
+            # another process will send the batch
+            return
+        # (Flush first, else the sender would inherit the buffered writes.)
+        batch_file.flush()
+        pid = _spawn_batch_sender(workflow, task_job, batch_window)
+        with open(batch_file_name + BATCH_SENDER_SUFFIX, 'w') as handle:
+            handle.write(str(pid))
+
+
+def _spawn_batch_sender(workflow, task_job, batch_window):
+    """Send the job's batch after batch_window from a detached process.
+
+    Returns:
+        int: The process ID of the sender.
+    """
+    pid = os.fork()
+    if pid:
+        return pid
+    # (The sender must not return to the caller's code, or flush its
+    # inherited buffers, hence os._exit.)
+    ret_code = 1
+    try:
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in range(3):
+            # (Detach from the job's stdin/stdout/stderr.)
+            os.dup2(devnull, fd)
+        _send_batch_later(workflow, task_job, batch_window)
+        ret_code = 0
+    finally:
+        os._exit(ret_code)
+
+
+def _send_batch_later(workflow, task_job, batch_window):
+    """Wait for batch_window seconds, then send the job's batch."""
+    sleep(batch_window)
+    send_batch(workflow, task_job, take_batch(workflow, task_job))
+
+
+def take_batch(workflow, task_job):
+    """Remove and return any messages waiting in the job's batch.
+
+    Returns:
+        list: [(event_time, severity, message), ...]
+    """
+    batch_file_name = _get_job_log_name(workflow, task_job) + BATCH_SUFFIX
+    if not os.path.exists(batch_file_name):
+        return []
+    with _lock_batch_file(batch_file_name) as batch_file:
+        batch_file.seek(0)
+        batch = [tuple(json.loads(line)) for line in batch_file if line]
+        batch_file.truncate(0)
+        try:
+            os.unlink(batch_file_name + BATCH_SENDER_SUFFIX)
+        except FileNotFoundError:
+            pass
+    return batch
+
+
+@contextmanager
+def _lock_batch_file(batch_file_name):
+    """Open the batch file with an exclusive lock on it."""
+    with open(batch_file_name, 'a+') as batch_file:
+        fcntl.flock(batch_file, fcntl.LOCK_EX)
+        try:
+            yield batch_file
+        finally:
+            batch_file.flush()
+            fcntl.flock(batch_file, fcntl.LOCK_UN)
+
+
+def _batch_sender_alive(batch_file_name):
+    """Return True if a process is waiting to send the batch."""
+    try:
+        with open(batch_file_name + BATCH_SENDER_SUFFIX) as handle:
+            os.kill(int(handle.read()), 0)
+    except (OSError, ValueError):
+        # no sender, or the sender has died without sending the batch
+        return False
+    return True
+
+
+def _get_job_log_name(workflow, task_job):
+    """Return the path of the job script, the root of the job log files."""
     job_log_name = os.getenv('CYLC_TASK_LOG_ROOT')
     if not job_log_name:
         job_log_name = get_workflow_run_job_dir(workflow, task_job, 'job')
+    return job_log_name
+
+
+def _append_job_status_file(workflow, task_job, event_time, messages):
+    """Write messages to job status file."""
+    job_log_name = _get_job_log_name(workflow, task_job)
     try:
         job_status_file = open(job_log_name + '.status', 'a')  # noqa: SIM115
         # TODO: niceify read/write/appending messages to this file
@@ -41,6 +41,7 @@ from cylc.flow.task_proxy import TaskProxy
 from cylc.flow.task_state import (
     TASK_STATUSES_ACTIVE,
     TASK_STATUSES_FINAL,
+    TASK_STATUSES_NEVER_ACTIVE,
     TASK_STATUS_WAITING,
     TASK_STATUS_EXPIRED,
     TASK_STATUS_PREPARING,
@@ -52,7 +53,10 @@ from cylc.flow.task_state import (
     TASK_OUTPUT_FAILED,
     TASK_OUTPUT_SUCCEEDED,
 )
-from cylc.flow.wallclock import get_current_time_string
+from cylc.flow.wallclock import (
+    get_current_time_string,
+    get_time_string_from_unix_time as time2str
+)
 from cylc.flow.platforms import get_platform
 from cylc.flow.task_queues.independent import IndepQueueManager
 
@@ -60,9 +64,11 @@ if TYPE_CHECKING:
     from cylc.flow.config import WorkflowConfig
     from cylc.flow.cycling import IntervalBase, PointBase
     from cylc.flow.data_store_mgr import DataStoreMgr
+    from cylc.flow.task_deadlines import DeadlineQueue
     from cylc.flow.taskdef import TaskDef
     from cylc.flow.task_events_mgr import TaskEventsManager
     from cylc.flow.workflow_db_mgr import WorkflowDatabaseManager
+    from cylc.flow.xtrigger_mgr import XtriggerManager
 
 Pool = Dict['PointBase', Dict[str, TaskProxy]]
 
@@ -158,7 +164,9 @@ class TaskPool:
         config: 'WorkflowConfig',
         workflow_db_mgr: 'WorkflowDatabaseManager',
         task_events_mgr: 'TaskEventsManager',
-        data_store_mgr: 'DataStoreMgr'
+        data_store_mgr: 'DataStoreMgr',
+        xtrigger_mgr: 'XtriggerManager',
+        deadlines: 'DeadlineQueue'
     ) -> None:
 
         self.config: 'WorkflowConfig' = config
@@ -167,7 +175,10 @@ class TaskPool:
         self.task_events_mgr: 'TaskEventsManager' = task_events_mgr
         # TODO this is ugly:
         self.task_events_mgr.spawn_func = self.spawn_on_output
+        self.task_events_mgr.deadlines_func = self.add_deadlines
         self.data_store_mgr: 'DataStoreMgr' = data_store_mgr
+        self.xtrigger_mgr: 'XtriggerManager' = xtrigger_mgr
+        self.deadlines: 'DeadlineQueue' = deadlines
         self.flow_label_mgr = FlowLabelMgr()
 
         self.do_reload = False
@@ -184,6 +195,11 @@ class TaskPool:
         self.hidden_pool_list: List[TaskProxy] = []
         self.main_pool_changed = False
         self.hidden_pool_changed = False
+        # Flat index of all tasks in both pools {identity: itask}.
+        self.pool_index: Dict[str, TaskProxy] = {}
+        # Reverse index of outputs to the tasks with (suicide or normal)
+        # prerequisites on them {(name, point, output): {itask, ...}}.
+        self.prereqs_index: Dict[Tuple[str, str, str], Set[TaskProxy]] = {}
 
         self.hold_point: Optional['PointBase'] = None
         self.abs_outputs_done: Set[Tuple[str, str, str]] = set()
@@ -231,12 +247,43 @@ class TaskPool:
             if itask.identity in self.hidden_pool[itask.point]:
                 self.hidden_pool[itask.point][itask.identity] = itask
                 self.hidden_pool_changed = True
+                self._add_to_index(itask)
         elif (
             itask.point in self.main_pool
             and itask.identity in self.main_pool[itask.point]
         ):
+            self.xtrigger_mgr.ref_task(itask)
+            self.xtrigger_mgr.unref_task(
+                self.main_pool[itask.point][itask.identity])
+            self.deadlines.discard_task(
+                self.main_pool[itask.point][itask.identity])
+            self.add_deadlines(itask)
             self.main_pool[itask.point][itask.identity] = itask
             self.main_pool_changed = True
+            self._add_to_index(itask)
+
+    def _add_to_index(self, itask):
+        """Add a task to the pool indexes, replacing any old instance."""
+        old_itask = self.pool_index.get(itask.identity)
+        if old_itask is itask:
+            return
+        if old_itask is not None:
+            self._remove_from_index(old_itask)
+        self.pool_index[itask.identity] = itask
+        for message in itask.state.get_prerequisite_messages():
+            self.prereqs_index.setdefault(message, set()).add(itask)
+
+    def _remove_from_index(self, itask):
+        """Remove a task from the pool indexes."""
+        if self.pool_index.get(itask.identity) is not itask:
+            return
+        del self.pool_index[itask.identity]
+        for message in itask.state.get_prerequisite_messages():
+            itasks = self.prereqs_index.get(message)
+            if itasks is not None:
+                itasks.discard(itask)
+                if not itasks:
+                    del self.prereqs_index[message]
 
     def add_to_pool(self, itask, is_new=True):
         """Add a new task to the hidden or main pool.
@@ -265,8 +312,12 @@ class TaskPool:
             self.main_pool.setdefault(itask.point, {})
             self.main_pool[itask.point][itask.identity] = itask
             self.main_pool_changed = True
+            self.xtrigger_mgr.ref_task(itask)
+            self.add_deadlines(itask)
 
             self.create_data_store_elements(itask)
+        self._add_to_index(itask)
+        itask.state.is_db_dirty = True
 
         if is_new:
             # Add row to "task_states" table:
@@ -449,6 +500,9 @@ class TaskPool:
         (cycle, name, flow_label, is_late, status, is_held, submit_num, _,
          platform_name, time_submit, time_run, timeout, outputs_str) = row
         try:
+            if name not in self.config.taskdefs:
+                # (get_taskdef would create an implicit task for it)
+                raise WorkflowConfigError(f'task not in the graph: {name}')
             itask = TaskProxy(
                 self.config.get_taskdef(name),
                 get_point(cycle),
@@ -460,6 +514,10 @@ class TaskPool:
             LOG.exception(
                 f'ignoring task {name} from the workflow run database\n'
                 '(its task definition has probably been deleted).')
+            # Task pool rows are otherwise only deleted when the task leaves
+            # the pool, so delete them here or they would be loaded again on
+            # every restart.
+            self.workflow_db_mgr.put_delete_task_pool_rows(name, cycle)
         except Exception:
             LOG.exception(f'could not load task {name}')
         else:
@@ -519,6 +577,8 @@ class TaskPool:
         (cycle, name, ctx_key_raw, ctx_raw, delays_raw, num, delay,
          timeout) = row
         id_ = TaskID.get(name, cycle)
+        # Rows which are not loaded would otherwise never be deleted.
+        row_key = (name, cycle, ctx_key_raw)
         try:
             # Extract type namedtuple variables from JSON strings
             ctx_key = json.loads(str(ctx_key_raw))
@@ -539,12 +599,14 @@ class TaskPool:
             LOG.exception(
                 "%(id)s: skip action timer %(ctx_key)s" %
                 {"id": id_, "ctx_key": ctx_key_raw})
+            self.workflow_db_mgr.put_delete_task_action_timer(*row_key)
             return
         LOG.info("+ %s.%s %s" % (name, cycle, ctx_key))
         if ctx_key == "poll_timer":
             itask = self._get_task_by_id(id_)
             if itask is None:
                 LOG.warning("%(id)s: task not found, skip" % {"id": id_})
+                self.workflow_db_mgr.put_delete_task_action_timer(*row_key)
                 return
             itask.poll_timer = TaskActionTimer(
                 ctx, delays, num, delay, timeout)
@@ -552,6 +614,7 @@ class TaskPool:
             itask = self._get_task_by_id(id_)
             if itask is None:
                 LOG.warning("%(id)s: task not found, skip" % {"id": id_})
+                self.workflow_db_mgr.put_delete_task_action_timer(*row_key)
                 return
             if 'retrying' in ctx_key[1]:
                 if 'submit' in ctx_key[1]:
@@ -578,6 +641,8 @@ class TaskPool:
             if isinstance(key1, list):
                 key1 = tuple(key1)
             key = (key1, cycle, name, submit_num)
+            # (So the row is deleted if the timer is removed.)
+            self.workflow_db_mgr.event_timer_rows.add(row_key)
             self.task_events_mgr.add_event_timer(
                 key,
                 TaskActionTimer(
@@ -588,6 +653,7 @@ class TaskPool:
             LOG.exception(
                 "%(id)s: skip action timer %(ctx_key)s" %
                 {"id": id_, "ctx_key": ctx_key_raw})
+            self.workflow_db_mgr.put_delete_task_action_timer(*row_key)
             return
 
     def load_db_tasks_to_hold(self) -> None:
@@ -618,6 +684,8 @@ class TaskPool:
         if all(itask.is_ready_to_run()):
             # (otherwise waiting on xtriggers etc.)
             self.queue_task(itask)
+        else:
+            self.xtrigger_mgr.add_task(itask)
 
         if itask.tdef.max_future_prereq_offset is not None:
             self.set_max_future_offset()
@@ -669,6 +737,8 @@ class TaskPool:
 
     def remove(self, itask, reason=""):
         """Remove a task from the pool (e.g. after a reload)."""
+        self.xtrigger_mgr.remove_task(itask)
+        self.deadlines.discard_task(itask)
         msg = "task proxy removed"
         if reason:
             msg += " (%s)" % reason
@@ -687,6 +757,8 @@ class TaskPool:
             self.hidden_pool_changed = True
             if not self.hidden_pool[itask.point]:
                 del self.hidden_pool[itask.point]
+            self._remove_from_index(itask)
+            self.workflow_db_mgr.delete_pool_task(itask)
             log(f"[{itask}] -{msg}")
             return
 
@@ -696,6 +768,8 @@ class TaskPool:
             pass
         else:
             self.main_pool_changed = True
+            self._remove_from_index(itask)
+            self.xtrigger_mgr.unref_task(itask)
             if not self.main_pool[itask.point]:
                 del self.main_pool[itask.point]
                 self.task_queue_mgr.remove_task(itask)
@@ -708,6 +782,7 @@ class TaskPool:
             # Event-driven final update of task_states table.
             # TODO: same for datastore (still updated by scheduler loop)
             self.workflow_db_mgr.put_update_task_state(itask)
+            self.workflow_db_mgr.delete_pool_task(itask)
             log(f"[{itask}] -{msg}")
             del itask
 
@@ -749,15 +824,17 @@ class TaskPool:
 
     def _get_hidden_task_by_id(self, id_):
         """Return runahead pool task by ID if it exists, or None."""
-        for itask_ids in list(self.hidden_pool.values()):
-            with suppress(KeyError):
-                return itask_ids[id_]
+        itask = self.pool_index.get(id_)
+        if itask is not None and id_ in self.hidden_pool.get(itask.point, {}):
+            return itask
+        return None
 
     def _get_task_by_id(self, id_):
         """Return main pool task by ID if it exists, or None."""
-        for itask_ids in list(self.main_pool.values()):
-            with suppress(KeyError):
-                return itask_ids[id_]
+        itask = self.pool_index.get(id_)
+        if itask is not None and id_ in self.main_pool.get(itask.point, {}):
+            return itask
+        return None
 
     def queue_task(self, itask: TaskProxy) -> None:
         """Queue a task that is ready to run."""
@@ -877,6 +954,7 @@ class TaskPool:
                     itask.point,
                     itask.flow_label, itask.state.status)
                 itask.copy_to_reload_successor(new_task)
+                self.xtrigger_mgr.remove_task(itask)
                 self._swap_out(new_task)
                 LOG.info('[%s] -reloaded task definition', itask)
                 if itask.state(*TASK_STATUSES_ACTIVE):
@@ -908,6 +986,9 @@ class TaskPool:
                     itask, ready_check_items)
             if all(ready_check_items) and not itask.state.is_runahead:
                 self.queue_task(itask)
+            else:
+                # Xtriggers may have changed on reload.
+                self.xtrigger_mgr.add_task(itask)
 
         self.do_reload = False
 
@@ -1083,6 +1164,9 @@ class TaskPool:
             self.data_store_mgr.delta_task_held(itask)
             if (not itask.state.is_runahead) and all(itask.is_ready_to_run()):
                 self.queue_task(itask)
+            if self.main_pool.get(itask.point, {}).get(itask.identity):
+                # (Held tasks don't expire.)
+                self.add_deadlines(itask)
         self.tasks_to_hold.discard((itask.tdef.name, itask.point))
         self.workflow_db_mgr.put_tasks_to_hold(self.tasks_to_hold)
 
@@ -1232,17 +1316,16 @@ class TaskPool:
 
             if c_task is not None:
                 # Update downstream prerequisites directly.
+                message = (itask.tdef.name, str(itask.point), output)
+                tasks = [c_task]
                 if is_abs:
                     # Update existing children spawned by other tasks.
-                    tasks, _ = self.filter_task_proxies([c_name])
-                    if c_task not in tasks:
-                        tasks.append(c_task)
-                else:
-                    tasks = [c_task]
+                    tasks.extend(
+                        t for t in self.prereqs_index.get(message, ())
+                        if t.tdef.name == c_name and t is not c_task
+                    )
                 for t in tasks:
-                    t.state.satisfy_me({
-                        (itask.tdef.name, str(itask.point), output)
-                    })
+                    t.state.satisfy_me({message})
                     self.data_store_mgr.delta_task_prerequisite(t)
                     # Add it to the hidden pool or move it to the main pool.
                     self.add_to_pool(t)
@@ -1323,6 +1406,7 @@ class TaskPool:
             return
         itask.flow_label = self.flow_label_mgr.merge_labels(
             itask.flow_label, flab2)
+        itask.state.is_db_dirty = True
         self.workflow_db_mgr.put_insert_task_states(itask, {
             "status": itask.state.status,
             "flow_label": itask.flow_label})
@@ -1338,10 +1422,7 @@ class TaskPool:
 
     def get_task(self, name, point, flow_label=None):
         """Return existing task proxy and merge flow label if found."""
-        itask = (
-            self._get_hidden_task_by_id(TaskID.get(name, point))
-            or self._get_task_by_id(TaskID.get(name, point))
-        )
+        itask = self.pool_index.get(TaskID.get(name, point))
         if itask is None:
             LOG.debug('Task %s.%s not found in task pool.', name, point)
             return None
@@ -1386,9 +1467,7 @@ class TaskPool:
             return None
 
         # Get submit number by flow label {flow_label: submit_num, ...}
-        snums = self.workflow_db_mgr.pri_dao.select_submit_nums(
-            name, str(point)
-        )
+        snums = self.workflow_db_mgr.select_submit_nums(name, str(point))
         try:
             submit_num = max(snums.values())
         except ValueError:
@@ -1535,6 +1614,7 @@ class TaskPool:
                 # (If None, spawner reports cycle bounds errors).
                 if itask.state.reset(TASK_STATUS_WAITING):
                     self.data_store_mgr.delta_task_state(itask)
+                    self.add_deadlines(itask)
                 # (No need to set prerequisites satisfied here).
                 if not itask.state.is_queued:
                     LOG.info(f"Force-trigger: queueing {itask.identity}")
@@ -1584,12 +1664,34 @@ class TaskPool:
                 sim_task_state_changed = True
         return sim_task_state_changed
 
-    def set_expired_tasks(self):
-        res = False
-        for itask in self.get_tasks():
-            if self._set_expired_task(itask):
-                res = True
-        return res
+    def add_deadlines(self, itask: TaskProxy) -> None:
+        """Add the clock-trigger, clock-expire and late times of a task.
+
+        Called when a task enters the main pool, or becomes waiting again.
+        The deadlines are checked when they pass, rather than on every main
+        loop pass.
+        """
+        if itask.tdef.clocktrigger_offset is not None:
+            self.deadlines.put(
+                itask, 'clock-trigger', itask.get_clock_trigger_time(),
+                self._clock_trigger_task)
+        if itask.tdef.expiration_offset is not None:
+            self.deadlines.put(
+                itask, 'clock-expire', itask.get_expire_time(),
+                self._set_expired_task)
+        if itask.get_late_time() and not itask.is_late:
+            self.deadlines.put(
+                itask, 'late', itask.get_late_time(), self._set_late_task)
+
+    def _clock_trigger_task(self, itask: TaskProxy) -> None:
+        """Queue a task whose clock-trigger time has passed, if ready."""
+        if (
+            itask.state(TASK_STATUS_WAITING)
+            and not itask.state.is_queued
+            and not itask.state.is_runahead
+            and all(itask.is_ready_to_run())
+        ):
+            self.queue_task(itask)
 
     def _set_expired_task(self, itask):
         """Check if task has expired. Set state and event handler if so.
@@ -1604,11 +1706,7 @@ class TaskPool:
                 or itask.tdef.expiration_offset is None
         ):
             return False
-        if itask.expire_time is None:
-            itask.expire_time = (
-                itask.get_point_as_seconds() +
-                itask.get_offset_as_seconds(itask.tdef.expiration_offset))
-        if time() > itask.expire_time:
+        if time() > itask.get_expire_time():
             msg = 'Task expired (skipping job).'
             LOG.warning('[%s] -%s', itask, msg)
             self.task_events_mgr.setup_event_handlers(itask, "expired", msg)
@@ -1621,6 +1719,19 @@ class TaskPool:
             return True
         return False
 
+    def _set_late_task(self, itask: TaskProxy) -> None:
+        """Report a task which is late, if it has never been active."""
+        if itask.is_late or not itask.state(*TASK_STATUSES_NEVER_ACTIVE):
+            return
+        msg = '%s (late-time=%s)' % (
+            self.task_events_mgr.EVENT_LATE,
+            time2str(itask.get_late_time()))
+        itask.is_late = True
+        LOG.warning('[%s] -%s', itask, msg)
+        self.task_events_mgr.setup_event_handlers(
+            itask, self.task_events_mgr.EVENT_LATE, msg)
+        self.workflow_db_mgr.put_insert_task_late_flags(itask)
+
     def task_succeeded(self, id_):
         """Return True if task with id_ is in the succeeded state."""
         return any(
@@ -1701,6 +1812,7 @@ class TaskPool:
         for itask in self.get_all_tasks():
             itask.flow_label = self.flow_label_mgr.unmerge_labels(
                 to_prune, itask.flow_label)
+            itask.state.is_db_dirty = True
         self.flow_label_mgr.make_avail(to_prune)
 
     def log_task_pool(self, log_lvl=logging.DEBUG):
@@ -266,6 +266,22 @@ class TaskProxy:
         iso_offset = cylc.flow.cycling.iso8601.interval_parse(str(offset))
         return int(iso_offset.get_seconds())
 
+    def get_expire_time(self):
+        """Compute and store clock-expire time as seconds since epoch."""
+        if self.expire_time is None:
+            self.expire_time = (
+                self.get_point_as_seconds() +
+                self.get_offset_as_seconds(self.tdef.expiration_offset))
+        return self.expire_time
+
+    def get_clock_trigger_time(self):
+        """Compute and store clock-trigger time as seconds since epoch."""
+        if self.clock_trigger_time is None:
+            self.clock_trigger_time = (
+                self.get_point_as_seconds() +
+                self.get_offset_as_seconds(self.tdef.clocktrigger_offset))
+        return self.clock_trigger_time
+
     def get_late_time(self):
         """Compute and store late time as seconds since epoch."""
         if self.late_time is None:
@@ -353,11 +369,7 @@ class TaskProxy:
         """
         if self.tdef.clocktrigger_offset is None:
             return True
-        if self.clock_trigger_time is None:
-            self.clock_trigger_time = (
-                self.get_point_as_seconds() +
-                self.get_offset_as_seconds(self.tdef.clocktrigger_offset))
-        return time() >= self.clock_trigger_time
+        return time() >= self.get_clock_trigger_time()
 
     def is_task_prereqs_not_done(self):
         """Are some task prerequisites not satisfied?"""
@@ -376,6 +388,7 @@ class TaskProxy:
         # unset any retry delay timers
         for timer in self.try_timers.values():
             timer.timeout = None
+        self.state.is_db_dirty = True
 
     def point_match(self, point: Optional[str]) -> bool:
         """Return whether a string/glob matches the task's point.
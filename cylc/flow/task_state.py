@@ -183,6 +183,9 @@ class TaskState:
             The task ID as `TASK.CYCLE` associated with this object.
         .is_updated (boolean):
             Has the status been updated since previous update?
+        .is_db_dirty (boolean):
+            Has the task changed since its task pool database rows (status,
+            prerequisites, timers) were last written?
         .kill_failed (boolean):
             Has a job kill attempt failed since previous status change?
         .outputs (cylc.flow.task_outputs.TaskOutputs):
@@ -211,6 +214,7 @@ class TaskState:
         "is_runahead",
         "identity",
         "is_updated",
+        "is_db_dirty",
         "kill_failed",
         "outputs",
         "prerequisites",
@@ -229,6 +233,7 @@ class TaskState:
         self.is_queued = False
         self.is_runahead = True  # limit on spawning, until released
         self.is_updated = False
+        self.is_db_dirty = True
         self.time_updated = None
 
         self._is_satisfied = None
@@ -319,6 +324,21 @@ class TaskState:
                 if prereq.satisfy_me(all_task_outputs):
                     self._is_satisfied = None
                     self._suicide_is_satisfied = None
+                    self.is_db_dirty = True
+
+    def get_prerequisite_messages(self):
+        """Return the outputs my (normal and suicide) prerequisites are on.
+
+        Returns:
+            set: {(name, point, output), ...}
+
+        """
+        return {
+            message
+            for prereqs in (self.prerequisites, self.suicide_prerequisites)
+            for prereq in prereqs
+            for message in prereq.satisfied
+        }
 
     def xtriggers_all_satisfied(self):
         """Return True if all xtriggers are satisfied."""
@@ -367,12 +387,14 @@ class TaskState:
         for prereq in self.prerequisites:
             prereq.set_satisfied()
         self._is_satisfied = None
+        self.is_db_dirty = True
 
     def set_prerequisites_not_satisfied(self):
         """Reset prerequisites."""
         for prereq in self.prerequisites:
             prereq.set_not_satisfied()
         self._is_satisfied = None
+        self.is_db_dirty = True
 
     def get_resolved_dependencies(self):
         """Return a list of dependencies which have been met for this task.
@@ -433,6 +455,7 @@ class TaskState:
 
         self.time_updated = get_current_time_string()
         self.is_updated = True
+        self.is_db_dirty = True
         LOG.debug("[%s] -%s => %s", self.identity, prev_message, str(self))
 
         if is_held:
@@ -16,7 +16,8 @@
 
 from cylc.flow.cycling.loader import (
     get_point, get_point_relative, get_interval)
-from cylc.flow.prerequisite import Prerequisite
+from cylc.flow.exceptions import TriggerExpressionError
+from cylc.flow.prerequisite import Prerequisite, compile_condition
 from cylc.flow.task_outputs import (
     TASK_OUTPUT_EXPIRED, TASK_OUTPUT_SUBMITTED, TASK_OUTPUT_SUBMIT_FAILED,
     TASK_OUTPUT_STARTED, TASK_OUTPUT_SUCCEEDED, TASK_OUTPUT_FAILED,
@@ -177,12 +178,25 @@ class Dependency:
 
     """
 
-    __slots__ = ['_exp', 'task_triggers', 'suicide']
+    __slots__ = ['_exp', 'task_triggers', 'suicide', '_condition']
 
     def __init__(self, exp, task_triggers, suicide):
         self._exp = exp
         self.task_triggers = tuple(task_triggers)  # More memory efficient.
         self.suicide = suicide
+        # The expression compiled once for all Prerequisites generated from
+        # this dependency, the leaves are indices into self.task_triggers.
+        # If it cannot be compiled this holds the error message and each
+        # Prerequisite compiles (and reports) the expression itself.
+        leaves = {
+            task_trigger: ind
+            for ind, task_trigger in enumerate(self.task_triggers)
+        }
+        try:
+            self._condition = compile_condition(exp, leaves.__getitem__)
+        except TriggerExpressionError as exc:
+            # (e.g. xtriggers in conditional expressions)
+            self._condition = str(exc)
 
     def get_prerequisite(self, point, tdef):
         """Generate a Prerequisite object from this dependency.
@@ -199,9 +213,15 @@ class Dependency:
         """
         # Create Prerequisite.
         cpre = Prerequisite(point, tdef.start_point)
+        messages = []
 
         # Loop over TaskTrigger instances.
         for task_trigger in self.task_triggers:
+            messages.append((
+                task_trigger.task_name,
+                str(task_trigger.get_point(point)),
+                task_trigger.output
+            ))
             if task_trigger.cycle_point_offset is not None:
                 # Compute trigger cycle point from offset.
                 if task_trigger.offset_is_from_icp:
@@ -233,7 +253,11 @@ class Dependency:
                 cpre.add(task_trigger.task_name,
                          task_trigger.get_point(point),
                          task_trigger.output)
-        cpre.set_condition(self.get_expression(point))
+        expr = self.get_expression(point)
+        if '|' in expr and not isinstance(self._condition, str):
+            cpre.set_condition(expr, (self._condition, tuple(messages)))
+        else:
+            cpre.set_condition(expr)
         return cpre
 
     def get_expression(self, point):
@@ -16,13 +16,31 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """The application control logic for Tui."""
 
+from contextlib import suppress
+import os
 import sys
 
 import urwid
 from urwid import html_fragment
 from urwid.wimp import SelectableIcon
+import zmq
 
+from cylc.flow import ID_DELIM
+from cylc.flow.data_messages_pb2 import (  # type: ignore
+    AllDeltas,
+    PbEntireWorkflow
+)
+from cylc.flow.data_store_mgr import (
+    ALL_DELTAS,
+    FAMILY_PROXIES,
+    JOBS,
+    TASKS,
+    TASK_PROXIES,
+    WORKFLOW,
+    apply_delta
+)
 from cylc.flow.network.client_factory import get_client
+from cylc.flow.network.subscriber import WorkflowSubscriber
 from cylc.flow.exceptions import (
     ClientError,
     ClientTimeout,
@@ -35,7 +53,12 @@ from cylc.flow.task_state import (
     TASK_STATUS_FAILED,
 )
 from cylc.flow.tui.data import (
-    QUERY
+    get_cycle_data,
+    get_family_data,
+    get_flow_data,
+    get_task_data,
+    get_workflow_data,
+    load_data_store
 )
 import cylc.flow.tui.overlay as overlay
 from cylc.flow.tui import (
@@ -47,15 +70,24 @@ from cylc.flow.tui import (
 )
 from cylc.flow.tui.tree import (
     find_closest_focus,
-    translate_collapsing
+    find_displayed_node,
+    translate_collapsing,
+    update_child_nodes,
+    update_widget
 )
 from cylc.flow.tui.util import (
+    NaturalSort,
+    add_node,
     compute_tree,
     dummy_flow,
+    get_parent_key,
     get_task_status_summary,
     get_workflow_status_str,
+    idpop,
+    patch_jobs,
     render_node
 )
+from cylc.flow.workflow_files import get_contact_file
 
 
 urwid.set_encoding('utf8')  # required for unicode task icons
@@ -166,6 +198,9 @@ class TuiNode(urwid.TreeNode):
 class TuiParentNode(urwid.ParentNode):
     """Data storage object for interior/parent nodes."""
 
+    # {(type_, id_): node} for all loaded nodes in the tree (optional)
+    registry = None
+
     def load_widget(self):
         return TuiWidget(self)
 
@@ -181,12 +216,16 @@ class TuiParentNode(urwid.ParentNode):
             childclass = TuiParentNode
         else:
             childclass = TuiNode
-        return childclass(
+        node = childclass(
             childdata,
             parent=self,
             key=key,
             depth=self.get_depth() + 1
         )
+        if self.registry is not None:
+            node.registry = self.registry
+            self.registry[(childdata['type_'], childdata['id_'])] = node
+        return node
 
 
 class TuiApp:
@@ -197,6 +236,10 @@ class TuiApp:
     Multi-workflow functionality can be achieved via a GScan-esque
     tab/selection panel.
 
+    The workflow is loaded once, after which Tui subscribes to the deltas
+    published by the scheduler, applies them to a local copy of the data
+    store and patches the affected nodes of the tree.
+
     Arguments:
         reg (str):
             Workflow registration
@@ -227,6 +270,19 @@ class TuiApp:
     def __init__(self, reg, screen=None):
         self.reg = reg
         self.client = None
+        self.subscriber = None
+        self.contact = None
+        # local copy of the workflow data store
+        self.data = None
+        self.checksums = {}
+        # the tree nodes {(type_, id_): node}
+        self.nodes = {}
+        # the parent of each node in the tree {(type_, id_): (type_, id_)}
+        self.parents = {}
+        # the urwid nodes which have been loaded {(type_, id_): node}
+        self.tree_nodes = {}
+        # the task states the tree was filtered by
+        self.task_states = None
         self.loop = None
         self.screen = None
         self.stack = 0
@@ -266,7 +322,10 @@ class TuiApp:
         )
         # schedule the first update
         self.loop.set_alarm_in(0, self._update)
-        self.loop.run()
+        try:
+            self.loop.run()
+        finally:
+            self.unsubscribe()
 
     def unhandled_input(self, key):
         """Catch key presses, uncaught events are passed down the chain."""
@@ -282,60 +341,150 @@ class TuiApp:
                 meth(self, *args)
                 return
 
-    def get_snapshot(self):
-        """Contact the workflow, return a tree structure
+    def subscribe(self):
+        """Subscribe to the deltas published by the workflow.
+
+        Raises:
+            WorkflowStopped: If the workflow is not running.
+
+        """
+        self.contact = self.get_contact_signature()
+        if self.contact is None:
+            raise WorkflowStopped(self.reg)
+        self.subscriber = WorkflowSubscriber(
+            self.reg,
+            # a synchronous context so deltas can be received between updates
+            context=zmq.Context.instance(),
+            topics=[ALL_DELTAS.encode()]
+        )
+        self.data = None
+
+    def unsubscribe(self):
+        """Disconnect from the workflow."""
+        if self.subscriber:
+            self.subscriber.stop(stop_loop=False)
+            self.subscriber = None
+        if self.client:
+            self.client.stop(stop_loop=False)
+            self.client = None
+        self.data = None
+
+    def get_contact_signature(self):
+        """Return a signature of the contact file or None if missing.
+
+        The contact file is removed when the workflow stops and rewritten
+        when it is restarted.
+
+        """
+        try:
+            stat = os.stat(get_contact_file(self.reg))
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns)
+
+    def receive_deltas(self):
+        """Yield the deltas received since the last call."""
+        while True:
+            try:
+                _, msg = self.subscriber.socket.recv_multipart(zmq.NOBLOCK)
+            except zmq.Again:
+                return
+            deltas = AllDeltas()
+            deltas.ParseFromString(msg)
+            yield deltas
+
+    def load_data(self):
+        """Load the entire workflow into the local data store."""
+        if not self.client:
+            self.client = get_client(self.reg, timeout=self.CLIENT_TIMEOUT)
+        # discard deltas which are included in the entire workflow
+        for _ in self.receive_deltas():
+            pass
+        entire_workflow = PbEntireWorkflow()
+        entire_workflow.ParseFromString(self.client('pb_entire_workflow'))
+        self.data, self.checksums = load_data_store(entire_workflow)
+
+    def apply_deltas(self):
+        """Apply the deltas received since the last update.
+
+        Returns:
+            dict - The ids of the changed elements by type, or None if the
+            local data store is out of sync (in which case it should be
+            reloaded).
+
+        """
+        changes = {
+            FAMILY_PROXIES: set(),
+            TASK_PROXIES: set(),
+        }
+        received = False
+        for deltas in self.receive_deltas():
+            received = True
+            for field, delta in deltas.ListFields():
+                key = field.name
+                if delta.reloaded:
+                    return None
+                if delta.time < self.data[WORKFLOW].last_updated:
+                    # stale (e.g. received before the data was loaded)
+                    continue
+                try:
+                    apply_delta(key, delta, self.data, self.checksums)
+                except (KeyError, ValueError):
+                    return None
+                if (
+                    hasattr(delta, 'checksum')
+                    and delta.checksum != self.checksums.get(key, 0)
+                ):
+                    return None
+                if key == WORKFLOW:
+                    continue
+                ids = [element.id for element in delta.added]
+                ids.extend(element.id for element in delta.updated)
+                ids.extend(delta.pruned)
+                if key in changes:
+                    changes[key].update(ids)
+                elif key == JOBS:
+                    changes[TASK_PROXIES].update(map(idpop, ids))
+                elif key == TASKS:
+                    # the mean elapsed time is displayed on the task proxies
+                    for task_id in ids:
+                        with suppress(KeyError):
+                            changes[TASK_PROXIES].update(
+                                self.data[TASKS][task_id].proxies)
+        if not received and self.get_contact_signature() != self.contact:
+            # the workflow has stopped or been restarted
+            raise WorkflowStopped(self.reg)
+        return changes
+
+    def update_data(self):
+        """Bring the local data store up to date with the workflow.
 
         In the event of error contacting the workflow the
         message is written to this Widget's header.
 
         Returns:
-            dict if successful, else False
+            dict - The ids of the elements which have changed by type.
+            None - If the data has been reloaded or the workflow has
+            stopped (self.data is None).
+            False - If there was an error.
 
         """
         try:
-            if not self.client:
-                self.client = get_client(self.reg, timeout=self.CLIENT_TIMEOUT)
-            data = self.client(
-                'graphql',
-                {
-                    'request_string': QUERY,
-                    'variables': {
-                        # list of task states we want to see
-                        'taskStates': [
-                            state
-                            for state, is_on in self.filter_states.items()
-                            if is_on
-                        ]
-                    }
-                }
-            )
+            if not self.subscriber:
+                self.subscribe()
+            if self.data is not None:
+                changes = self.apply_deltas()
+                if changes is not None:
+                    return changes
+            self.load_data()
         except WorkflowStopped:
-            self.client = None
-            return dummy_flow({
-                'name': self.reg,
-                'id': self.reg,
-                'status': 'stopped',
-                'stateTotals': {}
-            })
+            self.unsubscribe()
         except (ClientError, ClientTimeout) as exc:
             # catch network / client errors
             self.set_header([('workflow_error', str(exc))])
+            self.data = None
             return False
-
-        if isinstance(data, list):
-            # catch GraphQL errors
-            try:
-                message = data[0]['error']['message']
-            except (IndexError, KeyError):
-                message = str(data)
-            self.set_header([('workflow_error', message)])
-            return False
-
-        if len(data['workflows']) != 1:
-            # multiple workflows in returned data - shouldn't happen
-            raise ValueError()
-
-        return compute_tree(data['workflows'][0])
+        return None
 
     @staticmethod
     def get_node_id(node):
@@ -362,16 +511,6 @@ class TuiApp:
         # put in a one line gap
         message.append('\n')
 
-        # TODO: remove once Tui is delta-driven
-        # https://github.com/cylc/cylc-flow/issues/3527
-        message.extend([
-            (
-                'workflow_error',
-                'TUI is experimental and may break with large flows'
-            ),
-            '\n'
-        ])
-
         self.view.header = urwid.Text(message)
 
     def _update(self, *_):
@@ -387,26 +526,77 @@ class TuiApp:
 
         """
         # update the data store
-        # TODO: this can be done incrementally using deltas
-        #       once this interface is available
-        snapshot = self.get_snapshot()
-        if snapshot is False:
+        changes = self.update_data()
+        if changes is False:
             return False
-        data = snapshot['data']
+        task_states = [
+            state
+            for state, is_on in self.filter_states.items()
+            if is_on
+        ]
+        if self.data is None:
+            flow = {
+                'name': self.reg,
+                'id': self.reg,
+                'status': 'stopped',
+                'stateTotals': {}
+            }
+        else:
+            flow = get_workflow_data(self.data)
 
         # update the workflow status message
-        header = [get_workflow_status_str(data)]
-        status_summary = get_task_status_summary(snapshot['data'])
+        header = [get_workflow_status_str(flow)]
+        status_summary = get_task_status_summary(flow)
         if status_summary:
             header.extend([' ('] + status_summary + [' )'])
         if not all(self.filter_states.values()):
             header.extend([' ', '*filtered* "R" to reset', ' '])
         self.set_header(header)
 
-        # global update - the nuclear option - slow but simple
-        # TODO: this can be done incrementally by adding and
-        #       removing nodes from the existing tree
-        topnode = TuiParentNode(snapshot)
+        if self.data is None:
+            self.nodes = {}
+            self.set_tree(dummy_flow(flow))
+        elif changes is None or task_states != self.task_states:
+            self.nodes = {}
+            self.set_tree(
+                compute_tree(
+                    get_flow_data(self.data, task_states),
+                    self.nodes
+                )
+            )
+        else:
+            self.patch_tree(changes)
+        self.task_states = task_states
+
+        # schedule the next run of this update method
+        if self.loop:
+            self.loop.set_alarm_in(self.UPDATE_INTERVAL, self._update)
+
+        return True
+
+    def set_tree(self, root):
+        """Replace the tree.
+
+        Arguments:
+            root (dict):
+                The top-level workflow node of the new tree.
+
+        """
+        topnode = TuiParentNode(root)
+
+        # index the new tree so it can be patched
+        self.parents = {}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for child in node['children']:
+                self.parents[(child['type_'], child['id_'])] = (
+                    node['type_'], node['id_'])
+                stack.append(child)
+        self.nodes[(root['type_'], root['id_'])] = root
+        topnode.registry = self.tree_nodes = {
+            (root['type_'], root['id_']): topnode
+        }
 
         # NOTE: because we are nuking the tree we need to manually
         # preserve the focus and collapse status of tree nodes
@@ -428,11 +618,159 @@ class TuiApp:
         #  preserve the collapse/expand status of all nodes
         translate_collapsing(self, old_node, new_node)
 
-        # schedule the next run of this update method
-        if self.loop:
-            self.loop.set_alarm_in(self.UPDATE_INTERVAL, self._update)
+    def patch_tree(self, changes):
+        """Update the tree with the elements which have changed.
 
-        return True
+        Only the nodes affected by the changes are re-rendered, the
+        focus and collapse/expand status of all other nodes are untouched.
+
+        Arguments:
+            changes (dict):
+                The ids of changed elements by type (see apply_deltas).
+
+        """
+        task_states = set(self.task_states)
+        flow_key = ('workflow', self.data[WORKFLOW].id)
+        dirty = set()  # nodes whose children have changed
+        changed = set()  # nodes whose data has changed
+        removed = set()  # nodes whose elements have been pruned
+
+        for id_ in changes[TASK_PROXIES]:
+            task_proxy = self.data[TASK_PROXIES].get(id_)
+            data = None
+            parent_key = None
+            if task_proxy is None:
+                removed.add(('task', id_))
+            elif task_proxy.state in task_states:
+                data = get_task_data(self.data, task_proxy)
+                if data['firstParent']:
+                    parent_key = get_parent_key('task', data)
+                else:
+                    data = None
+            self.patch_node('task', id_, data, parent_key, dirty, changed)
+            node = self.nodes.get(('task', id_))
+            if node is not None and (data or task_proxy is None):
+                for key in patch_jobs(
+                    node,
+                    data['jobs'] if data else [],
+                    self.nodes,
+                    dirty,
+                    changed
+                ):
+                    self.tree_nodes.pop(key, None)
+
+        for id_ in changes[FAMILY_PROXIES]:
+            family_proxy = self.data[FAMILY_PROXIES].get(id_)
+            if id_.rsplit(ID_DELIM, 1)[-1] == 'root':
+                type_ = 'cycle'
+                node_id = idpop(id_)
+            else:
+                type_ = 'family'
+                node_id = id_
+            data = None
+            parent_key = None
+            if family_proxy is None:
+                removed.add((type_, node_id))
+            elif family_proxy.state not in task_states:
+                pass
+            elif type_ == 'cycle':
+                data = get_cycle_data(family_proxy)
+                data['id'] = node_id
+                parent_key = flow_key
+            else:
+                data = get_family_data(self.data, family_proxy)
+                parent_key = get_parent_key(type_, data)
+            self.patch_node(type_, node_id, data, parent_key, dirty, changed)
+
+        # forget pruned elements
+        for key in removed:
+            node = self.nodes.get(key)
+            if (
+                node is not None
+                and not node['children']
+                and key not in self.parents
+            ):
+                del self.nodes[key]
+                self.tree_nodes.pop(key, None)
+
+        # update the displayed tree
+        for key in dirty:
+            node = self.nodes.get(key)
+            if node is None:
+                continue
+            if key[0] != 'task':
+                # NOTE: jobs are sorted by submit-num in patch_jobs
+                node['children'].sort(
+                    key=lambda x: NaturalSort(x['id_'])
+                )
+            tree_node = self.get_tree_node(key)
+            if tree_node is not None:
+                update_child_nodes(tree_node)
+        for key in dirty | changed:
+            tree_node = self.get_tree_node(key)
+            if tree_node is not None:
+                update_widget(tree_node)
+
+        # if the focused node has been removed move to the nearest parent
+        _, focus = self.tree_walker.get_focus()
+        closest_focus = find_displayed_node(focus)
+        if closest_focus is not focus:
+            self.tree_walker.set_focus(closest_focus)
+        self.tree_walker._modified()
+
+    def patch_node(self, type_, id_, data, parent_key, dirty, changed):
+        """Update, add or remove a node of the tree.
+
+        Arguments:
+            type_ (str):
+                The node type.
+            id_ (str):
+                The node id.
+            data (dict):
+                The new data for this node or None to remove it from the
+                tree.
+            parent_key (tuple):
+                The (type_, id_) of the node to attach this node to.
+            dirty (set):
+                The keys of nodes whose children have changed.
+            changed (set):
+                The keys of nodes whose data has changed.
+
+        Returns:
+            dict - The node or None if it is not in the tree.
+
+        """
+        key = (type_, id_)
+        old_parent_key = self.parents.get(key)
+        if old_parent_key and old_parent_key != parent_key:
+            # detach from the old parent
+            siblings = self.nodes[old_parent_key]['children']
+            node = self.nodes[key]
+            siblings[:] = [child for child in siblings if child is not node]
+            del self.parents[key]
+            dirty.add(old_parent_key)
+        if data is None:
+            return None
+        node = add_node(type_, id_, self.nodes)
+        if node['data'] != data:
+            node['data'] = data
+            changed.add(key)
+        if parent_key and key not in self.parents:
+            # attach to the new parent
+            add_node(*parent_key, self.nodes)['children'].append(node)
+            self.parents[key] = parent_key
+            dirty.add(parent_key)
+        return node
+
+    def get_tree_node(self, key):
+        """Return the urwid node for a node of the tree if loaded."""
+        tree_node = self.tree_nodes.get(key)
+        if (
+            tree_node is not None
+            and tree_node.get_value() is self.nodes.get(key)
+        ):
+            return tree_node
+        return None
 
     def filter_by_task_state(self, filtered_state=None):
         """Filter tasks.
@@ -15,6 +15,17 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 
+from cylc.flow.data_store_mgr import (
+    EDGES,
+    FAMILIES,
+    FAMILY_PROXIES,
+    JOBS,
+    TASKS,
+    TASK_PROXIES,
+    WORKFLOW,
+    create_data_store,
+    element_checksum,
+)
 from cylc.flow.tui.util import (
     extract_context
 )
@@ -77,6 +88,9 @@ QUERY = '''
   }
 '''
 
+# the data-store element types in the order they are loaded
+ELEMENT_TYPES = [TASKS, TASK_PROXIES, JOBS, FAMILIES, FAMILY_PROXIES, EDGES]
+
 MUTATIONS = {
     'workflow': [
         'pause',
@@ -184,3 +198,159 @@ def mutate(client, mutation, selection):
             'variables': variables
         }
     )
+
+
+def load_data_store(entire_workflow):
+    """Create a data store from a PbEntireWorkflow message.
+
+    Args:
+        entire_workflow (PbEntireWorkflow):
+            The entire workflow as returned by "pb_entire_workflow".
+
+    Returns:
+        tuple - (data, checksums)
+
+        data (dict):
+            The data store, structured as the scheduler's.
+        checksums (dict):
+            The checksum of each element type, to be maintained as
+            deltas are applied (see apply_delta).
+
+    """
+    data = create_data_store()
+    data[WORKFLOW].CopyFrom(entire_workflow.workflow)
+    checksums = {}
+    for key in ELEMENT_TYPES:
+        checksum = 0
+        for element in getattr(entire_workflow, key):
+            data[key][element.id] = element
+            checksum ^= element_checksum(key, element)
+        checksums[key] = checksum
+    return data, checksums
+
+
+def _get_first_parent(data, element):
+    """Return the first parent of a task or family proxy as GraphQL would.
+    """
+    parent = data[FAMILY_PROXIES].get(element.first_parent)
+    if parent is None:
+        return None
+    return {'id': parent.id, 'name': parent.name}
+
+
+def get_workflow_data(data):
+    """Return the workflow fields of QUERY from a data store."""
+    workflow = data[WORKFLOW]
+    return {
+        'id': workflow.id,
+        'name': workflow.name,
+        'status': workflow.status,
+        'stateTotals': dict(workflow.state_totals),
+    }
+
+
+def get_job_data(job):
+    """Return the fields of QUERY for a job."""
+    return {
+        'id': job.id,
+        'submitNum': job.submit_num,
+        'state': job.state,
+        'platform': job.platform,
+        'jobRunnerName': job.job_runner_name,
+        'jobId': job.job_id,
+        'startedTime': job.started_time,
+    }
+
+
+def get_task_data(data, task_proxy):
+    """Return the fields of QUERY for a task proxy.
+
+    Jobs are sorted by submit number, most recent first.
+
+    """
+    task = data[TASKS].get(task_proxy.task)
+    return {
+        'id': task_proxy.id,
+        'name': task_proxy.name,
+        'cyclePoint': task_proxy.cycle_point,
+        'state': task_proxy.state,
+        'isHeld': task_proxy.is_held,
+        'isQueued': task_proxy.is_queued,
+        'isRunahead': task_proxy.is_runahead,
+        'firstParent': _get_first_parent(data, task_proxy),
+        'jobs': [
+            get_job_data(job)
+            for job in sorted(
+                (
+                    data[JOBS][job_id]
+                    for job_id in task_proxy.jobs
+                    if job_id in data[JOBS]
+                ),
+                key=lambda job: job.submit_num,
+                reverse=True
+            )
+        ],
+        'task': {
+            'meanElapsedTime': task.mean_elapsed_time if task else None
+        },
+    }
+
+
+def get_family_data(data, family_proxy):
+    """Return the fields of QUERY for a family proxy."""
+    return {
+        'id': family_proxy.id,
+        'name': family_proxy.name,
+        'cyclePoint': family_proxy.cycle_point,
+        'state': family_proxy.state,
+        'isHeld': family_proxy.is_held,
+        'isQueued': family_proxy.is_queued,
+        'isRunahead': family_proxy.is_runahead,
+        'firstParent': _get_first_parent(data, family_proxy),
+    }
+
+
+def get_cycle_data(family_proxy):
+    """Return the fields of QUERY for the root family proxy of a cycle."""
+    return {
+        'id': family_proxy.id,
+        'cyclePoint': family_proxy.cycle_point,
+        'state': family_proxy.state,
+        'isHeld': family_proxy.is_held,
+        'isQueued': family_proxy.is_queued,
+        'isRunahead': family_proxy.is_runahead,
+    }
+
+
+def get_flow_data(data, task_states):
+    """Return the result QUERY would return for a data store.
+
+    Args:
+        data (dict):
+            The data store.
+        task_states (list):
+            Only include tasks and families in these states.
+
+    Returns:
+        dict - A dictionary representing the workflow, as returned by
+        QUERY, which may be passed to compute_tree.
+
+    """
+    task_states = set(task_states)
+    flow = get_workflow_data(data)
+    flow['taskProxies'] = [
+        get_task_data(data, task_proxy)
+        for task_proxy in data[TASK_PROXIES].values()
+        if task_proxy.state in task_states
+    ]
+    flow['familyProxies'] = []
+    flow['cyclePoints'] = []
+    for family_proxy in data[FAMILY_PROXIES].values():
+        if family_proxy.state not in task_states:
+            continue
+        if family_proxy.name == 'root':
+            flow['cyclePoints'].append(get_cycle_data(family_proxy))
+        else:
+            flow['familyProxies'].append(
+                get_family_data(data, family_proxy))
+    return flow
@@ -88,6 +88,71 @@ def translate_collapsing(app, old_node, new_node):
                 widget.update_expanded_icon()
 
 
+def update_child_nodes(node):
+    """Update the child nodes of a node after its children have changed.
+
+    Child nodes which are still present are reused (along with their
+    widgets, so the collapse/expand status of the subtree is preserved),
+    nodes which have been removed are dropped and new nodes will be
+    loaded on demand.
+
+    Arguments:
+        node (urwid.ParentNode):
+            The node whose children have changed.
+
+    """
+    # Note: keys are really indices.
+    old_children = {
+        id(child.get_value()): child
+        for child in node._children.values()
+    }
+    node._children = {}
+    for key, value in enumerate(node.get_value()['children']):
+        child = old_children.get(id(value))
+        if child is not None:
+            child.set_key(key)
+            node.set_child_node(key, child)
+    node.get_child_keys(reload=True)
+
+
+def update_widget(node):
+    """Re-render a node preserving its collapse/expand status.
+
+    Arguments:
+        node (urwid.TreeNode):
+            The node whose data has changed.
+
+    """
+    old_widget = node._widget
+    if old_widget is None:
+        # not rendered yet
+        return
+    widget = node.get_widget(reload=True)
+    if not widget.is_leaf and widget.expanded != old_widget.expanded:
+        widget.expanded = old_widget.expanded
+        widget.update_expanded_icon()
+
+
+def find_displayed_node(node):
+    """Return the node or its closest ancestor which is still in the tree.
+
+    Arguments:
+        node (urwid.TreeNode):
+            A node which may have been removed (see update_child_nodes).
+
+    Returns:
+        urwid.TreeNode
+
+    """
+    closest = node
+    while node._parent is not None:
+        parent = node._parent
+        if parent._children.get(node.get_key()) is not node:
+            closest = parent
+        node = parent
+    return closest
+
+
 def walk_tree(node):
     """Yield nodes in order.
 
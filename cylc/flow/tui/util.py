@@ -100,18 +100,22 @@ def idpop(id_):
     return id_.rsplit(ID_DELIM, 1)[0]
 
 
-def compute_tree(flow):
+def compute_tree(flow, nodes=None):
     """Digest GraphQL data to produce a tree.
 
     Arguments:
         flow (dict):
             A dictionary representing a single workflow.
+        nodes (dict):
+            The node store to populate, this provides access to the nodes
+            of the tree by (type_, id_) so that it can be patched later.
 
     Returns:
         dict - A top-level workflow node.
 
     """
-    nodes = {}
+    if nodes is None:
+        nodes = {}
     flow_node = add_node(
         'workflow', flow['id'], nodes, data=flow)
 
@@ -129,18 +133,9 @@ def compute_tree(flow):
     for family in flow['familyProxies']:
         family_node = add_node(
             'family', family['id'], nodes)
-        first_parent = family['firstParent']
-        if (
-                first_parent
-                and first_parent['name'] != 'root'
-        ):
-            parent_node = add_node(
-                'family', first_parent['id'], nodes)
-            parent_node['children'].append(family_node)
-        else:
-            add_node(
-                'cycle', idpop(family['id']), nodes
-            )['children'].append(family_node)
+        add_node(
+            *get_parent_key('family', family), nodes
+        )['children'].append(family_node)
 
     # add leaves
     for task in flow['taskProxies']:
@@ -150,13 +145,9 @@ def compute_tree(flow):
             continue
         task_node = add_node(
             'task', task['id'], nodes, data=task)
-        if task['firstParent']['name'] == 'root':
-            family_node = add_node(
-                'cycle', idpop(task['id']), nodes)
-        else:
-            family_node = add_node(
-                'family', task['firstParent']['id'], nodes)
-        family_node['children'].append(task_node)
+        add_node(
+            *get_parent_key('task', task), nodes
+        )['children'].append(task_node)
         for job in task['jobs']:
             job_node = add_node(
                 'job', job['id'], nodes, data=job)
@@ -176,6 +167,66 @@ def compute_tree(flow):
     return flow_node
 
 
+def get_parent_key(type_, data):
+    """Return the key of the node a task or family belongs to.
+
+    Examples:
+        >>> first_parent = {'id': '1|A', 'name': 'A'}
+        >>> get_parent_key('task', {'id': '1|a', 'firstParent': first_parent})
+        ('family', '1|A')
+        >>> get_parent_key(
+        ...     'task', {'id': '1|a', 'firstParent': {'name': 'root'}})
+        ('cycle', '1')
+
+    """
+    first_parent = data['firstParent']
+    if first_parent and first_parent['name'] != 'root':
+        return ('family', first_parent['id'])
+    return ('cycle', idpop(data['id']))
+
+
+def patch_jobs(task_node, jobs, nodes, dirty, changed):
+    """Update the job nodes of a task node.
+
+    Arguments:
+        task_node (dict):
+            The task node.
+        jobs (list):
+            The jobs of this task, sorted by submit number, most recent
+            first.
+        nodes (dict):
+            The node store.
+        dirty (set):
+            Keys of nodes whose children have changed, will be updated.
+        changed (set):
+            Keys of nodes whose data has changed, will be updated.
+
+    Returns:
+        list - The keys of nodes which have been removed from the store.
+
+    """
+    for job in jobs:
+        job_node = add_node('job', job['id'], nodes)
+        if job_node['data'] != job:
+            job_info_node = add_node('job_info', job['id'] + '_info', nodes)
+            job_node['data'] = job_info_node['data'] = job
+            job_node['children'] = [job_info_node]
+            changed.add(('job', job_node['id_']))
+            changed.add(('job_info', job_info_node['id_']))
+
+    old_ids = [child['id_'] for child in task_node['children']]
+    new_ids = [job['id'] for job in jobs]
+    removed = []
+    if old_ids != new_ids:
+        task_node['children'] = [nodes[('job', id_)] for id_ in new_ids]
+        dirty.add(('task', task_node['id_']))
+        for id_ in set(old_ids).difference(new_ids):
+            for key in (('job', id_), ('job_info', id_ + '_info')):
+                nodes.pop(key, None)
+                removed.append(key)
+    return removed
+
+
 class NaturalSort:
     """An object to use as a sort key for sorting strings as a human would.
 
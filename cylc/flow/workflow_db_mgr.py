@@ -23,15 +23,21 @@ This module provides the logic to:
 * Manage existing run database files on restart.
 """
 
+from collections import deque, OrderedDict
+from contextlib import suppress
 import json
 import os
 from pkg_resources import parse_version
 from shutil import copy, rmtree
 from tempfile import mkstemp
-from typing import Any, Dict, List, Set, TYPE_CHECKING, Tuple
+from threading import Condition, Lock, Thread
+from time import time
+from typing import (
+    Any, Deque, Dict, Hashable, List, Optional, Set, TYPE_CHECKING, Tuple)
 
 from cylc.flow import LOG
 from cylc.flow.broadcast_report import get_broadcast_change_iter
+from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
 from cylc.flow.rundb import CylcWorkflowDAO
 from cylc.flow import __version__ as CYLC_VERSION
 from cylc.flow.wallclock import get_current_time_string, get_utc_mode
@@ -50,6 +56,165 @@ DbUpdateTuple = Tuple[DbArgDict, DbArgDict]
 PERM_PRIVATE = 0o600  # -rw-------
 
 
+class PublicDatabaseWriter:
+    """Write queued operations to the public database in a separate thread.
+
+    Each call to put() adds a batch of operations (the contents of one
+    WorkflowDatabaseManager.process_queued_ops call). The writer thread
+    executes all batches pending at the time in a single transaction.
+
+    An UPDATE in a pending batch is discarded if a later batch contains an
+    UPDATE of the same columns with the same WHERE arguments (the later one
+    overwrites it whatever happened in between).
+
+    Args:
+        dao: The public database access object. Once the writer is started
+            it must only be accessed via the writer.
+    """
+
+    RETRY_DELAY = 1.0  # seconds between failed write attempts
+
+    def __init__(self, dao: CylcWorkflowDAO) -> None:
+        self.dao = dao
+        # Guards all of the attributes below.
+        self._cond = Condition()
+        # Held while the thread is writing to the database.
+        self._write_lock = Lock()
+        # Pending batches: [(time queued, deletes, inserts, updates), ...]
+        self._pending: Deque[Tuple[float, list, list, Dict]] = deque()
+        # Latest pending update for each key: {key: updates dict}
+        self._update_keys: Dict[Hashable, Dict] = {}
+        # Time queued of the oldest batch being written.
+        self._writing_since: Optional[float] = None
+        self._stopping = False
+        self._thread = Thread(
+            target=self._run, name='public-db-writer', daemon=True)
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        # (SQLite connections can't be shared between threads.)
+        self.dao.close()
+        self._thread.start()
+
+    @staticmethod
+    def _update_key(table_name, set_args, where_args) -> Hashable:
+        """Return the key used to coalesce UPDATE statements."""
+        try:
+            return (
+                table_name,
+                tuple(sorted(set_args)),
+                tuple(sorted(where_args.items()))
+            )
+        except TypeError:
+            # Unhashable/unsortable args, don't coalesce.
+            return object()
+
+    def put(self, deletes, inserts, updates) -> None:
+        """Queue a batch of operations to write.
+
+        Args:
+            deletes: [(table_name, where_args), ...]
+            inserts: [(table_name, args), ...]
+            updates: [(table_name, set_args, where_args), ...]
+        """
+        if not (deletes or inserts or updates):
+            return
+        batch_updates: Dict[Hashable, Tuple[str, Dict, Dict]] = {}
+        with self._cond:
+            for table_name, set_args, where_args in updates:
+                key = self._update_key(table_name, set_args, where_args)
+                older = self._update_keys.pop(key, None)
+                if older is not None:
+                    older.pop(key, None)
+                # (Also supersedes an earlier update in this batch.)
+                batch_updates.pop(key, None)
+                batch_updates[key] = (table_name, set_args, where_args)
+                self._update_keys[key] = batch_updates
+            self._pending.append((time(), deletes, inserts, batch_updates))
+            self._cond.notify_all()
+
+    @property
+    def lag(self) -> float:
+        """Return the age in seconds of the oldest unwritten batch."""
+        with self._cond:
+            if self._writing_since is not None:
+                since: Optional[float] = self._writing_since
+            elif self._pending:
+                since = self._pending[0][0]
+            else:
+                return 0.0
+        return time() - since
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for all queued batches to be written.
+
+        Return True if all batches were written, or False on timeout.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and self._writing_since is None,
+                timeout
+            )
+
+    def discard(self, callback=None) -> None:
+        """Discard all unwritten batches.
+
+        Args:
+            callback: Called (with no arguments) while no write is in
+                progress, after the batches have been discarded, e.g. to
+                replace the public database file.
+        """
+        with self._write_lock:
+            with self._cond:
+                self._pending.clear()
+                self._update_keys.clear()
+            if callback is not None:
+                callback()
+            with self._cond:
+                self._cond.notify_all()
+
+    def stop(self) -> bool:
+        """Flush pending batches and stop the writer thread.
+
+        Return True if everything was written.
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread.is_alive():
+            self._thread.join()
+        return not self._pending
+
+    def _run(self) -> None:
+        """Write batches as they arrive."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._pending or self._stopping)
+                if not self._pending:
+                    return  # stopping
+                batches = list(self._pending)
+                self._pending.clear()
+                self._update_keys.clear()
+                self._writing_since = batches[0][0]
+            with self._write_lock:
+                success = self.dao.execute_batches(
+                    (deletes, inserts, updates.values())
+                    for _, deletes, inserts, updates in batches
+                )
+            with self._cond:
+                self._writing_since = None
+                if not success:
+                    # Retry later, unless discarded in the meantime.
+                    self._pending.extendleft(reversed(batches))
+                    if self._stopping:
+                        # Don't hold up shutdown, the caller will recover.
+                        self._cond.notify_all()
+                        return
+                    self._cond.wait(self.RETRY_DELAY)
+                self._cond.notify_all()
+
+
 class WorkflowDatabaseManager:
     """Manage the workflow runtime private and public databases."""
 
@@ -89,6 +254,9 @@ class WorkflowDatabaseManager:
     TABLE_XTRIGGERS = CylcWorkflowDAO.TABLE_XTRIGGERS
     TABLE_ABS_OUTPUTS = CylcWorkflowDAO.TABLE_ABS_OUTPUTS
 
+    # Maximum number of (name, cycle) entries in the submit number cache.
+    SUBMIT_NUMS_CACHE_SIZE = 10000
+
     def __init__(self, pri_d=None, pub_d=None):
         self.pri_path = None
         if pri_d:
@@ -100,6 +268,8 @@ class WorkflowDatabaseManager:
                 pub_d, CylcWorkflowDAO.DB_FILE_BASE_NAME)
         self.pri_dao = None
         self.pub_dao = None
+        self.pub_writer: Optional[PublicDatabaseWriter] = None
+        self.pub_max_lag: Optional[float] = None
 
         self.db_deletes_map: Dict[str, List[DbArgDict]] = {
             self.TABLE_BROADCAST_STATES: [],
@@ -126,6 +296,13 @@ class WorkflowDatabaseManager:
             self.TABLE_XTRIGGERS: [],
             self.TABLE_ABS_OUTPUTS: []}
         self.db_updates_map: Dict[str, List[DbUpdateTuple]] = {}
+        # LRU cache of the task_states table submit numbers, to avoid a DB
+        # query on every spawn: {(name, cycle): {flow_label: submit_num}}
+        self.submit_nums: 'OrderedDict[Tuple[str, str], Dict[str, int]]' = (
+            OrderedDict())
+        # Event timer rows currently in the task_action_timers table:
+        # {(name, cycle, ctx_key), ...}
+        self.event_timer_rows: Set[Tuple[str, str, str]] = set()
 
     def copy_pri_to_pub(self) -> None:
         """Copy content of primary database file to public database file."""
@@ -148,6 +325,8 @@ class WorkflowDatabaseManager:
             # Get default permissions level for public db:
             st_mode = os.stat(self.pub_dao.db_file_name).st_mode
 
+            if self.pri_dao.pragmas.get('journal_mode') == 'wal':
+                self.pri_dao.checkpoint()
             copy(self.pri_dao.db_file_name, temp_pub_db_file_name)
             os.rename(temp_pub_db_file_name, self.pub_dao.db_file_name)
             os.chmod(self.pub_dao.db_file_name, st_mode)
@@ -183,9 +362,26 @@ class WorkflowDatabaseManager:
         """Delete workflow stop task from workflow_params table."""
         self.delete_workflow_params(self.KEY_STOP_TASK)
 
+    @staticmethod
+    def get_db_pragmas(db_name: str) -> Dict[str, Any]:
+        """Return SQLite PRAGMA settings from the global config.
+
+        Args:
+            db_name: "private" or "public".
+        """
+        db_conf = glbl_cfg().get(['scheduler', 'database', db_name])
+        return {
+            'journal_mode': db_conf['journal mode'],
+            'synchronous': db_conf['synchronous'],
+            # (negative cache_size is in KiB rather than pages)
+            'cache_size': -db_conf['cache size'],
+            'mmap_size': db_conf['mmap size'],
+        }
+
     def get_pri_dao(self):
         """Return the primary DAO."""
-        return CylcWorkflowDAO(self.pri_path)
+        return CylcWorkflowDAO(
+            self.pri_path, pragmas=self.get_db_pragmas('private'))
 
     @staticmethod
     def _namedtuple2json(obj):
@@ -215,13 +411,80 @@ class WorkflowDatabaseManager:
             except OSError:
                 # Just in case the path is a directory!
                 rmtree(self.pri_path, ignore_errors=True)
+            # Remove any WAL files left over from the previous run, else they
+            # would be applied to the new database.
+            for suffix in ('-wal', '-shm'):
+                with suppress(FileNotFoundError):
+                    os.unlink(self.pri_path + suffix)
         self.pri_dao = self.get_pri_dao()
         os.chmod(self.pri_path, PERM_PRIVATE)
-        self.pub_dao = CylcWorkflowDAO(self.pub_path, is_public=True)
+        self.submit_nums.clear()
+        self.pub_dao = CylcWorkflowDAO(
+            self.pub_path,
+            is_public=True,
+            pragmas=self.get_db_pragmas('public')
+        )
         self.copy_pri_to_pub()
+        pub_conf = glbl_cfg().get(['scheduler', 'database', 'public'])
+        if pub_conf['threaded writes']:
+            self.pub_max_lag = pub_conf['maximum lag']
+            self.pub_writer = PublicDatabaseWriter(self.pub_dao)
+            self.pub_writer.start()
+
+    def _get_cached_submit_nums(self, name, cycle):
+        """Return the cache entry for name.cycle, loading it on a miss.
+
+        (The database is up to date for entries not in the cache, see
+        _trim_submit_nums.)
+        """
+        key = (name, cycle)
+        try:
+            self.submit_nums.move_to_end(key)
+        except KeyError:
+            if self.pri_dao is None:
+                submit_nums = {}
+            else:
+                submit_nums = self.pri_dao.select_submit_nums(name, cycle)
+            self.submit_nums[key] = submit_nums
+        return self.submit_nums[key]
+
+    def _cache_submit_num(self, name, cycle, flow_label, submit_num):
+        """Record the submit number of a task_states row in the cache."""
+        self._get_cached_submit_nums(name, cycle)[flow_label] = submit_num
+
+    def _trim_submit_nums(self):
+        """Evict the least recently used entries from the cache.
+
+        Only call this once queued task_states rows have been written.
+        """
+        while len(self.submit_nums) > self.SUBMIT_NUMS_CACHE_SIZE:
+            self.submit_nums.popitem(last=False)
+
+    def select_submit_nums(self, name: str, point: str) -> Dict[str, int]:
+        """Return submit numbers of previous instances of task name.point.
+
+        Equivalent to CylcWorkflowDAO.select_submit_nums, but served from
+        memory where possible, including task_states rows not yet written to
+        the database.
+
+        Return:
+        {
+            flow_label: submit_num,
+            ...,
+        }
+        """
+        return dict(self._get_cached_submit_nums(name, point))
 
     def on_workflow_shutdown(self):
         """Close data access objects."""
+        if self.pub_writer:
+            if not self.pub_writer.stop():
+                # The public database is stuck, replace it.
+                self.copy_pri_to_pub()
+                LOG.warning(
+                    f"{self.pub_dao.db_file_name}: recovered from "
+                    f"{self.pri_dao.db_file_name}")
+            self.pub_writer = None
         if self.pri_dao:
             self.pri_dao.close()
             self.pri_dao = None
@@ -235,20 +498,23 @@ class WorkflowDatabaseManager:
             return
         # Record workflow parameters and tasks in pool
         # Record any broadcast settings to be dumped out
+        pub_deletes = []
+        pub_inserts = []
+        pub_updates = []
         if any(self.db_deletes_map.values()):
             for table_name, db_deletes in sorted(
                     self.db_deletes_map.items()):
                 while db_deletes:
                     where_args = db_deletes.pop(0)
                     self.pri_dao.add_delete_item(table_name, where_args)
-                    self.pub_dao.add_delete_item(table_name, where_args)
+                    pub_deletes.append((table_name, where_args))
         if any(self.db_inserts_map.values()):
             for table_name, db_inserts in sorted(
                     self.db_inserts_map.items()):
                 while db_inserts:
                     db_insert = db_inserts.pop(0)
                     self.pri_dao.add_insert_item(table_name, db_insert)
-                    self.pub_dao.add_insert_item(table_name, db_insert)
+                    pub_inserts.append((table_name, db_insert))
         if (hasattr(self, 'db_updates_map') and
                 any(self.db_updates_map.values())):
             for table_name, db_updates in sorted(
@@ -257,19 +523,28 @@ class WorkflowDatabaseManager:
                     set_args, where_args = db_updates.pop(0)
                     self.pri_dao.add_update_item(
                         table_name, set_args, where_args)
-                    self.pub_dao.add_update_item(
-                        table_name, set_args, where_args)
+                    pub_updates.append((table_name, set_args, where_args))
 
-        # Previously, we used a separate thread for database writes. This has
-        # now been removed. For the private database, there is no real
-        # advantage in using a separate thread as it needs to be always in sync
-        # with what is current. For the public database, which does not need to
-        # be fully in sync, there is some advantage of using a separate
-        # thread/process, if writing to it becomes a bottleneck. At the moment,
-        # there is no evidence that this is a bottleneck, so it is better to
-        # keep the logic simple.
+        # The private database needs to be always in sync with what is
+        # current so is written here. The public database does not need to be
+        # fully in sync so can optionally be written in a separate thread, if
+        # writing to it becomes a bottleneck.
         self.pri_dao.execute_queued_items()
-        self.pub_dao.execute_queued_items()
+        self._trim_submit_nums()
+        if self.pub_writer is not None:
+            self.pub_writer.put(pub_deletes, pub_inserts, pub_updates)
+            if self.pub_writer.lag > self.pub_max_lag:
+                # Don't let the public database fall too far behind.
+                LOG.debug("waiting for public database writes to catch up")
+                self.pub_writer.flush(self.pub_max_lag)
+        else:
+            for table_name, where_args in pub_deletes:
+                self.pub_dao.add_delete_item(table_name, where_args)
+            for table_name, db_insert in pub_inserts:
+                self.pub_dao.add_insert_item(table_name, db_insert)
+            for table_name, set_args, where_args in pub_updates:
+                self.pub_dao.add_update_item(table_name, set_args, where_args)
+            self.pub_dao.execute_queued_items()
 
     def put_broadcast(self, modified_settings, is_cancel=False):
         """Put or clear broadcasts in runtime database."""
@@ -385,23 +660,48 @@ class WorkflowDatabaseManager:
                 {"key": key, "value": value})
 
     def put_task_event_timers(self, task_events_mgr):
-        """Put statements to update the task_action_timers table."""
+        """Put statements to update the task_action_timers table.
+
+        Only the event timer rows are replaced; rows for task poll and retry
+        timers are maintained by put_task_pool.
+        """
         if task_events_mgr.event_timers_updated:
-            self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
+            event_timer_rows = set()
             for key, timer in task_events_mgr._event_timers.items():
                 key1, point, name, submit_num = key
+                ctx_key = json.dumps((key1, submit_num,))
+                event_timer_rows.add((name, point, ctx_key))
                 self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
                     "name": name,
                     "cycle": point,
-                    "ctx_key": json.dumps((key1, submit_num,)),
+                    "ctx_key": ctx_key,
                     "ctx": self._namedtuple2json(timer.ctx),
                     "delays": json.dumps(timer.delays),
                     "num": timer.num,
                     "delay": timer.delay,
                     "timeout": timer.timeout
                 })
+            for name, point, ctx_key in (
+                self.event_timer_rows - event_timer_rows
+            ):
+                self.put_delete_task_action_timer(name, point, ctx_key)
+            self.event_timer_rows = event_timer_rows
             task_events_mgr.event_timers_updated = False
 
+    def put_delete_task_action_timer(self, name, cycle, ctx_key):
+        """Put statement to delete a row from the task_action_timers table.
+
+        Args:
+            name: Task name.
+            cycle: Cycle point string.
+            ctx_key: The ctx_key column value (JSON).
+        """
+        self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({
+            "name": name,
+            "cycle": cycle,
+            "ctx_key": ctx_key
+        })
+
     def put_xtriggers(self, sat_xtrig):
         """Put statements to update external triggers table."""
         self.db_deletes_map[self.TABLE_XTRIGGERS].append({})
@@ -434,62 +734,15 @@ class WorkflowDatabaseManager:
     def put_task_pool(self, pool: 'TaskPool') -> None:
         """Update various task tables for current pool, in runtime database.
 
-        Queue delete (everything) statements to wipe the tables, and queue the
-        relevant insert statements for the current tasks in the pool.
+        Only tasks that have changed since their rows were last written (see
+        TaskState.is_db_dirty) are updated: their task_pool, prerequisite and
+        timer rows are replaced. Rows of tasks removed from the pool are
+        deleted by delete_pool_task.
         """
-        self.db_deletes_map[self.TABLE_TASK_POOL].append({})
-        self.db_deletes_map[self.TABLE_TASK_PREREQUISITES].append({})
-        # No need to do:
-        # self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
-        # Should already be done by self.put_task_event_timers above.
-        self.db_deletes_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({})
         for itask in pool.get_all_tasks():
-            for prereq in itask.state.prerequisites:
-                for (p_name, p_cycle, p_output), satisfied_state in (
-                        prereq.satisfied.items()):
-                    self.put_insert_task_prerequisites(itask, {
-                        "prereq_name": p_name,
-                        "prereq_cycle": p_cycle,
-                        "prereq_output": p_output,
-                        "satisfied": satisfied_state
-                    })
-            self.db_inserts_map[self.TABLE_TASK_POOL].append({
-                "name": itask.tdef.name,
-                "cycle": str(itask.point),
-                "flow_label": itask.flow_label,
-                "status": itask.state.status,
-                "is_held": itask.state.is_held
-            })
-            if itask.timeout is not None:
-                self.db_inserts_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "timeout": itask.timeout
-                })
-            if itask.poll_timer is not None:
-                self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "ctx_key": json.dumps("poll_timer"),
-                    "ctx": self._namedtuple2json(itask.poll_timer.ctx),
-                    "delays": json.dumps(itask.poll_timer.delays),
-                    "num": itask.poll_timer.num,
-                    "delay": itask.poll_timer.delay,
-                    "timeout": itask.poll_timer.timeout
-                })
-            for ctx_key_1, timer in itask.try_timers.items():
-                if timer is None:
-                    continue
-                self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "ctx_key": json.dumps(("try_timers", ctx_key_1)),
-                    "ctx": self._namedtuple2json(timer.ctx),
-                    "delays": json.dumps(timer.delays),
-                    "num": timer.num,
-                    "delay": timer.delay,
-                    "timeout": timer.timeout
-                })
+            if itask.state.is_db_dirty:
+                self._put_task_pool_rows(itask)
+                itask.state.is_db_dirty = False
             if itask.state.time_updated:
                 set_args = {
                     "time_updated": itask.state.time_updated,
@@ -506,8 +759,99 @@ class WorkflowDatabaseManager:
                 self.db_updates_map[self.TABLE_TASK_STATES].append(
                     (set_args, where_args)
                 )
+                self._cache_submit_num(
+                    itask.tdef.name, str(itask.point), itask.flow_label,
+                    itask.submit_num)
                 itask.state.time_updated = None
 
+    def _put_task_pool_rows(self, itask) -> None:
+        """Queue statements to replace the task pool rows of a task."""
+        # (Deletes are executed before inserts.)
+        self.delete_pool_task(itask, with_try_timers=False)
+        for prereq in itask.state.prerequisites:
+            for (p_name, p_cycle, p_output), satisfied_state in (
+                    prereq.satisfied.items()):
+                self.put_insert_task_prerequisites(itask, {
+                    "prereq_name": p_name,
+                    "prereq_cycle": p_cycle,
+                    "prereq_output": p_output,
+                    "satisfied": satisfied_state
+                })
+        self.db_inserts_map[self.TABLE_TASK_POOL].append({
+            "name": itask.tdef.name,
+            "cycle": str(itask.point),
+            "flow_label": itask.flow_label,
+            "status": itask.state.status,
+            "is_held": itask.state.is_held
+        })
+        if itask.timeout is not None:
+            self.db_inserts_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({
+                "name": itask.tdef.name,
+                "cycle": str(itask.point),
+                "timeout": itask.timeout
+            })
+        if itask.poll_timer is not None:
+            self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
+                "name": itask.tdef.name,
+                "cycle": str(itask.point),
+                "ctx_key": json.dumps("poll_timer"),
+                "ctx": self._namedtuple2json(itask.poll_timer.ctx),
+                "delays": json.dumps(itask.poll_timer.delays),
+                "num": itask.poll_timer.num,
+                "delay": itask.poll_timer.delay,
+                "timeout": itask.poll_timer.timeout
+            })
+        for ctx_key_1, timer in itask.try_timers.items():
+            if timer is None:
+                continue
+            self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
+                "name": itask.tdef.name,
+                "cycle": str(itask.point),
+                "ctx_key": json.dumps(("try_timers", ctx_key_1)),
+                "ctx": self._namedtuple2json(timer.ctx),
+                "delays": json.dumps(timer.delays),
+                "num": timer.num,
+                "delay": timer.delay,
+                "timeout": timer.timeout
+            })
+
+    def delete_pool_task(self, itask, with_try_timers=True) -> None:
+        """Schedule deletion of the task pool rows of a task.
+
+        Args:
+            itask: The task proxy.
+            with_try_timers: Also delete the task's retry timer rows (retry
+                timers are never unset, so these are replaced in place).
+        """
+        where_args = self.put_delete_task_pool_rows(
+            itask.tdef.name, str(itask.point))
+        ctx_keys = [json.dumps("poll_timer")]
+        if with_try_timers:
+            ctx_keys.extend(
+                json.dumps(("try_timers", ctx_key_1))
+                for ctx_key_1 in itask.try_timers
+            )
+        for ctx_key in ctx_keys:
+            self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append(
+                dict(where_args, ctx_key=ctx_key))
+
+    def put_delete_task_pool_rows(self, name, cycle):
+        """Schedule deletion of the task_pool, task_prerequisites and
+        task_timeout_timers rows of a task.
+
+        Args:
+            name: Task name.
+            cycle: Cycle point string.
+
+        Returns:
+            The where args of the delete statements.
+        """
+        where_args = {"cycle": cycle, "name": name}
+        self.db_deletes_map[self.TABLE_TASK_POOL].append(where_args)
+        self.db_deletes_map[self.TABLE_TASK_PREREQUISITES].append(where_args)
+        self.db_deletes_map[self.TABLE_TASK_TIMEOUT_TIMERS].append(where_args)
+        return where_args
+
     def put_tasks_to_hold(
         self, tasks: Set[Tuple[str, 'PointBase']]
     ) -> None:
@@ -539,6 +883,9 @@ class WorkflowDatabaseManager:
     def put_insert_task_states(self, itask, args):
         """Put INSERT statement for task_states table."""
         self._put_insert_task_x(CylcWorkflowDAO.TABLE_TASK_STATES, itask, args)
+        self._cache_submit_num(
+            args["name"], args["cycle"], args.get("flow_label"),
+            args["submit_num"])
 
     def put_insert_task_prerequisites(self, itask, args):
         """Put INSERT statement for task_prerequisites table."""
@@ -597,7 +944,11 @@ class WorkflowDatabaseManager:
     def recover_pub_from_pri(self):
         """Recover public database from private database."""
         if self.pub_dao.n_tries >= self.pub_dao.MAX_TRIES:
-            self.copy_pri_to_pub()
+            if self.pub_writer is not None:
+                # (The private database already contains the pending writes.)
+                self.pub_writer.discard(self.copy_pri_to_pub)
+            else:
+                self.copy_pri_to_pub()
             LOG.warning(
                 f"{self.pub_dao.db_file_name}: recovered from "
                 f"{self.pri_dao.db_file_name}")
@@ -15,21 +15,24 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from contextlib import suppress
+from heapq import heappop, heappush
 import json
 import re
 from copy import deepcopy
 from time import time
-from typing import Any, Dict, List, Optional, Tuple, Callable
+from typing import Any, Dict, List, Optional, Set, Tuple, Callable
 
 from cylc.flow import LOG
 import cylc.flow.flags
 from cylc.flow.hostuserutil import get_user
-from cylc.flow.xtriggers.wall_clock import wall_clock
+from cylc.flow.task_state import TASK_STATUS_WAITING
+from cylc.flow.xtriggers.wall_clock import get_trigger_time
 
 from cylc.flow.subprocctx import SubFuncContext
 from cylc.flow.broadcast_mgr import BroadcastMgr
 from cylc.flow.data_store_mgr import DataStoreMgr
-from cylc.flow.subprocpool import SubProcPool
+from cylc.flow.subprocpool import FunctionPool, SubProcPool
+from cylc.flow.task_deadlines import DeadlineQueue
 from cylc.flow.task_proxy import TaskProxy
 from cylc.flow.subprocpool import get_func
 
@@ -94,6 +97,8 @@ class XtriggerManager:
         user: workflow owner
         broadcast_mgr: the Broadcast Manager
         proc_pool: pool of Subprocesses
+        func_pool: pool for calling trusted functions in-process
+        deadlines: queue of task deadlines, for clock triggers
         workflow_run_dir: workflow run directory
         workflow_share_dir: workflow share directory
 
@@ -105,6 +110,8 @@ class XtriggerManager:
         broadcast_mgr: BroadcastMgr,
         data_store_mgr: DataStoreMgr,
         proc_pool: SubProcPool,
+        func_pool: Optional[FunctionPool] = None,
+        deadlines: Optional[DeadlineQueue] = None,
         user: Optional[str] = None,
         workflow_run_dir: Optional[str] = None,
         workflow_share_dir: Optional[str] = None,
@@ -117,6 +124,27 @@ class XtriggerManager:
         self.sat_xtrig: dict = {}
         # Signatures of active functions (waiting on callback).
         self.active: list = []
+        # Number of tasks in the pool with each xtrigger, by signature, and
+        # the signatures counted for each task.
+        self.sig_refs: Dict[str, int] = {}
+        self.task_sigs: Dict[TaskProxy, List[str]] = {}
+        # Unsatisfied xtriggers of tasks waiting on them, by task.
+        # {itask: {label: signature}}
+        self.task_xtrigs: Dict[TaskProxy, Dict[str, str]] = {}
+        # Tasks waiting on each (non-clock) xtrigger, by signature.
+        self.xtrig_tasks: Dict[str, Set[TaskProxy]] = {}
+        # Function contexts of xtriggers tasks are waiting on, by signature.
+        self.xtrig_ctxs: Dict[str, SubFuncContext] = {}
+        # When xtriggers are due to be called, by signature.
+        self.xtrig_due: Dict[str, float] = {}
+        # Min-heap of (due time, signature) for xtrigger calls.
+        self.call_heap: List[Tuple[float, str]] = []
+        # Satisfied xtriggers not yet passed on to waiting tasks.
+        self.xtrigs_ready: Set[str] = set()
+        # Clock triggers are satisfied by deadline callbacks.
+        if deadlines is None:
+            deadlines = DeadlineQueue()
+        self.deadlines = deadlines
 
         self.workflow_run_dir = workflow_run_dir
 
@@ -132,6 +160,7 @@ class XtriggerManager:
         }
 
         self.proc_pool = proc_pool
+        self.func_pool = func_pool
         self.broadcast_mgr = broadcast_mgr
         self.data_store_mgr = data_store_mgr
 
@@ -262,69 +291,226 @@ class XtriggerManager:
         ctx.update_command(self.workflow_run_dir)
         return ctx
 
-    def call_xtriggers_async(self, itask: TaskProxy):
-        """Call itask's xtrigger functions via the process pool...
-
-        ...if previous call not still in-process and retry period is up.
+    def add_task(self, itask: TaskProxy) -> None:
+        """Register a task which is waiting on its xtriggers.
 
+        Its unsatisfied xtriggers will be called when due, see
+        call_xtriggers_async. Registering a task again picks up any changes
+        to its xtriggers.
 
         Args:
-            itask: task proxy to check.
+            itask: task proxy, waiting and released from the runahead pool.
         """
+        self.remove_task(itask)
+        if not self._is_waiting(itask):
+            return
+        labels = {}
+        now = time()
         for label, sig, ctx, _ in self._get_xtrigs(itask, unsat_only=True):
+            labels[label] = sig
             if sig.startswith("wall_clock"):
-                # Special case: quick synchronous clock check.
+                # Special case: clock triggers are task-specific.
                 if 'absolute_as_seconds' not in ctx.func_kwargs:
                     ctx.func_kwargs.update(
                         {
                             'point_as_seconds': itask.get_point_as_seconds()
                         }
                     )
-                if wall_clock(*ctx.func_args, **ctx.func_kwargs):
-                    itask.state.xtriggers[label] = True
-                    self.sat_xtrig[sig] = {}
-                    self.data_store_mgr.delta_task_xtrigger(sig, True)
-                    LOG.info('xtrigger satisfied: %s = %s', label, sig)
+                self.deadlines.put(
+                    itask,
+                    ('xtrigger', label),
+                    get_trigger_time(*ctx.func_args, **ctx.func_kwargs),
+                    self._satisfy_clock,
+                    label
+                )
                 continue
-            # General case: potentially slow asynchronous function call.
+            self.xtrig_tasks.setdefault(sig, set()).add(itask)
             if sig in self.sat_xtrig:
-                if not itask.state.xtriggers[label]:
-                    itask.state.xtriggers[label] = True
-                    res = {}
-                    for key, val in self.sat_xtrig[sig].items():
-                        res["%s_%s" % (label, key)] = val
-                    if res:
-                        xtrigger_env = [{'environment': {key: val}} for
-                                        key, val in res.items()]
-                        self.broadcast_mgr.put_broadcast(
-                            [str(itask.point)],
-                            [itask.tdef.name],
-                            xtrigger_env
-                        )
+                self.xtrigs_ready.add(sig)
                 continue
-            if sig in self.active:
-                # Already waiting on this result.
+            self.xtrig_ctxs.setdefault(sig, ctx)
+            if sig not in self.active and sig not in self.xtrig_due:
+                self._schedule_call(
+                    sig, max(now, self.t_next_call.get(sig, now)))
+        if labels:
+            self.task_xtrigs[itask] = labels
+
+    def remove_task(self, itask: TaskProxy) -> None:
+        """Unregister a task, e.g. if removed from the pool.
+
+        Args:
+            itask: task proxy.
+        """
+        for label, sig in self.task_xtrigs.pop(itask, {}).items():
+            self.deadlines.discard(itask, ('xtrigger', label))
+            itasks = self.xtrig_tasks.get(sig)
+            if itasks is None:
                 continue
-            now = time()
-            if sig in self.t_next_call and now < self.t_next_call[sig]:
-                # Too soon to call this one again.
+            itasks.discard(itask)
+            if not itasks:
+                # No more tasks are waiting on this xtrigger.
+                del self.xtrig_tasks[sig]
+                self.xtrig_ctxs.pop(sig, None)
+                self.xtrig_due.pop(sig, None)
+
+    def _satisfy_clock(self, itask: TaskProxy, label: str) -> None:
+        """Satisfy a clock trigger once its trigger time has passed.
+
+        (Deadline callback, see add_task.)
+
+        Args:
+            itask: task proxy.
+            label: clock trigger label.
+        """
+        if label not in self.task_xtrigs.get(itask, {}):
+            return
+        if not self._is_waiting(itask):
+            self.remove_task(itask)
+            return
+        sig = self.task_xtrigs[itask].pop(label)
+        itask.state.xtriggers[label] = True
+        self.sat_xtrig[sig] = {}
+        self.data_store_mgr.delta_task_xtrigger(sig, True)
+        LOG.info('xtrigger satisfied: %s = %s', label, sig)
+
+    def _schedule_call(self, sig: str, due: float) -> None:
+        """Schedule a call to an xtrigger function.
+
+        Args:
+            sig: function signature.
+            due: time to make the call.
+        """
+        self.xtrig_due[sig] = due
+        heappush(self.call_heap, (due, sig))
+
+    def get_next_due(self) -> Optional[float]:
+        """Return when the next xtrigger function call is due, if any."""
+        while self.call_heap:
+            due, sig = self.call_heap[0]
+            if self.xtrig_due.get(sig) == due:
+                return due
+            heappop(self.call_heap)
+        return None
+
+    @staticmethod
+    def _is_waiting(itask: TaskProxy) -> bool:
+        """Return True if itask is still waiting on its xtriggers."""
+        return (
+            itask.state(TASK_STATUS_WAITING)
+            and not itask.state.is_queued
+            and not itask.state.is_runahead
+        )
+
+    def call_xtriggers_async(self) -> List[TaskProxy]:
+        """Call xtrigger functions which are due via the process pool.
+
+        A function is only called if the previous call has returned and the
+        retry period is up. Calls are kept in a heap by due time, so only
+        the xtriggers which are due (or whose results have arrived) are
+        handled, regardless of the number of tasks waiting.
+
+        Returns:
+            Registered tasks whose xtriggers have all been satisfied.
+
+        """
+        now = time()
+        # (Clock triggers are satisfied by deadline callbacks, which should
+        # be processed first, see _satisfy_clock.)
+        while self.call_heap and self.call_heap[0][0] <= now:
+            due, sig = heappop(self.call_heap)
+            if self.xtrig_due.get(sig) != due:
+                # Stale entry.
+                continue
+            del self.xtrig_due[sig]
+            for itask in list(self.xtrig_tasks[sig]):
+                if not self._is_waiting(itask):
+                    self.remove_task(itask)
+            if sig not in self.xtrig_tasks:
+                # No task is waiting on this xtrigger any more.
                 continue
+            ctx = deepcopy(self.xtrig_ctxs[sig])
             self.t_next_call[sig] = now + ctx.intvl
-            # Queue to the process pool, and record as active.
+            # Queue to the process pool (or call trusted functions
+            # in-process), and record as active.
             self.active.append(sig)
-            self.proc_pool.put_command(ctx, callback=self.callback)
+            if (
+                self.func_pool is not None
+                and self.func_pool.is_in_process(ctx.func_name)
+            ):
+                self.func_pool.put_command(ctx, callback=self.callback)
+            else:
+                self.proc_pool.put_command(ctx, callback=self.callback)
+
+        # Update tasks waiting on xtriggers which have been satisfied.
+        for sig in self.xtrigs_ready:
+            for itask in self.xtrig_tasks.pop(sig, ()):
+                if not self._is_waiting(itask):
+                    self.remove_task(itask)
+                    continue
+                labels = self.task_xtrigs[itask]
+                res = {}
+                for label in [
+                    label for label, sig_ in labels.items() if sig_ == sig
+                ]:
+                    del labels[label]
+                    itask.state.xtriggers[label] = True
+                    for key, val in self.sat_xtrig[sig].items():
+                        res["%s_%s" % (label, key)] = val
+                if res:
+                    xtrigger_env = [{'environment': {key: val}} for
+                                    key, val in res.items()]
+                    self.broadcast_mgr.put_broadcast(
+                        [str(itask.point)],
+                        [itask.tdef.name],
+                        xtrigger_env
+                    )
+            self.xtrig_ctxs.pop(sig, None)
+        self.xtrigs_ready.clear()
+
+        satisfied = [
+            itask for itask, labels in self.task_xtrigs.items() if not labels]
+        for itask in satisfied:
+            del self.task_xtrigs[itask]
+        return satisfied
 
-    def housekeep(self, itasks: List[TaskProxy]):
-        """Delete satisfied xtriggers no longer needed by any task.
+    def ref_task(self, itask: TaskProxy) -> None:
+        """Count references to xtriggers by a task in the pool.
+
+        Call again if the task's xtriggers change, to update the counts.
 
         Args:
-            itasks: list of all task proxies.
+            itask: task proxy, added to the pool.
+        """
+        self.unref_task(itask)
+        sigs = self._get_xtrigs(itask, sigs_only=True)
+        if not sigs:
+            return
+        self.task_sigs[itask] = sigs
+        for sig in sigs:
+            self.sig_refs[sig] = self.sig_refs.get(sig, 0) + 1
+
+    def unref_task(self, itask: TaskProxy) -> None:
+        """Remove references to xtriggers by a task leaving the pool.
+
+        Satisfied xtriggers no longer needed by any task are deleted.
+
+        Args:
+            itask: task proxy, removed from the pool.
+        """
+        for sig in self.task_sigs.pop(itask, ()):
+            self.sig_refs[sig] -= 1
+            if not self.sig_refs[sig]:
+                del self.sig_refs[sig]
+                self.sat_xtrig.pop(sig, None)
+
+    def housekeep(self):
+        """Delete satisfied xtriggers not needed by any task in the pool.
+
+        Needed after loading satisfied xtriggers for a restart, after that
+        they are deleted as tasks leave the pool.
         """
-        all_xtrig = []
-        for itask in itasks:
-            all_xtrig += self._get_xtrigs(itask, sigs_only=True)
         for sig in list(self.sat_xtrig):
-            if sig not in all_xtrig:
+            if sig not in self.sig_refs:
                 del self.sat_xtrig[sig]
 
     def callback(self, ctx: SubFuncContext):
@@ -343,12 +529,21 @@ class XtriggerManager:
         try:
             satisfied, results = json.loads(ctx.out)
         except (ValueError, TypeError):
-            return
-        LOG.debug('%s: returned %s', sig, results)
+            satisfied, results = False, None
+        else:
+            LOG.debug('%s: returned %s', sig, results)
         if satisfied:
             self.data_store_mgr.delta_task_xtrigger(sig, True)
             LOG.info('xtrigger satisfied: %s = %s', ctx.label, sig)
+            if sig not in self.sig_refs:
+                # The tasks with this xtrigger left the pool during the
+                # call, so the result would never be housekept.
+                return
             self.sat_xtrig[sig] = results
+            self.xtrigs_ready.add(sig)
+        elif sig in self.xtrig_tasks:
+            # Tasks are still waiting on this xtrigger, call it again later.
+            self._schedule_call(sig, self.t_next_call[sig])
 
     def check_xtriggers(
             self,
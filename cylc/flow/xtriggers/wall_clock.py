@@ -39,12 +39,21 @@ def wall_clock(offset=None, absolute_as_seconds=None, point_as_seconds=None):
             Provided by Cylc. The cycle point in unix time format.
 
     """
+    return time() > get_trigger_time(
+        offset, absolute_as_seconds, point_as_seconds)
+
+
+def get_trigger_time(
+    offset=None, absolute_as_seconds=None, point_as_seconds=None
+):
+    """Return the time (in unix time format) a wall_clock xtrigger is due.
+
+    Takes the same arguments as wall_clock.
+
+    """
+    if absolute_as_seconds:
+        return absolute_as_seconds
     offset_as_seconds = 0
     if offset is not None:
         offset_as_seconds = int(interval_parse(offset).get_seconds())
-    if absolute_as_seconds:
-        trigger_time = absolute_as_seconds
-    else:
-        trigger_time = point_as_seconds + offset_as_seconds
-
-    return time() > trigger_time
+    return point_as_seconds + offset_as_seconds
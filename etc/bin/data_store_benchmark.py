@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Benchmark the per-update cost of the data-store delta pipeline.
+
+Usage:
+    data_store_benchmark.py [N_TASKS ...]
+
+For deltas updating each N_TASKS (default 10, 100, 1000, 10000) task
+proxies, measure the time and peak allocation of gathering the deltas for
+publishing and swapping in fresh delta stores, using the current
+implementation and the previous deepcopy-based one.
+"""
+
+from copy import deepcopy
+import sys
+from time import perf_counter
+from types import SimpleNamespace
+import tracemalloc
+
+from cylc.flow.data_messages_pb2 import PbPrerequisite
+from cylc.flow.data_store_mgr import (
+    ALL_DELTAS,
+    DATA_TEMPLATE,
+    DELTAS_MAP,
+    TASK_PROXIES,
+    DataStoreMgr,
+)
+
+N_UPDATES = 10
+
+
+def old_update(data_store_mgr):
+    """The previous implementation."""
+    all_deltas = DELTAS_MAP[ALL_DELTAS]()
+    result = []
+    for key, delta in data_store_mgr.deltas.items():
+        if delta.ListFields():
+            result.append(
+                (key.encode('utf-8'), delta, 'SerializeToString'))
+            getattr(all_deltas, key).CopyFrom(delta)
+    result.append(
+        (ALL_DELTAS.encode('utf-8'), all_deltas, 'SerializeToString')
+    )
+    result = deepcopy(result)
+    data_store_mgr.added = deepcopy(DATA_TEMPLATE)
+    data_store_mgr.updated = deepcopy(DATA_TEMPLATE)
+    # the publisher serialized each message
+    return [
+        (topic, getattr(msg, serializer)())
+        for topic, msg, serializer in result
+    ]
+
+
+def new_update(data_store_mgr):
+    """The current implementation."""
+    result = data_store_mgr.get_publish_deltas()
+    data_store_mgr.clear_delta_store()
+    return result
+
+
+def populate(data_store_mgr, n_tasks):
+    delta = data_store_mgr.deltas[TASK_PROXIES]
+    for ind in range(n_tasks):
+        tproxy = delta.updated.add(
+            id=f'~user/workflow//{ind}/foo',
+            stamp=f'~user/workflow//{ind}/foo@1234567890.123',
+            state='running',
+        )
+        tproxy.prerequisites.append(
+            PbPrerequisite(expression='c0', satisfied=True))
+    delta.checksum = 1234567890
+
+
+def measure(update, data_store_mgr):
+    tracemalloc.start()
+    start = perf_counter()
+    for _ in range(N_UPDATES):
+        update(data_store_mgr)
+    elapsed = (perf_counter() - start) / N_UPDATES
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(sizes):
+    data_store_mgr = DataStoreMgr(
+        SimpleNamespace(owner='user', workflow='workflow'))
+    print(
+        f'{"tasks":>8}'
+        f' {"old (s)":>10} {"old peak (KiB)":>15}'
+        f' {"new (s)":>10} {"new peak (KiB)":>15}'
+    )
+    for n_tasks in sizes:
+        data_store_mgr.clear_delta_batch()
+        populate(data_store_mgr, n_tasks)
+        assert old_update(data_store_mgr) == new_update(data_store_mgr)
+        old_time, old_peak = measure(old_update, data_store_mgr)
+        new_time, new_peak = measure(new_update, data_store_mgr)
+        print(
+            f'{n_tasks:>8}'
+            f' {old_time:10.5f} {old_peak / 1024:15.1f}'
+            f' {new_time:10.5f} {new_peak / 1024:15.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 1000, 10000])
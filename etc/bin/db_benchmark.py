@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Benchmark workflow database queries on a large database.
+
+Usage:
+    db_benchmark.py [N_ROWS]
+
+Populate a workflow database with N_ROWS (default 1,000,000) task_jobs rows
+(and matching task_states rows), then time the lookups the scheduler and
+"cylc workflow-state" make, with and without the secondary indexes, and
+with the default and "wal" SQLite profiles.
+"""
+
+from contextlib import contextmanager
+import os
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from cylc.flow.rundb import CylcWorkflowDAO
+
+
+N_TASKS = 100
+N_QUERIES = 200
+
+PROFILES = {
+    'default': {
+        'journal_mode': 'delete',
+        'synchronous': 'full',
+    },
+    'wal': {
+        'journal_mode': 'wal',
+        'synchronous': 'normal',
+        'mmap_size': 2 ** 28,
+    },
+}
+
+QUERIES = {
+    'select_task_job': lambda dao, cycle, name: (
+        dao.select_task_job(cycle, name)
+    ),
+    'select_submit_nums': lambda dao, cycle, name: (
+        dao.select_submit_nums(name, cycle)
+    ),
+    'workflow-state (cycle)': lambda dao, cycle, name: list(
+        dao.connect().execute(
+            'SELECT name, cycle, status FROM task_states'
+            ' WHERE cycle==? AND (status==? OR status==?)',
+            [cycle, 'succeeded', 'failed']
+        )
+    ),
+    'workflow-state (task, cycle)': lambda dao, cycle, name: list(
+        dao.connect().execute(
+            'SELECT name, cycle, status FROM task_states'
+            ' WHERE name==? AND cycle==?',
+            [name, cycle]
+        )
+    ),
+}
+
+
+@contextmanager
+def timer(label):
+    start = perf_counter()
+    yield
+    print(f'    {label:<34} {perf_counter() - start:10.4f}s')
+
+
+def populate(dao, n_rows):
+    """Insert n_rows task_jobs and task_states rows."""
+    conn = dao.connect()
+    n_cycles = max(n_rows // N_TASKS, 1)
+    for cycle in range(n_cycles):
+        conn.executemany(
+            'INSERT INTO task_jobs(cycle, name, submit_num, run_status)'
+            ' VALUES (?, ?, 1, 0)',
+            [(str(cycle), f'task{task}') for task in range(N_TASKS)]
+        )
+        conn.executemany(
+            'INSERT INTO task_states(name, cycle, flow_label, submit_num,'
+            ' status) VALUES (?, ?, "a", 1, "succeeded")',
+            [(f'task{task}', str(cycle)) for task in range(N_TASKS)]
+        )
+    conn.commit()
+    return n_cycles
+
+
+def run_queries(dao, n_cycles):
+    args = [
+        (str(i * n_cycles // N_QUERIES), f'task{i % N_TASKS}')
+        for i in range(N_QUERIES)
+    ]
+    for label, query in QUERIES.items():
+        with timer(f'{label} x{N_QUERIES}'):
+            for cycle, name in args:
+                query(dao, cycle, name)
+    with timer('insert 10000 task_jobs'):
+        for i in range(10):
+            for task in range(1000):
+                dao.add_insert_item(
+                    CylcWorkflowDAO.TABLE_TASK_JOBS,
+                    {'cycle': 'new', 'name': f'{i}.{task}', 'submit_num': 1}
+                )
+            dao.execute_queued_items()
+
+
+def main(n_rows):
+    with TemporaryDirectory() as tmp_dir:
+        for profile, pragmas in PROFILES.items():
+            db_file = os.path.join(tmp_dir, f'{profile}.db')
+            dao = CylcWorkflowDAO(db_file, pragmas=pragmas)
+            with timer(f'populate {n_rows} rows ({profile})'):
+                n_cycles = populate(dao, n_rows)
+            for indexes in (False, True):
+                conn = dao.connect()
+                for index_name in CylcWorkflowDAO.INDEXES:
+                    conn.execute(f'DROP INDEX IF EXISTS {index_name}')
+                if indexes:
+                    dao.create_tables()
+                print(f'profile={profile} indexes={indexes}')
+                run_queries(dao, n_cycles)
+            dao.close()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
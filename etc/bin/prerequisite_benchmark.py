@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Benchmark conditional prerequisite evaluation.
+
+Usage:
+    prerequisite_benchmark.py [WIDTH ...]
+
+For "a0 | a1 | ... => b" fan-ins of each WIDTH (default 10, 100, 1000),
+time creating the prerequisite and satisfying its outputs one at a time,
+using the compiled expression tree and the previous eval() implementation.
+"""
+
+import re
+import sys
+from time import perf_counter
+
+from cylc.flow.cycling.integer import IntegerPoint
+from cylc.flow.listify import listify
+from cylc.flow.prerequisite import Prerequisite
+from cylc.flow.task_trigger import Dependency, TaskTrigger
+
+
+class EvalPrerequisite(Prerequisite):
+    """The previous implementation which eval'ed a Python expression."""
+
+    SATISFIED_TEMPLATE = 'bool(self.satisfied[("%s", "%s", "%s")])'
+
+    def set_condition(self, expr, condition=None):
+        self._all_satisfied = None
+        if '|' in expr:
+            for message in self.satisfied:
+                expr = re.sub(
+                    fr"\b{re.escape(self.MESSAGE_TEMPLATE % message)}\b",
+                    self.SATISFIED_TEMPLATE % message,
+                    expr
+                )
+            self.conditional_expression = expr
+
+    def _conditional_is_satisfied(self):
+        return eval(self.conditional_expression)  # nosec
+
+    def satisfy_me(self, all_task_outputs):
+        relevant_messages = all_task_outputs & set(self.satisfied)
+        for message in relevant_messages:
+            self.satisfied[message] = self.DEP_STATE_SATISFIED
+            self._all_satisfied = self._conditional_is_satisfied()
+        return relevant_messages
+
+
+class TaskDef:
+    start_point = IntegerPoint('1')
+    initial_point = IntegerPoint('1')
+    max_future_prereq_offset = None
+
+
+def get_dependency(width):
+    triggers = [
+        TaskTrigger(
+            f'a{ind}', None, 'succeeded', False, False, False, None)
+        for ind in range(width)
+    ]
+    exp = listify(' | '.join(f'a{ind}' for ind in range(width)))
+    exp = [triggers[int(item[1:])] if item != '|' else item for item in exp]
+    return Dependency(exp, triggers, False)
+
+
+def benchmark(width, prereq_cls, n_points=10):
+    dependency = get_dependency(width)
+    outputs = [
+        [{(f'a{ind}', str(point), 'succeeded')} for ind in range(width)]
+        for point in range(1, n_points + 1)
+    ]
+    start = perf_counter()
+    for point in range(1, n_points + 1):
+        if prereq_cls is Prerequisite:
+            prereq = dependency.get_prerequisite(IntegerPoint(point), TaskDef)
+        else:
+            prereq = prereq_cls(IntegerPoint(point))
+            for task_trigger in dependency.task_triggers:
+                prereq.add(
+                    task_trigger.task_name, point, task_trigger.output)
+            prereq.set_condition(
+                dependency.get_expression(IntegerPoint(point)))
+        for output in outputs[point - 1]:
+            prereq.satisfy_me(output)
+            prereq.is_satisfied()
+    return (perf_counter() - start) / n_points
+
+
+def main(widths):
+    print(f'{"width":>8} {"eval (s)":>12} {"compiled (s)":>12}')
+    for width in widths:
+        print(
+            f'{width:>8}'
+            f' {benchmark(width, EvalPrerequisite):12.5f}'
+            f' {benchmark(width, Prerequisite):12.5f}'
+        )
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 1000])
@@ -15,10 +15,23 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """Test cylc.flow.client.WorkflowRuntimeClient."""
+import os
+
 import pytest
 
-from cylc.flow.network.client import WorkflowRuntimeClient
+from cylc.flow.exceptions import ClientError, WorkflowStopped
+from cylc.flow.network.client import (
+    WorkflowRuntimeClient,
+    WorkflowRuntimeClientPool,
+)
 from cylc.flow.network.server import PB_METHOD_MAP
+from cylc.flow.workflow_files import (
+    KeyInfo,
+    KeyOwner,
+    KeyType,
+    get_contact_file,
+    get_workflow_srv_dir,
+)
 
 
 @pytest.mark.asyncio
@@ -53,3 +66,52 @@ async def test_protobuf(harness):
     pb_data = PB_METHOD_MAP['pb_entire_workflow']()
     pb_data.ParseFromString(ret)
     assert schd.workflow in pb_data.workflow.id
+
+
+@pytest.mark.asyncio
+async def test_client_pool(flow, scheduler, run, one_conf):
+    """It should reuse connected clients until the workflow changes."""
+    reg = flow(one_conf)
+    schd = scheduler(reg)
+    pool = WorkflowRuntimeClientPool()
+    async with run(schd):
+        with pool.client(reg) as client:
+            await client.async_request('api')
+        with pool.client(reg) as client2:
+            await client2.async_request('api')
+        assert client2 is client
+
+        # a rewritten contact file with the same location is fine
+        os.utime(get_contact_file(reg), ns=(0, 0))
+        with pool.client(reg) as client2:
+            assert client2 is client
+
+        # new server keys need a new client
+        key_info = KeyInfo(
+            KeyType.PUBLIC,
+            KeyOwner.SERVER,
+            workflow_srv_dir=get_workflow_srv_dir(reg)
+        )
+        os.utime(key_info.full_key_path, ns=(0, 0))
+        with pool.client(reg) as client2:
+            assert client2 is not client
+        assert client.socket.closed
+
+        # clients are discarded on error
+        with pytest.raises(ClientError):
+            with pool.client(reg) as client:
+                await client.async_request('no_such_endpoint')
+        assert client.socket.closed
+        with pool.client(reg) as client2:
+            assert client2 is not client
+        pool.clear()
+        assert client2.socket.closed
+        with pool.client(reg) as client:
+            await client.async_request('api')
+
+    with pytest.raises(WorkflowStopped):
+        with pool.client(reg):
+            pass
+    # the idle clients of a stopped workflow are closed
+    assert client.socket.closed
+    assert not pool.clients
@@ -18,13 +18,22 @@ import pytest
 from typing import TYPE_CHECKING
 
 from cylc.flow import ID_DELIM
+from cylc.flow.cycling.integer import IntegerPoint
+from cylc.flow.data_messages_pb2 import AllDeltas, PbEntireWorkflow
 from cylc.flow.data_store_mgr import (
+    ALL_DELTAS,
+    DATA_TEMPLATE,
+    EDGES,
     FAMILY_PROXIES,
     JOBS,
     TASKS,
     TASK_PROXIES,
-    WORKFLOW
+    WORKFLOW,
+    DataStoreSnapshot,
+    GraphWindowNode,
+    generate_checksum,
 )
+from cylc.flow.task_outputs import TASK_OUTPUT_SUCCEEDED
 from cylc.flow.task_state import (
     TASK_STATUS_FAILED,
     TASK_STATUS_SUCCEEDED,
@@ -154,6 +163,53 @@ def test_get_entire_workflow(harness):
     assert len(flow_msg.task_proxies) == len(data[TASK_PROXIES])
 
 
+@pytest.mark.asyncio
+async def test_serialize_snapshot(flow, scheduler, run):
+    """Test the serialized snapshots match the messages and are cached."""
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True
+        },
+        'scheduling': {
+            'graph': {
+                'R1': 'foo => BAR'
+            }
+        },
+        'runtime': {
+            'BAR': {},
+            'bar1, bar2': {
+                'inherit': 'BAR'
+            }
+        }
+    })
+    schd = scheduler(reg)
+    async with run(schd):
+        data_store_mgr = schd.data_store_mgr
+
+        def check():
+            # (compare messages, map field serialization is not ordered)
+            assert PbEntireWorkflow.FromString(
+                data_store_mgr.serialize_entire_workflow()
+            ) == data_store_mgr.get_entire_workflow()
+            for key in (*DATA_TEMPLATE, 'fraggle'):
+                pb_msg = data_store_mgr.get_data_elements(key)
+                assert type(pb_msg).FromString(
+                    data_store_mgr.serialize_data_elements(key)
+                ) == pb_msg
+
+        check()
+        payload = data_store_mgr.get_elements_payload(TASKS, 3)
+        assert data_store_mgr.get_elements_payload(TASKS, 3) is payload
+        for itask in schd.pool.get_all_tasks():
+            itask.state.reset(TASK_STATUS_SUCCEEDED)
+            data_store_mgr.delta_task_state(itask)
+            schd.pool.spawn_on_output(itask, TASK_OUTPUT_SUCCEEDED)
+            schd.pool.remove(itask)
+        data_store_mgr.update_data_structure()
+        assert (TASK_PROXIES, 3) not in data_store_mgr.snapshot_payloads
+        check()
+
+
 def test_increment_graph_window(harness):
     """Test method that adds and removes elements window boundary."""
     schd, data = harness
@@ -161,6 +217,65 @@ def test_increment_graph_window(harness):
     assert len(data[TASK_PROXIES]) == 2
 
 
+def test_graph_window_node(harness):
+    """Test ghost nodes are generated from lightweight window nodes."""
+    schd, data = harness
+    # bar.1 is not in the pool, but is in the n=1 window about foo.1
+    bar_id = f'{schd.data_store_mgr.workflow_id}{ID_DELIM}1{ID_DELIM}bar'
+    assert schd.pool.get_task('bar', IntegerPoint('1')) is None
+    assert [
+        cond.task_proxy
+        for prereq in data[TASK_PROXIES][bar_id].prerequisites
+        for cond in prereq.conditions
+    ] == [f'{schd.data_store_mgr.workflow_id}{ID_DELIM}1{ID_DELIM}foo']
+
+    # the task state is only generated if needed
+    node = GraphWindowNode(
+        schd.config.get_taskdef('foo'), IntegerPoint('1'), 'a')
+    assert node.identity == 'foo.1'
+    assert [name for name, *_ in node.graph_children['succeeded']] == ['bar']
+    assert node._state is None
+    assert not node.state.prerequisites
+    assert node.is_waiting_clock_done()
+
+
+@pytest.mark.asyncio
+async def test_graph_window_node_clock_trigger(flow, scheduler):
+    """Test ghost nodes are generated for clock-triggered tasks."""
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True,
+            'UTC mode': True
+        },
+        'scheduling': {
+            'initial cycle point': '2000',
+            'special tasks': {
+                'clock-trigger': 'bar(PT0S)'
+            },
+            'graph': {
+                'R1': 'foo => bar'
+            }
+        }
+    })
+    schd: 'Scheduler' = scheduler(reg)
+    await schd.install()
+    await schd.initialise()
+    # bar is in the n=1 window about foo
+    await schd.configure()
+    schd.data_store_mgr.update_data_structure()
+    point = schd.config.start_point
+    assert schd.pool.get_task('bar', point) is None
+    assert sorted(
+        task_proxy.name
+        for task_proxy in schd.data_store_mgr.data[
+            schd.data_store_mgr.workflow_id][TASK_PROXIES].values()
+    ) == ['bar', 'foo']
+
+    node = GraphWindowNode(schd.config.get_taskdef('bar'), point, 'a')
+    assert node.is_waiting_clock_done()
+    assert node.clock_trigger_time == node.get_point_as_seconds()
+
+
 def test_initiate_data_model(harness):
     """Test method that generates all data elements in order."""
     schd, data = harness
@@ -275,6 +390,82 @@ def test_update_data_structure(harness):
     assert len({t.is_held for t in data[TASK_PROXIES].values()}) == 1
 
 
+@pytest.mark.asyncio
+async def test_delta_checksum(flow, scheduler, run):
+    """Test the incrementally maintained checksums match the data-store."""
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True
+        },
+        'scheduling': {
+            'graph': {
+                'R1': 'foo => bar'
+            }
+        }
+    })
+    schd = scheduler(reg)
+    async with run(schd):
+        data_store_mgr = schd.data_store_mgr
+        data = data_store_mgr.data[data_store_mgr.workflow_id]
+        for itask in schd.pool.get_all_tasks():
+            itask.state.reset(TASK_STATUS_SUCCEEDED)
+            data_store_mgr.delta_task_state(itask)
+        schd.pool.spawn_on_output(itask, TASK_OUTPUT_SUCCEEDED)
+        schd.pool.remove(itask)
+        data_store_mgr.update_data_structure()
+        assert data[EDGES]
+        for key in (EDGES, FAMILY_PROXIES, JOBS, TASKS, TASK_PROXIES):
+            assert data_store_mgr.checksums.get(key, 0) == (
+                generate_checksum(
+                    e.id if key == EDGES else e.stamp
+                    for e in data[key].values()
+                )
+            )
+        deltas = dict(data_store_mgr.publish_deltas)
+        assert AllDeltas.FromString(
+            deltas[ALL_DELTAS.encode()]
+        ).task_proxies.checksum == data_store_mgr.checksums[TASK_PROXIES]
+
+
+@pytest.mark.asyncio
+async def test_copy_on_write(flow, scheduler, run):
+    """Test snapshots of the data-store are unchanged by updates."""
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True
+        },
+        'scheduling': {
+            'graph': {
+                'R1': 'foo => bar'
+            }
+        }
+    })
+    schd = scheduler(reg)
+    async with run(schd):
+        data_store_mgr = schd.data_store_mgr
+        data_store_mgr.copy_on_write = True
+        snapshot = DataStoreSnapshot(data_store_mgr)
+        snapshot.update()
+        data = snapshot.data[data_store_mgr.workflow_id]
+        states = set(collect_states(data, TASK_PROXIES))
+        assert TASK_STATUS_SUCCEEDED not in states
+        for itask in schd.pool.get_all_tasks():
+            itask.state.reset(TASK_STATUS_SUCCEEDED)
+            data_store_mgr.delta_task_state(itask)
+        data_store_mgr.update_data_structure()
+        # the snapshot is unchanged
+        assert snapshot.data[data_store_mgr.workflow_id] is data
+        assert set(collect_states(data, TASK_PROXIES)) == states
+        # the data-store is updated
+        new_data = data_store_mgr.data[data_store_mgr.workflow_id]
+        assert new_data is not data
+        assert TASK_STATUS_SUCCEEDED in set(
+            collect_states(new_data, TASK_PROXIES))
+        # the snapshot is updated on request
+        snapshot.update()
+        assert snapshot.data[data_store_mgr.workflow_id] is new_data
+
+
 def test_delta_task_prerequisite(harness):
     """Test delta_task_prerequisites."""
     schd, data = harness
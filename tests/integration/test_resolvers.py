@@ -19,7 +19,11 @@ import pytest
 from unittest.mock import Mock
 
 from cylc.flow.data_store_mgr import ID_DELIM, EDGES, TASK_PROXIES
-from cylc.flow.network.resolvers import Resolvers
+from cylc.flow.network.resolvers import (
+    Resolvers,
+    get_indexed_ids,
+    node_filter
+)
 from cylc.flow.network.schema import parse_node_id
 from cylc.flow.scheduler import Scheduler
 
@@ -120,6 +124,32 @@ async def test_get_nodes_all(mock_flow, node_args):
     assert len(nodes) == 1
 
 
+@pytest.mark.asyncio
+async def test_get_nodes_all_indexed(mock_flow, node_args):
+    """Test the data-store indexes select the nodes a full scan would."""
+    node_args['workflows'].append((mock_flow.owner, mock_flow.name, None))
+    _, _, point, name, _, _ = parse_node_id(
+        mock_flow.node_ids[0], TASK_PROXIES)
+    indexes = mock_flow.schd.data_store_mgr.indexes[mock_flow.id]
+    for args in (
+        {'states': ['waiting']},
+        {'states': ['waiting', 'running'], 'is_held': False},
+        {'ids': [(None, None, point, name, None, None)]},
+        {'ids': [(None, None, point, '*', None, None)]},
+        {'ids': [(None, None, None, 'root', None, None)]},
+        {'ghosts': True, 'ids': [(None, None, None, name, None, None)]},
+    ):
+        args = {**node_args, **args}
+        assert get_indexed_ids(indexes, TASK_PROXIES, args) is not None
+        nodes = await mock_flow.resolvers.get_nodes_all(TASK_PROXIES, args)
+        assert {node.id for node in nodes} == {
+            node.id
+            for node in mock_flow.data[TASK_PROXIES].values()
+            if node_filter(node, TASK_PROXIES, args)
+        }
+        assert nodes
+
+
 @pytest.mark.asyncio
 async def test_get_nodes_by_ids(mock_flow, node_args):
     """Test method returning workflow(s) node messages
@@ -20,7 +20,10 @@ from getpass import getuser
 
 import pytest
 
-from cylc.flow.network.server import PB_METHOD_MAP
+from cylc.flow.network.client import WorkflowRuntimeClient
+from cylc.flow.network.client_factory import get_client
+from cylc.flow.network.server import PB_METHOD_MAP, WorkflowRuntimeServer
+from cylc.flow.task_message import send_messages
 
 
 @pytest.mark.asyncio
@@ -79,6 +82,34 @@ def test_pb_entire_workflow(myflow):
     assert data.workflow.id == myflow.id
 
 
+@pytest.mark.parametrize('endpoint', [True, False])
+def test_send_messages(myflow, monkeypatch, endpoint):
+    """Test task messages are queued, with or without put_messages."""
+    if not endpoint:
+        # emulate a scheduler which predates the put_messages endpoint
+        monkeypatch.delattr(WorkflowRuntimeServer, 'put_messages')
+    clients = []
+
+    def _get_client(*args, **kwargs):
+        clients.append(get_client(*args, **kwargs))
+        return clients[-1]
+
+    monkeypatch.setattr('cylc.flow.task_message.get_client', _get_client)
+    send_messages(
+        myflow.workflow,
+        '1/one/01',
+        [['INFO', 'started'], ['WARNING', 'foo']],
+        '2000-01-01T00:00:00Z'
+    )
+    # close the client socket so the context can be cleaned up
+    clients[0].stop(stop_loop=False)
+    assert myflow.message_queue.get(timeout=1) == (
+        '1/one/01', '2000-01-01T00:00:00Z', 'INFO', 'started')
+    assert myflow.message_queue.get(timeout=1) == (
+        '1/one/01', '2000-01-01T00:00:00Z', 'WARNING', 'foo')
+    assert myflow.message_queue.empty()
+
+
 @pytest.mark.asyncio
 @pytest.fixture
 async def accident(flow, scheduler, run, one_conf):
@@ -110,3 +141,64 @@ def test_receiver(accident):
     assert 'error' in accident.server._receiver(msg_in)
     msg_in = {'command': 'foobar', 'args': {}}
     assert 'error' in accident.server._receiver(msg_in)
+
+
+@pytest.mark.asyncio
+async def test_worker_pool(mock_glbl_cfg, flow, scheduler, run, one_conf):
+    """Test serving requests with a pool of worker threads."""
+    for pypath in (
+        'cylc.flow.network.server.glbl_cfg',
+        'cylc.flow.data_store_mgr.glbl_cfg',
+    ):
+        mock_glbl_cfg(
+            pypath,
+            '''
+                [scheduler]
+                    [[server]]
+                        worker threads = 2
+            '''
+        )
+    reg = flow(one_conf)
+    schd = scheduler(reg, paused_start=False)
+    async with run(schd):
+        assert schd.server.n_workers == 2
+        assert schd.data_store_mgr.copy_on_write
+        client = WorkflowRuntimeClient(reg)
+
+        # queries are served concurrently
+        rets = await asyncio.gather(*(
+            client.async_request(
+                'graphql',
+                {'request_string': 'query { workflows { id } }'}
+            )
+            for _ in range(10)
+        ))
+        for ret in rets:
+            assert ret['workflows'][0]['id'] == schd.id
+        assert len(schd.server.workers) == 2
+        ret = await client.async_request('pb_entire_workflow')
+        pb_data = PB_METHOD_MAP['pb_entire_workflow']()
+        pb_data.ParseFromString(ret)
+        assert pb_data.workflow.id == schd.id
+
+        # mutations go through the command queue
+        ret = await client.async_request(
+            'graphql',
+            {
+                'request_string': f'''
+                    mutation {{
+                        pause(workflows: ["{schd.id}"]) {{
+                            result
+                        }}
+                    }}
+                '''
+            }
+        )
+        assert ret['pause']['result'][0]['response'][0]
+        async with timeout(5):
+            while not schd.is_paused:
+                await asyncio.sleep(0.1)
+        client.stop(stop_loop=False)
+
+    # the workers stop with the server
+    assert not schd.server.workers
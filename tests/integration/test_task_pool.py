@@ -16,6 +16,7 @@
 
 from cylc.flow import CYLC_LOG
 import logging
+from pathlib import Path
 import pytest
 from pytest import param
 from typing import Callable, Iterable, List, Tuple, Union
@@ -23,6 +24,10 @@ from typing import Callable, Iterable, List, Tuple, Union
 from cylc.flow.cycling import PointBase
 from cylc.flow.cycling.integer import IntegerPoint
 from cylc.flow.scheduler import Scheduler
+from cylc.flow.task_state import TASK_STATUS_EXPIRED
+from cylc.flow.workflow_files import WorkflowFiles
+
+from .utils.flow_tools import flow_config_str
 
 
 # NOTE: foo & bar have no parents so at start-up (even with the workflow
@@ -420,3 +425,240 @@ async def test_hold_point(
 
     assert task_pool.tasks_to_hold == set()
     assert db_select(example_flow, True, 'tasks_to_hold') == []
+
+
+@pytest.mark.asyncio
+async def test_pool_index(example_flow: Scheduler) -> None:
+    """Test the TaskPool.pool_index is kept in sync with the pools."""
+    task_pool = example_flow.pool
+
+    def assert_index_in_sync():
+        assert sorted(task_pool.pool_index) == sorted(
+            itask.identity for itask in task_pool.get_all_tasks())
+        for itask in task_pool.get_all_tasks():
+            assert task_pool.pool_index[itask.identity] is itask
+
+    assert_index_in_sync()
+    itask = task_pool.get_task('foo', IntegerPoint(1))
+    assert itask is not None
+    assert task_pool.get_task_main('foo', IntegerPoint(1)) is itask
+    assert task_pool._get_hidden_task_by_id(itask.identity) is None
+
+    task_pool.remove(itask)
+    assert_index_in_sync()
+    assert task_pool.get_task('foo', IntegerPoint(1)) is None
+    assert task_pool.get_task_main('foo', IntegerPoint(1)) is None
+
+    task_pool.add_to_pool(itask, is_new=False)
+    assert_index_in_sync()
+    assert task_pool.get_task('foo', IntegerPoint(1)) is itask
+
+
+@pytest.mark.asyncio
+async def test_submit_nums_cache(example_flow: Scheduler) -> None:
+    """Test the in-memory submit number cache matches the task_states table.
+    """
+    db_mgr = example_flow.workflow_db_mgr
+    task_pool = example_flow.pool
+    foo_1 = task_pool.get_task('foo', IntegerPoint(1))
+    foo_1.submit_num = 2
+    foo_1.state.time_updated = '2021-01-01T00:00:00Z'
+    db_mgr.put_task_pool(task_pool)
+    db_mgr.process_queued_ops()
+    for itask in task_pool.get_all_tasks():
+        name, point = itask.tdef.name, str(itask.point)
+        assert db_mgr.select_submit_nums(name, point) == (
+            db_mgr.pri_dao.select_submit_nums(name, point))
+    assert db_mgr.select_submit_nums('foo', '1') == {foo_1.flow_label: 2}
+    assert db_mgr.select_submit_nums('foo', '100') == {}
+
+    # The cache is limited in size, falling back to the DB on a miss.
+    db_mgr.SUBMIT_NUMS_CACHE_SIZE = 1
+    db_mgr.process_queued_ops()
+    assert list(db_mgr.submit_nums) == [('foo', '100')]
+    assert db_mgr.select_submit_nums('foo', '1') == {foo_1.flow_label: 2}
+    assert list(db_mgr.submit_nums)[-1] == ('foo', '1')
+
+
+@pytest.mark.asyncio
+async def test_put_task_pool_incremental(
+    example_flow: Scheduler, db_select: Callable
+) -> None:
+    """Test only changed tasks have their task_pool rows rewritten."""
+    db_mgr = example_flow.workflow_db_mgr
+    task_pool = example_flow.pool
+
+    db_mgr.put_task_pool(task_pool)
+    assert not any(
+        itask.state.is_db_dirty for itask in task_pool.get_all_tasks())
+    assert sorted(
+        db_select(example_flow, True, 'task_pool', 'name', 'cycle')
+    ) == sorted(
+        (itask.tdef.name, str(itask.point))
+        for itask in task_pool.get_all_tasks()
+    )
+
+    # Unchanged tasks don't generate any statements.
+    db_mgr.put_task_pool(task_pool)
+    assert not db_mgr.db_inserts_map[db_mgr.TABLE_TASK_POOL]
+    assert not db_mgr.db_deletes_map[db_mgr.TABLE_TASK_POOL]
+
+    # A changed task is rewritten.
+    foo_1 = task_pool.get_task('foo', IntegerPoint(1))
+    task_pool.hold_active_task(foo_1)
+    assert foo_1.state.is_db_dirty
+    db_mgr.put_task_pool(task_pool)
+    assert [
+        row['name'] for row in db_mgr.db_inserts_map[db_mgr.TABLE_TASK_POOL]
+    ] == ['foo']
+    assert db_select(
+        example_flow, True, 'task_pool', 'is_held', name='foo', cycle='1'
+    ) == [(1,)]
+
+    # A removed task is deleted.
+    task_pool.remove(foo_1)
+    assert db_select(
+        example_flow, True, 'task_pool', name='foo', cycle='1'
+    ) == []
+
+
+@pytest.mark.asyncio
+async def test_load_db_task_action_timers(example_flow: Scheduler) -> None:
+    """Test task action timer rows from a restart are deleted when stale."""
+    db_mgr = example_flow.workflow_db_mgr
+    task_pool = example_flow.pool
+    table = db_mgr.TABLE_TASK_ACTION_TIMERS
+    event_key = '[["event-handler-00", "started"], 1]'
+    rows = [
+        # an event timer
+        ('1', 'foo', event_key, '["ctx"]', '[]', 0, None, None),
+        # rows which cannot be loaded
+        ('1', 'foo', 'not-json', '["ctx"]', '[]', 0, None, None),
+        ('1', 'grogu', '"poll_timer"', '["ctx"]', '[]', 0, None, None),
+    ]
+    for row_idx, row in enumerate(rows):
+        task_pool.load_db_task_action_timers(row_idx, row)
+    assert db_mgr.db_deletes_map[table] == [
+        {'name': 'foo', 'cycle': '1', 'ctx_key': 'not-json'},
+        {'name': 'grogu', 'cycle': '1', 'ctx_key': '"poll_timer"'},
+    ]
+    db_mgr.db_deletes_map[table].clear()
+
+    # the event timer row is deleted once the timer is removed
+    example_flow.task_events_mgr.remove_event_timer(
+        (('event-handler-00', 'started'), '1', 'foo', 1))
+    db_mgr.put_task_event_timers(example_flow.task_events_mgr)
+    assert db_mgr.db_deletes_map[table] == [
+        {'name': 'foo', 'cycle': '1', 'ctx_key': event_key},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_restart_removed_task(
+    flow: Callable, scheduler: Callable, run: Callable, db_select: Callable,
+    run_dir: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test task pool rows of a task removed from the config are deleted
+    on restart, so they are only reported once."""
+    conf = {
+        'scheduler': {'allow implicit tasks': True},
+        'scheduling': {'graph': {'R1': 'foo & bar'}}
+    }
+    reg = flow(conf)
+    schd: Scheduler = scheduler(reg)
+    async with run(schd):
+        pass
+    assert sorted(db_select(schd, False, 'task_pool', 'name')) == [
+        ('bar',), ('foo',)]
+
+    # remove bar from the config
+    conf['scheduling']['graph']['R1'] = 'foo'
+    (run_dir / reg / WorkflowFiles.FLOW_FILE).write_text(
+        flow_config_str(conf))
+    schd = scheduler(reg)
+    async with run(schd):
+        assert schd.is_restart
+        assert 'ignoring task bar' in caplog.text
+    for table in ('task_pool', 'task_prerequisites', 'task_timeout_timers'):
+        assert not db_select(schd, False, table, name='bar')
+    assert db_select(schd, False, 'task_pool', 'name') == [('foo',)]
+
+    # bar is not reported again on the next restart
+    caplog.clear()
+    schd = scheduler(reg)
+    async with run(schd):
+        assert schd.is_restart
+        assert 'ignoring task bar' not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_prereqs_index(example_flow: Scheduler) -> None:
+    """Test the TaskPool.prereqs_index is used to satisfy absolute triggers.
+    """
+    task_pool = example_flow.pool
+    message = ('foo', '1', 'succeeded')
+    assert message not in task_pool.prereqs_index
+
+    pub_2 = task_pool.spawn_task('pub', IntegerPoint(2), flow_label='a')
+    task_pool.add_to_pool(pub_2)
+    assert task_pool.prereqs_index[message] == {pub_2}
+    assert not pub_2.state.prerequisites_all_satisfied()
+
+    # The absolute output satisfies waiting tasks found via the index.
+    foo_1 = task_pool.get_task('foo', IntegerPoint(1))
+    task_pool.spawn_on_output(foo_1, 'succeeded')
+    assert pub_2.state.prerequisites_all_satisfied()
+
+    task_pool.remove(pub_2)
+    assert message not in task_pool.prereqs_index
+
+
+@pytest.mark.asyncio
+async def test_deadlines(
+    flow: Callable, scheduler: Callable, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test clock-expire and late times are handled when they pass."""
+    caplog.set_level(logging.INFO, CYLC_LOG)
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True,
+            'UTC mode': True
+        },
+        'scheduling': {
+            'initial cycle point': '2000',
+            'special tasks': {
+                'clock-expire': 'foo(PT0S)'
+            },
+            'graph': {
+                'R1': 'foo & bar'
+            }
+        },
+        'runtime': {
+            'bar': {
+                'events': {
+                    'late offset': 'PT1S'
+                }
+            }
+        }
+    })
+    schd: Scheduler = scheduler(reg)
+    await schd.install()
+    await schd.initialise()
+    await schd.configure()
+    bar, foo = sorted(schd.pool.get_tasks(), key=lambda itask: itask.tdef.name)
+    assert schd.deadlines.get_next_due() == foo.get_point_as_seconds()
+
+    schd.deadlines.process()
+    assert foo.state(TASK_STATUS_EXPIRED)
+    assert bar.is_late
+    assert not bar.state(TASK_STATUS_EXPIRED)
+    assert schd.deadlines.get_next_due() is None
+
+    # a removed task's deadlines are discarded
+    schd.pool.add_deadlines(bar)
+    assert schd.deadlines.get_next_due() is None
+    bar.is_late = False
+    schd.pool.add_deadlines(bar)
+    assert schd.deadlines.get_next_due() is not None
+    schd.pool.remove(bar)
+    assert schd.deadlines.get_next_due() is None
@@ -0,0 +1,100 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Test Tui against a running workflow."""
+
+import asyncio
+
+import pytest
+
+from cylc.flow.data_store_mgr import TASK_PROXIES
+from cylc.flow.tui.app import TuiApp
+from cylc.flow.tui.tree import walk_tree
+
+
+async def update(app):
+    """Update the app (which makes blocking requests) in another thread."""
+    return await asyncio.get_running_loop().run_in_executor(None, app.update)
+
+
+async def poll(app, condition, timeout=10):
+    """Update the app until condition() is True."""
+    for _ in range(int(timeout / 0.5)):
+        assert await update(app)
+        if condition():
+            return
+        await asyncio.sleep(0.5)
+    raise Exception('Condition not met')
+
+
+@pytest.mark.asyncio
+async def test_deltas(flow, scheduler, run):
+    """It should patch the tree with deltas published by the workflow."""
+    reg = flow({
+        'scheduling': {
+            'graph': {
+                'R1': 'a => b'
+            }
+        },
+        'runtime': {
+            'FAM': {},
+            'a': {},
+            'b': {'inherit': 'FAM'},
+        }
+    })
+    schd = scheduler(reg, paused_start=True)
+    app = TuiApp(reg)
+    try:
+        async with run(schd):
+            assert await update(app)
+            [task_id] = [
+                id_
+                for id_, task_proxy in (
+                    schd.data_store_mgr.data[schd.id][TASK_PROXIES].items()
+                )
+                if task_proxy.name == 'a'
+            ]
+            task_key = ('task', task_id)
+            assert not app.nodes[task_key]['data']['isHeld']
+
+            # expand the tree and focus on the task
+            tree_walker = app.tree_walker
+            for node in walk_tree(tree_walker.get_focus()[1]):
+                node.get_widget().expanded = True
+                if node.get_value()['id_'] == task_id:
+                    tree_walker.set_focus(node)
+            task_node = app.tree_nodes[task_key]
+            # allow time for the subscription to be established
+            await asyncio.sleep(1)
+
+            # the task should be updated in place
+            schd.command_hold(['1/a'])
+            await poll(
+                app, lambda: app.nodes[task_key]['data']['isHeld'])
+            assert app.tree_walker is tree_walker
+            assert app.tree_nodes[task_key] is task_node
+            assert tree_walker.get_focus()[1] is task_node
+
+            # filtering the tree rebuilds it
+            app.filter_by_task_state('running')
+            assert await update(app)
+            assert app.tree_walker is not tree_walker
+            assert task_key not in app.parents
+
+        # the app should notice that the workflow has stopped
+        await poll(app, lambda: app.data is None)
+        assert app.subscriber is None
+    finally:
+        app.unsubscribe()
@@ -0,0 +1,76 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Test xtriggers in a running scheduler."""
+
+import asyncio
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_xtriggers_queue_tasks(flow, scheduler, run):
+    """Tasks should be released once their xtriggers are satisfied."""
+    reg = flow({
+        'scheduler': {
+            'allow implicit tasks': True,
+            'UTC mode': True,
+        },
+        'scheduling': {
+            'initial cycle point': '2000',
+            'final cycle point': '2000',
+            'xtriggers': {
+                'clock': 'wall_clock(offset=PT1H)',
+                'future': 'wall_clock(offset=P1000Y)',
+            },
+            'graph': {
+                'R1': '''
+                    @clock => foo
+                    @future => bar
+                '''
+            }
+        }
+    })
+    schd = scheduler(reg, paused_start=True)
+    async with run(schd):
+        bar, foo = sorted(schd.pool.get_tasks(), key=lambda t: t.tdef.name)
+        for _ in range(20):
+            if foo.state.xtriggers_all_satisfied():
+                break
+            await asyncio.sleep(0.5)
+        else:
+            raise Exception('foo xtrigger not satisfied')
+        assert foo.state.is_queued or foo.waiting_on_job_prep
+        assert not bar.state.is_queued
+        assert not bar.state.xtriggers_all_satisfied()
+        # only the task still waiting is registered
+        assert list(schd.xtrigger_mgr.task_xtrigs) == [bar]
+
+        assert schd.xtrigger_mgr.sig_refs == {
+            'wall_clock(offset=PT1H)': 1,
+            'wall_clock(offset=P1000Y)': 1,
+        }
+        assert list(schd.xtrigger_mgr.sat_xtrig) == [
+            'wall_clock(offset=PT1H)']
+
+        # removed tasks are forgotten
+        schd.pool.remove(bar)
+        assert not schd.xtrigger_mgr.task_xtrigs
+        assert list(schd.xtrigger_mgr.sig_refs) == ['wall_clock(offset=PT1H)']
+
+        # satisfied xtriggers are deleted when no task needs them
+        schd.pool.remove(foo)
+        assert not schd.xtrigger_mgr.sig_refs
+        assert not schd.xtrigger_mgr.sat_xtrig
@@ -17,6 +17,8 @@
 import unittest
 from datetime import datetime
 
+from metomi.isodatetime.data import CALENDAR, Calendar
+
 from cylc.flow.cycling.iso8601 import init, ISO8601Sequence, ISO8601Point,\
     ISO8601Interval, ingest_time
 
@@ -528,6 +530,82 @@ class TestISO8601Sequence(unittest.TestCase):
             sequence.is_on_sequence(ISO8601Point('20100809T0005')))
 
 
+class TestISO8601Point(unittest.TestCase):
+    """Contains unit tests for the ISO8601Point class."""
+
+    def setUp(self):
+        init(time_zone='Z')
+
+    def test_key(self):
+        """Test comparison and hashing of points via their numeric key."""
+        point = ISO8601Point('20000101T0000Z')
+        other = ISO8601Point('20000101T0500+05')
+        self.assertEqual(point, other)
+        self.assertEqual(hash(point), hash(other))
+        self.assertEqual(point.key, other.key)
+        points = [
+            ISO8601Point(value) for value in (
+                '20000101T0100Z', '19991231T2330Z', '20000101T0000+01',
+                '20000201T0000Z')
+        ]
+        self.assertEqual(
+            [str(point) for point in sorted(points)],
+            ['20000101T0000+01', '19991231T2330Z', '20000101T0100Z',
+             '20000201T0000Z'])
+
+    def test_offset_key(self):
+        """Test fixed offsets set the key of the new point."""
+        point = ISO8601Point('20000101T0000Z')
+        for interval, fixed in (
+            ('PT1H', True), ('-P1D', True), ('P1W', True), ('P1M', False),
+            ('P1Y', False), ('PT1S', False)
+        ):
+            new_point = point + ISO8601Interval(interval)
+            self.assertEqual(new_point._key is not None, fixed)
+            self.assertEqual(new_point.key, ISO8601Point(new_point.value).key)
+
+    def test_offset_key_coarse_dump_format(self):
+        """Test keys agree with the point strings for coarse dump formats."""
+        # (Parsed points are cached regardless of dump format, so use
+        # different points for each.)
+        for dump_format, value, interval, fixed in (
+            ('CCYY-MM', '2010-01', 'P1D', False),
+            ('CCYY-MM', '2010-01', 'P40D', False),
+            ('CCYY-MM-DD', '2011-02-03', 'P1D', True),
+            ('CCYY-MM-DD', '2011-02-03', 'PT1H', False),
+        ):
+            init(custom_dump_format=dump_format, time_zone='Z')
+            try:
+                point = ISO8601Point(value).standardise()
+                new_point = point + ISO8601Interval(interval)
+                self.assertEqual(new_point._key is not None, fixed)
+                self.assertEqual(
+                    new_point.key, ISO8601Point(new_point.value).key)
+                if new_point.value == point.value:
+                    self.assertEqual(new_point, point)
+                    self.assertEqual(hash(new_point), hash(point))
+            finally:
+                init(time_zone='Z')
+
+    def test_key_calendar(self):
+        """Test the key follows the calendar mode."""
+        point = ISO8601Point('20000301T0000Z')
+        other = ISO8601Point('20000228T0000Z')
+        gregorian_diff = point.key[1] - other.key[1]
+        CALENDAR.set_mode('360day')
+        try:
+            self.assertEqual(point.key[1] - other.key[1], 3 * 86400)
+            self.assertEqual(
+                point.key, ISO8601Point('20000228T0000Z').add(
+                    ISO8601Interval('P3D')).key)
+        finally:
+            CALENDAR.set_mode(Calendar.MODE_GREGORIAN)
+        self.assertEqual(gregorian_diff, 2 * 86400)
+        self.assertEqual(
+            point.key[1] - ISO8601Point('19990301T0000Z').key[1],
+            366 * 86400)
+
+
 class TestRelativeCyclePoint(unittest.TestCase):
     """Contains unit tests for cycle point relative to current time."""
 
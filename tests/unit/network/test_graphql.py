@@ -20,7 +20,13 @@ import pytest
 from graphql import parse
 
 from cylc.flow.data_messages_pb2 import PbTaskProxy, PbPrerequisite
-from cylc.flow.network.graphql import AstDocArguments, null_setter, NULL_VALUE
+from cylc.flow.network.graphql import (
+    AstDocArguments,
+    CylcGraphQLBackend,
+    null_setter,
+    NULL_VALUE,
+    parse_and_validate,
+)
 from cylc.flow.network.schema import schema
 
 
@@ -154,3 +160,41 @@ def test_null_setter(pre_result, expected_result):
     """Test the null setting of different data types/results."""
     post_result = null_setter(pre_result)
     assert post_result == expected_result
+
+
+def test_document_cache():
+    """Test parsed and validated documents are cached by request string."""
+    parse_and_validate.cache_clear()
+    backend = CylcGraphQLBackend()
+    query = 'query { workflows { id } }'
+    document = backend.document_from_string(schema, query)
+    assert parse_and_validate.cache_info().misses == 1
+    assert backend.document_from_string(
+        schema, query).document_ast is document.document_ast
+    assert parse_and_validate.cache_info().hits == 1
+
+    # validation errors are cached and reported on execution
+    query = 'query { workflows { foo } }'
+    for _ in range(2):
+        result = backend.document_from_string(schema, query).execute()
+        assert result.invalid
+        assert 'foo' in result.errors[0].message
+    assert parse_and_validate.cache_info().hits == 2
+
+    # syntax errors are raised and not cached
+    for _ in range(2):
+        with pytest.raises(Exception):
+            backend.document_from_string(schema, 'query {')
+    assert parse_and_validate.cache_info().currsize == 2
+
+
+def test_is_mutation_document_cache():
+    """Test requests are only parsed once to route and execute them."""
+    from cylc.flow.network.server import is_mutation
+    parse_and_validate.cache_clear()
+    query = 'mutation { pause (workflows: ["*"]) { result } }'
+    assert is_mutation(
+        {'command': 'graphql', 'args': {'request_string': query}})
+    CylcGraphQLBackend().document_from_string(schema, query)
+    assert parse_and_validate.cache_info().misses == 1
+    assert parse_and_validate.cache_info().hits == 1
@@ -22,7 +22,9 @@ import pytest
 
 from cylc.flow.async_util import (
     pipe,
-    asyncqgen
+    asyncqgen,
+    WakeUp,
+    WakeUpQueue
 )
 
 LOG = logging.getLogger('test')
@@ -245,3 +247,15 @@ async def test_asyncqgen():
         ret.append(item)
 
     assert ret == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_wake_up_queue():
+    """It should wake a waiting coroutine when items are put from a thread."""
+    wake_up = WakeUp()
+    queue = WakeUpQueue(wake_up)
+    loop = asyncio.get_running_loop()
+    loop.call_later(0.05, loop.run_in_executor, None, queue.put, 1)
+    assert await wake_up.wait(10)
+    assert queue.get(block=False) == 1
+    assert not await wake_up.wait(0.01)
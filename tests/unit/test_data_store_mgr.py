@@ -24,7 +24,12 @@ from cylc.flow.data_store_mgr import (
     WORKFLOW,
     DELTAS_MAP,
     ALL_DELTAS,
-    DATA_TEMPLATE
+    DATA_TEMPLATE,
+    TASKS,
+    TASK_PROXIES,
+    NodeIndexes,
+    generate_checksum,
+    serialize_all_deltas,
 )
 
 
@@ -84,3 +89,99 @@ def test_apply_delta():
 
     assert data[WORKFLOW].id == w_id
     assert data[WORKFLOW].pruned is True
+
+
+def test_apply_delta_checksum():
+    """Test apply_delta maintains the checksum of the data-store."""
+    data = deepcopy(DATA_TEMPLATE)
+    checksums = {}
+
+    def check():
+        assert checksums[TASKS] == generate_checksum(
+            e.stamp for e in data[TASKS].values())
+
+    delta = DELTAS_MAP[TASKS]()
+    for name in ('foo', 'bar', 'baz'):
+        delta.added.add(id=name, stamp=f'{name}@1')
+    apply_delta(TASKS, delta, data, checksums)
+    check()
+
+    delta = DELTAS_MAP[TASKS]()
+    delta.updated.add(id='foo', stamp='foo@2')
+    delta.updated.add(id='bar', name='bar')
+    delta.added.add(id='baz', stamp='baz@2')
+    delta.pruned.append('bar')
+    apply_delta(TASKS, delta, data, checksums)
+    check()
+    assert checksums[TASKS] == generate_checksum(['baz@2', 'foo@2'])
+
+    delta = DELTAS_MAP[TASKS]()
+    delta.pruned.extend(['foo', 'baz'])
+    apply_delta(TASKS, delta, data, checksums)
+    assert checksums[TASKS] == 0
+
+
+def test_apply_delta_indexes():
+    """Test apply_delta maintains the indexes of the data-store."""
+    data = deepcopy(DATA_TEMPLATE)
+    indexes = NodeIndexes()
+
+    def get(field, value):
+        return indexes.get(TASK_PROXIES, field, value)
+
+    delta = DELTAS_MAP[TASKS]()
+    delta.added.add(id='foo', proxies=['1/foo', '2/foo'])
+    apply_delta(TASKS, delta, data, indexes=indexes)
+    delta = DELTAS_MAP[TASK_PROXIES]()
+    for point in ('1', '2'):
+        delta.added.add(
+            id=f'{point}/foo',
+            task='foo',
+            name='foo',
+            namespace=['foo', 'root'],
+            cycle_point=point,
+            state='waiting'
+        )
+    apply_delta(TASK_PROXIES, delta, data, indexes=indexes)
+    assert get('state', 'waiting') == {'1/foo', '2/foo'}
+    assert get('cycle_point', '1') == {'1/foo'}
+    assert get('namespace', 'root') == {'1/foo', '2/foo'}
+    assert get('is_held', False) == {'1/foo', '2/foo'}
+
+    # copies are left unchanged when the indexes are updated
+    old_indexes = indexes
+    indexes = indexes.copy()
+    delta = DELTAS_MAP[TASK_PROXIES]()
+    delta.updated.add(id='1/foo', state='running', is_held=True)
+    apply_delta(TASK_PROXIES, delta, data, indexes=indexes)
+    assert get('state', 'waiting') == {'2/foo'}
+    assert get('state', 'running') == {'1/foo'}
+    assert get('is_held', True) == {'1/foo'}
+    assert get('cycle_point', '1') == {'1/foo'}
+    assert old_indexes.get(TASK_PROXIES, 'state', 'waiting') == {
+        '1/foo', '2/foo'}
+    assert not old_indexes.get(TASK_PROXIES, 'state', 'running')
+
+    delta = DELTAS_MAP[TASK_PROXIES]()
+    delta.pruned.append('2/foo')
+    apply_delta(TASK_PROXIES, delta, data, indexes=indexes)
+    assert not get('state', 'waiting')
+    assert not get('cycle_point', '2')
+    assert get('namespace', 'root') == {'1/foo'}
+    assert 'waiting' not in indexes.indexes[TASK_PROXIES]['state']
+
+
+def test_serialize_all_deltas():
+    """Test AllDeltas serialization from serialized deltas."""
+    all_deltas = DELTAS_MAP[ALL_DELTAS]()
+    all_deltas.workflow.updated.id = 'workflow_id'
+    all_deltas.tasks.pruned.append('foo')
+    for ind in range(200):
+        # large enough to need a multi-byte length
+        all_deltas.task_proxies.added.add(id=f'{ind}/foo', stamp='x' * 100)
+    serialized = serialize_all_deltas([
+        (key, getattr(all_deltas, key).SerializeToString())
+        for key in (WORKFLOW, TASKS, TASK_PROXIES)
+    ])
+    assert DELTAS_MAP[ALL_DELTAS].FromString(serialized) == all_deltas
+    assert serialize_all_deltas([]) == b''
@@ -176,6 +176,32 @@ def test_similar_but_not_exact_match():
         platform_from_name('vld1', PLATFORMS_WITH_RE)
 
 
+def test_platform_from_name_cache(mock_glbl_cfg):
+    """Platforms from the global config are cached until it is reloaded."""
+    global_config = r'''
+        [platforms]
+            [[foo, bar]]
+                hosts = foo1, foo2
+            [[baz\d]]
+    '''
+    mock_glbl_cfg('cylc.flow.platforms.glbl_cfg', global_config)
+    foo = platform_from_name('foo')
+    assert foo['name'] == 'foo'
+    assert platform_from_name('foo') is foo
+    assert platform_from_name('bar') is not foo
+    assert platform_from_name('baz1')['hosts'] == ['baz1']
+    with pytest.raises(PlatformLookupError):
+        platform_from_name('baz')
+
+    # explicitly passed platforms are not cached
+    assert platform_from_name('foo', {'foo': {}}) is not foo
+
+    # a new global config invalidates the cache
+    mock_glbl_cfg('cylc.flow.platforms.glbl_cfg', global_config)
+    assert platform_from_name('foo') is not foo
+    assert platform_from_name('foo') == foo
+
+
 # ----------------------------------------------------------------------------
 # Tests of platform_from_job_info
 # ----------------------------------------------------------------------------
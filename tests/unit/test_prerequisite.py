@@ -0,0 +1,85 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from itertools import product
+
+import pytest
+
+from cylc.flow.cycling.integer import IntegerPoint
+from cylc.flow.exceptions import TriggerExpressionError
+from cylc.flow.prerequisite import Prerequisite
+
+
+@pytest.mark.parametrize(
+    'expr',
+    [
+        'a | b',
+        'a & b | c',
+        'a | b & c',
+        'a & (b | c)',
+        '(a | b) & (c | d)',
+        'a | (b & (c | d)) & e',
+    ]
+)
+def test_conditional(expr):
+    """Compiled conditional expressions should evaluate like Python."""
+    names = sorted({char for char in expr if char.isalpha()})
+    prereq = Prerequisite(IntegerPoint('1'))
+    for name in names:
+        prereq.add(name, '1', 'succeeded')
+    prereq.set_condition(
+        ''.join(
+            f'{char}.1 succeeded' if char.isalpha() else char
+            for char in expr.replace(' ', '')
+        )
+    )
+    for values in product((False, True), repeat=len(names)):
+        prereq.set_not_satisfied()
+        prereq.satisfy_me({
+            (name, '1', 'succeeded')
+            for name, value in zip(names, values)
+            if value
+        })
+        # (bitwise operators have the same precedence as the graph ones)
+        expected = bool(eval(  # nosec
+            expr, {}, dict(zip(names, values))))
+        assert prereq.is_satisfied() == expected, values
+
+
+def test_conditional_xtrigger():
+    """Invalid conditional expressions should fail on evaluation."""
+    prereq = Prerequisite(IntegerPoint('1'))
+    prereq.add('a', '1', 'succeeded')
+    prereq.set_condition('@wall_clock|a.1 succeeded')
+    with pytest.raises(TriggerExpressionError, match='@wall_clock'):
+        prereq.is_satisfied()
+
+
+@pytest.mark.parametrize(
+    'expr, match',
+    [
+        ('(a.1 succeeded|b.1 succeeded', 'unmatched parentheses'),
+        ('a.1 succeeded||b.1 succeeded', 'missing operand before |'),
+    ]
+)
+def test_conditional_error(expr, match):
+    """Compile errors should be reported on evaluation."""
+    prereq = Prerequisite(IntegerPoint('1'))
+    prereq.add('a', '1', 'succeeded')
+    prereq.add('b', '1', 'succeeded')
+    prereq.set_condition(expr)
+    with pytest.raises(TriggerExpressionError, match=match):
+        prereq.is_satisfied()
@@ -124,3 +124,75 @@ def test_remove_columns():
         conn = dao.connect()
         data = [row for row in conn.execute(r'SELECT * from foo')]
         assert data == [('PUB',)]
+
+
+def test_execute_batches(tmp_path):
+    """Test batches are executed in order in a single transaction."""
+    dao = CylcWorkflowDAO(str(tmp_path / 'db'))
+    table = CylcWorkflowDAO.TABLE_WORKFLOW_PARAMS
+    assert dao.execute_batches([
+        ([], [(table, {'key': 'a', 'value': '1'})], []),
+        (
+            [(table, {'key': 'a'})],
+            [(table, {'key': 'b', 'value': '2'})],
+            [(table, {'value': '3'}, {'key': 'b'})],
+        ),
+    ])
+    conn = dao.connect()
+    assert list(conn.execute(f'SELECT key, value FROM {table}')) == [
+        ('b', '3')]
+    dao.close()
+
+    # a failed batch rolls back the whole transaction
+    dao.is_public = True
+    assert not dao.execute_batches([
+        ([], [(table, {'key': 'c', 'value': '4'})], []),
+        ([], [], [(table, {'no_such_column': '5'}, {'key': 'c'})]),
+    ])
+    assert dao.n_tries == 1
+    conn = dao.connect()
+    assert list(conn.execute(f'SELECT key, value FROM {table}')) == [
+        ('b', '3')]
+    dao.close()
+
+
+def test_create_tables_indexes(tmp_path):
+    """Test secondary indexes are created, including in old databases."""
+    db_file = str(tmp_path / 'db')
+    dao = CylcWorkflowDAO(db_file)
+    conn = dao.connect()
+
+    def get_indexes():
+        return {
+            name for name, in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type=='index'"
+                " AND sql IS NOT NULL"
+            )
+        }
+
+    assert get_indexes() == set(CylcWorkflowDAO.INDEXES)
+    for index_name in CylcWorkflowDAO.INDEXES:
+        conn.execute(f'DROP INDEX {index_name}')
+    conn.commit()
+    assert get_indexes() == set()
+    dao.create_tables()
+    assert get_indexes() == set(CylcWorkflowDAO.INDEXES)
+    dao.close()
+
+
+def test_pragmas(tmp_path):
+    """Test SQLite PRAGMAs are applied to connections."""
+    dao = CylcWorkflowDAO(
+        str(tmp_path / 'db'),
+        pragmas={'journal_mode': 'wal', 'cache_size': -4000}
+    )
+    conn = dao.connect()
+    assert conn.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+    assert conn.execute('PRAGMA cache_size').fetchone() == (-4000,)
+    # the connection is kept open after writes in WAL mode
+    dao.add_insert_item(
+        CylcWorkflowDAO.TABLE_WORKFLOW_PARAMS, {'key': 'a', 'value': 'b'})
+    dao.execute_queued_items()
+    assert dao.conn is conn
+    dao.checkpoint()
+    dao.close()
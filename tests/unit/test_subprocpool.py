@@ -18,6 +18,10 @@ from tempfile import (
     NamedTemporaryFile, SpooledTemporaryFile, TemporaryFile,
     TemporaryDirectory
 )
+import asyncio
+import json
+import subprocess
+import sys
 import unittest
 import pytest
 
@@ -25,9 +29,15 @@ from pathlib import Path
 from types import SimpleNamespace
 
 from cylc.flow import LOG
+from cylc.flow.async_util import WakeUp
 from cylc.flow.task_events_mgr import TaskJobLogsRetrieveContext
-from cylc.flow.subprocctx import SubProcContext
-from cylc.flow.subprocpool import SubProcPool, _XTRIG_FUNCS, get_func
+from cylc.flow.subprocctx import SubFuncContext, SubProcContext
+from cylc.flow.subprocpool import (
+    FunctionPool,
+    SubProcPool,
+    _XTRIG_FUNCS,
+    get_func,
+)
 
 
 class TestSubProcPool(unittest.TestCase):
@@ -348,3 +358,136 @@ def test_rsync_255_fail(mock_ctx, expect, ctx_kwargs):
         {'ssh command': 'ssh'}
     )
     assert output == expect
+
+
+@pytest.fixture
+def func_pool(mock_glbl_cfg, tmp_path):
+    """A FunctionPool which can import functions from tmp_path/lib/python."""
+    mock_glbl_cfg(
+        'cylc.flow.subprocpool.glbl_cfg',
+        '''
+        [scheduler]
+            in-process xtriggers = in_process_sync, in_process_async
+        '''
+    )
+    python_dir = tmp_path / 'lib' / 'python'
+    python_dir.mkdir(parents=True)
+    (python_dir / 'in_process_sync.py').write_text(
+        'import time\n'
+        'def in_process_sync(delay, result=True):\n'
+        '    time.sleep(delay)\n'
+        '    if result is None:\n'
+        '        raise ValueError("no result")\n'
+        '    return result, {"delay": delay}\n'
+    )
+    (python_dir / 'in_process_async.py').write_text(
+        'import asyncio\n'
+        'async def in_process_async(delay):\n'
+        '    await asyncio.sleep(delay)\n'
+        '    return True, {"delay": delay}\n'
+    )
+    pool = FunctionPool(str(tmp_path))
+    pool.proc_pool_timeout = 0.5
+    yield pool
+    pool.terminate()
+    _XTRIG_FUNCS.pop('in_process_sync', None)
+    _XTRIG_FUNCS.pop('in_process_async', None)
+
+
+async def _run_func_pool(pool, *ctxs):
+    """Call functions in the pool and return their contexts when done."""
+    done = []
+    for ctx in ctxs:
+        ctx.update_command('')
+        pool.put_command(ctx, callback=done.append)
+    while pool.is_not_done():
+        await asyncio.sleep(0.05)
+        pool.process()
+    assert sorted(done, key=id) == sorted(ctxs, key=id)
+    return ctxs
+
+
+def test_function_pool_is_in_process(func_pool):
+    """It should only call functions listed in the global config."""
+    assert func_pool.is_in_process('in_process_sync')
+    assert not func_pool.is_in_process('xrandom')
+
+
+@pytest.mark.asyncio
+async def test_function_pool(func_pool):
+    """It should call sync and async functions like "cylc function-run"."""
+    ctx_sync, ctx_async = await _run_func_pool(
+        func_pool,
+        SubFuncContext('a', 'in_process_sync', [0.1], {}),
+        SubFuncContext('b', 'in_process_async', [0.1], {}),
+    )
+    for ctx in (ctx_sync, ctx_async):
+        assert ctx.ret_code == 0
+        assert json.loads(ctx.out) == [True, {'delay': 0.1}]
+        assert ctx.err is None
+
+
+@pytest.mark.asyncio
+async def test_function_pool_errors(func_pool):
+    """It should report function failures and timeouts."""
+    ctx_error, ctx_timeout, ctx_missing = await _run_func_pool(
+        func_pool,
+        SubFuncContext('a', 'in_process_sync', [0], {'result': None}),
+        SubFuncContext('b', 'in_process_async', [10], {}),
+        SubFuncContext('c', 'in_process_missing', [], {}),
+    )
+    assert ctx_error.ret_code == 1
+    assert 'ValueError: no result' in ctx_error.err
+    assert ctx_timeout.ret_code == 1
+    assert ctx_timeout.err == 'killed on timeout (0.5)'
+    assert ctx_missing.ret_code == 1
+    assert 'in_process_missing' in ctx_missing.err
+    for ctx in (ctx_error, ctx_timeout, ctx_missing):
+        assert ctx.out is None
+
+
+@pytest.mark.asyncio
+async def test_function_pool_wake_up(func_pool):
+    """It should call wake_up when a function call is done."""
+    func_pool.wake_up = WakeUp()
+    ctx = SubFuncContext('a', 'in_process_async', [0.05], {})
+    ctx.update_command('')
+    func_pool.put_command(ctx)
+    assert await func_pool.wake_up.wait(10)
+    assert not func_pool.wake_up.event.is_set()
+    func_pool.process()
+    assert ctx.ret_code == 0
+
+
+def test_function_pool_exit():
+    """It should not stop the process exiting if a function call hangs."""
+    proc = subprocess.run(  # nosec
+        [
+            sys.executable, '-c',
+            'import time\n'
+            'from cylc.flow.subprocpool import _DaemonThreadPoolExecutor\n'
+            'executor = _DaemonThreadPoolExecutor(2, "xtrigger")\n'
+            'executor.submit(time.sleep, 60)\n'
+            'assert executor.submit(sum, [1, 2]).result() == 3\n'
+            'executor.shutdown(wait=False)\n'
+        ],
+        timeout=30
+    )
+    assert proc.returncode == 0
+
+
+@pytest.mark.asyncio
+async def test_function_pool_terminate(func_pool):
+    """It should cancel running calls and refuse new ones on terminate."""
+    done = []
+    ctx = SubFuncContext('a', 'in_process_async', [10], {})
+    func_pool.put_command(ctx, callback=done.append)
+    assert func_pool.is_not_done() is True
+    func_pool.terminate()
+    assert done == [ctx]
+    assert ctx.ret_code == func_pool.RET_CODE_WORKFLOW_STOPPING
+    assert func_pool.is_not_done() is False
+    ctx = SubFuncContext('b', 'in_process_async', [0], {})
+    func_pool.put_command(ctx, callback=done.append)
+    assert done[-1] is ctx
+    assert ctx.ret_code == func_pool.RET_CODE_WORKFLOW_STOPPING
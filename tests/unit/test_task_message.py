@@ -0,0 +1,159 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+from time import sleep, time
+
+import pytest
+
+from cylc.flow import task_message
+from cylc.flow.task_message import (
+    BATCH_SENDER_SUFFIX,
+    BATCH_SUFFIX,
+    batch_messages,
+    record_messages,
+    take_batch,
+)
+
+
+TASK_JOB = '1/foo/01'
+
+
+@pytest.fixture
+def job_log(tmp_path, monkeypatch):
+    """Set up a job log and capture the messages sent to the workflow."""
+    job_log_name = str(tmp_path / 'job')
+    monkeypatch.setenv('CYLC_TASK_LOG_ROOT', job_log_name)
+    monkeypatch.delenv('CYLC_TASK_COMMS_METHOD', raising=False)
+    monkeypatch.setattr(task_message, 'sleep', lambda _: None)
+    sent = []
+    monkeypatch.setattr(
+        task_message,
+        'send_batch',
+        lambda workflow, task_job, batch: sent.append(batch)
+    )
+    return job_log_name, sent
+
+
+@pytest.fixture
+def senders(monkeypatch):
+    """Record batch senders instead of starting them.
+
+    Call task_message._send_batch_later to act as the sender would.
+    """
+    spawned = []
+
+    def _spawn_batch_sender(workflow, task_job, batch_window):
+        spawned.append((workflow, task_job, batch_window))
+        # (this process is alive, so stands in for the sender)
+        return os.getpid()
+
+    monkeypatch.setattr(
+        task_message, '_spawn_batch_sender', _spawn_batch_sender)
+    return spawned
+
+
+def test_batch_messages(job_log, senders):
+    """Test messages are sent together by the first process to batch them."""
+    job_log_name, sent = job_log
+    sender_file_name = job_log_name + BATCH_SUFFIX + BATCH_SENDER_SUFFIX
+
+    # another process is waiting to send the batch
+    with open(sender_file_name, 'w') as handle:
+        handle.write(str(os.getppid()))
+    batch_messages('foo', TASK_JOB, [['INFO', 'a']], 'T1', 0.1)
+    batch_messages('foo', TASK_JOB, [['INFO', 'b'], ['WARNING', 'c']], 'T2', 1)
+    assert not sent
+    assert take_batch('foo', TASK_JOB) == [
+        ('T1', 'INFO', 'a'),
+        ('T2', 'INFO', 'b'),
+        ('T2', 'WARNING', 'c'),
+    ]
+    assert take_batch('foo', TASK_JOB) == []
+    assert not os.path.exists(sender_file_name)
+
+    # this process starts a sender, which sends the batch
+    batch_messages('foo', TASK_JOB, [['INFO', 'd']], 'T3', 0.1)
+    assert not sent
+    assert senders == [('foo', TASK_JOB, 0.1)]
+    with open(sender_file_name) as handle:
+        assert handle.read() == str(os.getpid())
+    task_message._send_batch_later(*senders.pop())
+    assert sent == [[('T3', 'INFO', 'd')]]
+    assert not os.path.exists(sender_file_name)
+
+
+def test_batch_messages_sequential(job_log, senders):
+    """Test sequential calls from a job return at once and are batched."""
+    _, sent = job_log
+    for i in range(3):
+        batch_messages('foo', TASK_JOB, [['INFO', str(i)]], f'T{i}', 0.5)
+    assert len(senders) == 1
+    task_message._send_batch_later(*senders.pop())
+    assert sent == [[('T0', 'INFO', '0'), ('T1', 'INFO', '1'),
+                     ('T2', 'INFO', '2')]]
+
+
+def test_batch_messages_sender_process(job_log, monkeypatch, tmp_path):
+    """Test the batch is sent by a detached process after the window."""
+    sent_file_name = tmp_path / 'sent'
+
+    def send_batch(workflow, task_job, batch):
+        # (runs in the sender process)
+        (tmp_path / 'sending').write_text(json.dumps(batch))
+        (tmp_path / 'sending').rename(sent_file_name)
+
+    monkeypatch.setattr(task_message, 'sleep', sleep)
+    monkeypatch.setattr(task_message, 'send_batch', send_batch)
+    start = time()
+    for i in range(3):
+        batch_messages('foo', TASK_JOB, [['INFO', str(i)]], f'T{i}', 1)
+    # the callers did not wait for the batch window
+    assert time() - start < 1
+    for _ in range(50):
+        if sent_file_name.exists():
+            break
+        sleep(0.1)
+    assert json.loads(sent_file_name.read_text()) == [
+        ['T0', 'INFO', '0'], ['T1', 'INFO', '1'], ['T2', 'INFO', '2']]
+
+
+def test_batch_messages_dead_sender(job_log, senders):
+    """Test a batch is sent if the process which should send it has died."""
+    job_log_name, sent = job_log
+    with open(job_log_name + BATCH_SUFFIX + BATCH_SENDER_SUFFIX, 'w') as hnd:
+        hnd.write('not-a-pid')
+    batch_messages('foo', TASK_JOB, [['INFO', 'a']], 'T1', 0.1)
+    task_message._send_batch_later(*senders.pop())
+    assert sent == [[('T1', 'INFO', 'a')]]
+
+
+def test_record_messages_sends_batch(job_log, capsys):
+    """Test batched messages are sent before messages which are not."""
+    job_log_name, sent = job_log
+    with open(job_log_name + BATCH_SUFFIX + BATCH_SENDER_SUFFIX, 'w') as hnd:
+        hnd.write(str(os.getppid()))
+    record_messages('foo', TASK_JOB, [['INFO', 'a']], batch_window=1)
+    record_messages('foo', TASK_JOB, [['INFO', 'succeeded']])
+    assert [
+        (severity, message) for batch in sent
+        for _, severity, message in batch
+    ] == [('INFO', 'a'), ('INFO', 'succeeded')]
+    # all messages are written to the job status file and stdout at once
+    with open(job_log_name + '.status') as status_file:
+        assert 'INFO|a' in status_file.read()
+    assert 'INFO - a' in capsys.readouterr().out
@@ -0,0 +1,70 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from cylc.flow.rundb import CylcWorkflowDAO
+from cylc.flow.workflow_db_mgr import PublicDatabaseWriter
+
+
+TABLE = CylcWorkflowDAO.TABLE_WORKFLOW_PARAMS
+
+
+def select_params(dao):
+    conn = dao.connect()
+    ret = list(conn.execute(f'SELECT key, value FROM {TABLE} ORDER BY key'))
+    dao.close()
+    return ret
+
+
+def test_public_database_writer_coalesce(tmp_path):
+    """Superseded updates in pending batches should be discarded."""
+    dao = CylcWorkflowDAO(str(tmp_path / 'db'))
+    dao.is_public = True
+    writer = PublicDatabaseWriter(dao)
+    writer.put([], [(TABLE, {'key': 'a', 'value': '0'})], [])
+    for value in ('1', '2', '3'):
+        writer.put([], [], [(TABLE, {'value': value}, {'key': 'a'})])
+    writer.put([], [], [(TABLE, {'value': 'x'}, {'key': 'b'})])
+    # (thread not started yet so nothing has been written)
+    updates = [
+        list(batch_updates.values())
+        for _, _, _, batch_updates in writer._pending
+    ]
+    assert updates == [
+        [],
+        [],
+        [],
+        [(TABLE, {'value': '3'}, {'key': 'a'})],
+        [(TABLE, {'value': 'x'}, {'key': 'b'})],
+    ]
+    assert writer.lag > 0
+
+    writer.start()
+    assert writer.flush(timeout=10)
+    assert writer.lag == 0
+    assert select_params(dao) == [('a', '3')]
+    assert writer.stop()
+
+
+def test_public_database_writer_stop(tmp_path):
+    """Stopping the writer should flush pending batches."""
+    dao = CylcWorkflowDAO(str(tmp_path / 'db'))
+    dao.is_public = True
+    writer = PublicDatabaseWriter(dao)
+    writer.start()
+    for key in 'abc':
+        writer.put([], [(TABLE, {'key': key, 'value': key})], [])
+    assert writer.stop()
+    assert select_params(dao) == [('a', 'a'), ('b', 'b'), ('c', 'c')]
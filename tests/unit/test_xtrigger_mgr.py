@@ -14,6 +14,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from unittest.mock import Mock
+
 import pytest
 
 from cylc.flow.cycling.iso8601 import ISO8601Point, ISO8601Sequence, init
@@ -114,7 +116,7 @@ def test_housekeeping_nothing_satisfied(xtrigger_mgr):
     # now XtriggerManager#sat_xtrigger will contain the get_name xtrigger
     xtrigger_mgr.load_xtrigger_for_restart(row_idx=0, row=row)
     assert xtrigger_mgr.sat_xtrig
-    xtrigger_mgr.housekeep([])
+    xtrigger_mgr.housekeep()
     assert not xtrigger_mgr.sat_xtrig
 
 
@@ -143,18 +145,70 @@ def test_housekeeping_with_xtrigger_satisfied(xtrigger_mgr):
     start_point = ISO8601Point('2019')
     itask = TaskProxy(
         tdef, start_point, FlowLabelMgr().get_new_label())
+    xtrigger_mgr.ref_task(itask)
     # pretend the function has been activated
     xtrigger_mgr.active.append(xtrig.get_signature())
     xtrigger_mgr.callback(xtrig)
     assert xtrigger_mgr.sat_xtrig
-    xtrigger_mgr.housekeep([itask])
+    xtrigger_mgr.housekeep()
     # here we still have the same number as before
     assert xtrigger_mgr.sat_xtrig
 
 
+def test_housekeeping_ref_counts(xtrigger_mgr):
+    """Satisfied xtriggers are deleted when no task in the pool has them."""
+    xtrigger_mgr.validate_xtrigger = lambda *a, **k: True  # Ignore validation
+    xtrigger_mgr.add_trig(
+        "echo", SubFuncContext("echo", "echo", [], {}), "fdir")
+    xtrigger_mgr.add_trig(
+        "point", SubFuncContext("point", "echo", ["%(point)s"], {}), "fdir")
+    itask1 = _make_itask(["echo", "point"], point='2019')
+    itask2 = _make_itask(["echo", "point"], point='2020')
+    xtrigger_mgr.ref_task(itask1)
+    xtrigger_mgr.ref_task(itask2)
+    # counting a task again does not change anything
+    xtrigger_mgr.ref_task(itask2)
+    assert xtrigger_mgr.sig_refs == {
+        'echo()': 2,
+        'echo(2019)': 1,
+        'echo(2020)': 1,
+    }
+    for sig in xtrigger_mgr.sig_refs:
+        xtrigger_mgr.sat_xtrig[sig] = {}
+
+    xtrigger_mgr.unref_task(itask1)
+    assert set(xtrigger_mgr.sat_xtrig) == {
+        'echo()', 'echo(2020)'}
+    xtrigger_mgr.unref_task(itask2)
+    assert not xtrigger_mgr.sat_xtrig
+    assert not xtrigger_mgr.sig_refs
+    assert not xtrigger_mgr.task_sigs
+
+
+def _make_itask(xtrig_labels, point='2019'):
+    """Return a waiting task proxy, released from the runahead pool."""
+    tdef = TaskDef(
+        name="foo",
+        rtcfg=None,
+        run_mode="live",
+        start_point=1,
+        initial_point=1
+    )
+    init()
+    sequence = ISO8601Sequence('P1D', '2000')
+    tdef.xtrig_labels[sequence] = xtrig_labels
+    itask = TaskProxy(
+        tdef, ISO8601Point(point), FlowLabelMgr().get_new_label())
+    itask.state.reset(is_runahead=False)
+    return itask
+
+
 def test__call_xtriggers_async(xtrigger_mgr):
     """Test _call_xtriggers_async"""
     xtrigger_mgr.validate_xtrigger = lambda *a, **k: True  # Ignore validation
+    calls = []
+    xtrigger_mgr.proc_pool = Mock(
+        put_command=lambda ctx, **k: calls.append(ctx.label))
     # the echo1 xtrig (not satisfied)
     echo1_xtrig = SubFuncContext(
         label="echo1",
@@ -175,36 +229,29 @@ def test__call_xtriggers_async(xtrigger_mgr):
     echo2_xtrig.out = "[\"True\", {\"name\": \"herminia\"}]"
     xtrigger_mgr.add_trig("echo2", echo2_xtrig, "fdir")
     # create a task
-    tdef = TaskDef(
-        name="foo",
-        rtcfg=None,
-        run_mode="live",
-        start_point=1,
-        initial_point=1
-    )
-    init()
-    sequence = ISO8601Sequence('P1D', '2000')
-    tdef.xtrig_labels[sequence] = ["echo1", "echo2"]
-    # cycle point for task proxy
-    init()
-    start_point = ISO8601Point('2019')
-    # create task proxy
-    itask = TaskProxy(
-        tdef, start_point, FlowLabelMgr().get_new_label())
+    itask = _make_itask(["echo1", "echo2"])
 
     # we start with no satisfied xtriggers, and nothing active
     assert len(xtrigger_mgr.sat_xtrig) == 0
     assert len(xtrigger_mgr.active) == 0
 
+    # nothing is called until the task is registered
+    assert xtrigger_mgr.call_xtriggers_async() == []
+    assert len(xtrigger_mgr.active) == 0
+    xtrigger_mgr.ref_task(itask)
+    xtrigger_mgr.add_task(itask)
+
     # after calling the first time, we get two active
-    xtrigger_mgr.call_xtriggers_async(itask)
+    assert xtrigger_mgr.call_xtriggers_async() == []
     assert len(xtrigger_mgr.sat_xtrig) == 0
     assert len(xtrigger_mgr.active) == 2
+    assert sorted(calls) == ["echo1", "echo2"]
 
     # calling again does not change anything
-    xtrigger_mgr.call_xtriggers_async(itask)
+    assert xtrigger_mgr.call_xtriggers_async() == []
     assert len(xtrigger_mgr.sat_xtrig) == 0
     assert len(xtrigger_mgr.active) == 2
+    assert len(calls) == 2
 
     # now we call callback manually as the proc_pool we passed is a mock
     # then both should be satisfied
@@ -214,10 +261,110 @@ def test__call_xtriggers_async(xtrigger_mgr):
     assert len(xtrigger_mgr.sat_xtrig) == 2
     assert len(xtrigger_mgr.active) == 0
 
+    # the task is updated on the next call
+    assert not itask.state.xtriggers_all_satisfied()
+    assert xtrigger_mgr.call_xtriggers_async() == [itask]
+    assert itask.state.xtriggers_all_satisfied()
+
     # calling satisfy_xtriggers again still does not change anything
-    xtrigger_mgr.call_xtriggers_async(itask)
+    assert xtrigger_mgr.call_xtriggers_async() == []
     assert len(xtrigger_mgr.sat_xtrig) == 2
     assert len(xtrigger_mgr.active) == 0
+    assert len(calls) == 2
+
+    # a new task waiting on the same xtriggers is satisfied without a call
+    itask2 = _make_itask(["echo1", "echo2"], point='2020')
+    xtrigger_mgr.add_task(itask2)
+    assert xtrigger_mgr.call_xtriggers_async() == [itask2]
+    assert len(calls) == 2
+
+
+def test_call_xtriggers_async_due(xtrigger_mgr, monkeypatch):
+    """Test xtriggers are only called when due, and only for waiting tasks."""
+    xtrigger_mgr.validate_xtrigger = lambda *a, **k: True  # Ignore validation
+    now = 1000.0
+    monkeypatch.setattr('cylc.flow.xtrigger_mgr.time', lambda: now)
+    calls = []
+    xtrigger_mgr.proc_pool = Mock(
+        put_command=lambda ctx, **k: calls.append(ctx))
+    xtrigger_mgr.add_trig(
+        "echo", SubFuncContext("echo", "echo", [], {}, 30), "fdir")
+    itask = _make_itask(["echo"])
+    xtrigger_mgr.add_task(itask)
+    xtrigger_mgr.call_xtriggers_async()
+    assert len(calls) == 1
+
+    # not satisfied: called again once the interval is up
+    calls[0].out = "[false, {}]"
+    xtrigger_mgr.callback(calls[0])
+    now += 20
+    xtrigger_mgr.call_xtriggers_async()
+    assert len(calls) == 1
+    now += 10
+    xtrigger_mgr.call_xtriggers_async()
+    assert len(calls) == 2
+    # (each call gets a fresh context)
+    assert calls[1] is not calls[0]
+
+    # not called again if no task is waiting on it
+    calls[1].out = "[false, {}]"
+    xtrigger_mgr.callback(calls[1])
+    itask.state.reset(is_queued=True)
+    now += 30
+    xtrigger_mgr.call_xtriggers_async()
+    assert len(calls) == 2
+    assert not xtrigger_mgr.task_xtrigs
+    assert not xtrigger_mgr.xtrig_tasks
+
+    # removed tasks are forgotten
+    itask = _make_itask(["echo"])
+    xtrigger_mgr.add_task(itask)
+    xtrigger_mgr.remove_task(itask)
+    xtrigger_mgr.call_xtriggers_async()
+    assert len(calls) == 2
+
+
+def test_call_xtriggers_async_wall_clock(xtrigger_mgr):
+    """Test clock triggers are satisfied when due."""
+    xtrigger_mgr.validate_xtrigger = lambda *a, **k: True  # Ignore validation
+    xtrigger_mgr.add_trig(
+        "clock",
+        SubFuncContext("clock", "wall_clock", [], {"offset": "PT1H"}),
+        "fdir"
+    )
+    itask = _make_itask(["clock"])
+    trigger_time = itask.get_point_as_seconds() + 3600
+    xtrigger_mgr.add_task(itask)
+    assert xtrigger_mgr.deadlines.get_next_due() == trigger_time
+    xtrigger_mgr.deadlines.process(now=trigger_time)
+    assert xtrigger_mgr.call_xtriggers_async() == []
+    assert not itask.state.xtriggers_all_satisfied()
+    xtrigger_mgr.deadlines.process(now=trigger_time + 1)
+    assert xtrigger_mgr.call_xtriggers_async() == [itask]
+    assert itask.state.xtriggers_all_satisfied()
+    assert xtrigger_mgr.deadlines.get_next_due() is None
+
+
+def test_call_xtriggers_async_in_process(xtrigger_mgr):
+    """Test trusted functions are called via the function pool."""
+    xtrigger_mgr.validate_xtrigger = lambda *a, **k: True  # Ignore validation
+    proc_pool_calls = []
+    func_pool_calls = []
+    xtrigger_mgr.proc_pool = Mock(
+        put_command=lambda ctx, **k: proc_pool_calls.append(ctx.label))
+    xtrigger_mgr.func_pool = Mock(
+        is_in_process=lambda func_name: func_name == 'trusted',
+        put_command=lambda ctx, **k: func_pool_calls.append(ctx.label))
+    for label in ('trusted', 'untrusted'):
+        xtrigger_mgr.add_trig(
+            label, SubFuncContext(label, label, [], {}), 'fdir')
+    itask = _make_itask(['trusted', 'untrusted'])
+
+    xtrigger_mgr.add_task(itask)
+    xtrigger_mgr.call_xtriggers_async()
+    assert func_pool_calls == ['trusted']
+    assert proc_pool_calls == ['untrusted']
+    assert len(xtrigger_mgr.active) == 2
 
 
 def test_callback_not_active(xtrigger_mgr):
@@ -261,12 +408,31 @@ def test_callback(xtrigger_mgr):
         func_kwargs={}
     )
     get_name.out = "[\"True\", \"1\"]"
-    xtrigger_mgr.active.append(get_name.get_signature())
+    sig = get_name.get_signature()
+    # a task in the pool has this xtrigger
+    xtrigger_mgr.sig_refs[sig] = 1
+    xtrigger_mgr.active.append(sig)
     xtrigger_mgr.callback(get_name)
     # this means that the xtrigger was satisfied
     assert xtrigger_mgr.sat_xtrig
 
 
+def test_callback_unreferenced(xtrigger_mgr):
+    """Test results are dropped if no task in the pool has the xtrigger."""
+    get_name = SubFuncContext(
+        label="get_name",
+        func_name="get_name",
+        func_args=[],
+        func_kwargs={}
+    )
+    get_name.out = "[\"True\", \"1\"]"
+    xtrigger_mgr.active.append(get_name.get_signature())
+    xtrigger_mgr.callback(get_name)
+    assert not xtrigger_mgr.active
+    assert not xtrigger_mgr.sat_xtrig
+    assert not xtrigger_mgr.xtrigs_ready
+
+
 def test_check_xtriggers(xtrigger_mgr):
     """Test process_xtriggers call."""
 
@@ -0,0 +1,73 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from cylc.flow.tui.app import TuiParentNode
+from cylc.flow.tui.tree import (
+    find_displayed_node,
+    update_child_nodes,
+    update_widget
+)
+from cylc.flow.tui.util import add_node
+
+
+def add_family(name, nodes):
+    return add_node('family', name, nodes, {
+        'id': name,
+        'state': 'waiting',
+        'isHeld': False,
+        'isQueued': False,
+        'isRunahead': False
+    })
+
+
+def test_update_child_nodes():
+    """It reuses the nodes of children which have not been removed."""
+    nodes = {}
+    root = add_node('workflow', 'flow', nodes, {'id': 'flow'})
+    for name in ('a', 'b', 'c'):
+        root['children'].append(add_family(name, nodes))
+    nodes[('family', 'c')]['children'].append(add_family('c1', nodes))
+    root_node = TuiParentNode(root)
+    root_node.registry = {}
+    node_a, node_b, node_c = (
+        root_node.get_child_node(key) for key in root_node.get_child_keys()
+    )
+    widget_c = node_c.get_widget()
+    widget_c.expanded = False
+
+    # remove b, add d
+    root['children'][1:2] = []
+    root['children'].append(add_family('d', nodes))
+    update_child_nodes(root_node)
+    assert list(root_node.get_child_keys()) == [0, 1, 2]
+    assert root_node.get_child_node(0) is node_a
+    assert root_node.get_child_node(1) is node_c
+    assert node_c.get_key() == 1
+    assert node_c.get_widget() is widget_c
+    node_d = root_node.get_child_node(2)
+    assert node_d.get_value() is nodes[('family', 'd')]
+    assert root_node.registry[('family', 'd')] is node_d
+
+    # the removed node is no longer displayed
+    assert find_displayed_node(node_b) is root_node
+    assert find_displayed_node(node_c) is node_c
+
+    # re-rendering a widget preserves its collapse/expand status
+    nodes[('family', 'c')]['data'] = dict(
+        nodes[('family', 'c')]['data'], isHeld=True)
+    update_widget(node_c)
+    assert node_c.get_widget() is not widget_c
+    assert node_c.get_widget().expanded is False
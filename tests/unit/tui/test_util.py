@@ -28,7 +28,8 @@ from cylc.flow.tui.util import (
     TASK_ICONS,
     render_node,
     compute_tree,
-    get_task_icon
+    get_task_icon,
+    patch_jobs
 )
 from cylc.flow.wallclock import (
     get_time_string,
@@ -344,3 +345,59 @@ def test_compute_tree():
         'submitNum'
     ]
     assert len(job_info['children']) == 0
+
+
+def test_patch_jobs():
+    """It adds, updates and removes job nodes."""
+    nodes = {}
+    task = compute_tree({
+        'id': 'workflow id',
+        'cyclePoints': [{'id': '1|root'}],
+        'familyProxies': [],
+        'taskProxies': [
+            {
+                'id': '1|a',
+                'firstParent': {'name': 'root', 'id': '1|root'},
+                'jobs': [
+                    {'id': '1|a|2', 'state': 'failed'},
+                    {'id': '1|a|1', 'state': 'failed'},
+                ]
+            },
+        ]
+    }, nodes)['children'][0]['children'][0]
+    assert task['id_'] == '1|a'
+    job2 = nodes[('job', '1|a|2')]
+
+    # a new job
+    dirty, changed = set(), set()
+    assert patch_jobs(
+        task,
+        [
+            {'id': '1|a|3', 'state': 'running'},
+            {'id': '1|a|2', 'state': 'failed'},
+        ],
+        nodes,
+        dirty,
+        changed
+    ) == [('job', '1|a|1'), ('job_info', '1|a|1_info')]
+    assert [job['id_'] for job in task['children']] == ['1|a|3', '1|a|2']
+    assert task['children'][1] is job2
+    assert ('job', '1|a|1') not in nodes
+    assert dirty == {('task', '1|a')}
+    assert changed == {('job', '1|a|3'), ('job_info', '1|a|3_info')}
+
+    # an updated job
+    dirty, changed = set(), set()
+    assert patch_jobs(
+        task,
+        [
+            {'id': '1|a|3', 'state': 'succeeded'},
+            {'id': '1|a|2', 'state': 'failed'},
+        ],
+        nodes,
+        dirty,
+        changed
+    ) == []
+    assert dirty == set()
+    assert changed == {('job', '1|a|3'), ('job_info', '1|a|3_info')}
+    assert nodes[('job_info', '1|a|3_info')]['data']['state'] == 'succeeded'